@@ -31,6 +31,21 @@ VIDEO_CONFIG = {
     
     # Preset de encoding (quanto mais rápido, menor qualidade)
     'preset': 'medium',  # Opções: ultrafast, fast, medium, slow, veryslow
+    
+    # Threads do encoder (0 = automático)
+    'threads': 4,
+    
+    # Usar o perfil medido pelo benchmark de encoder (src/encoder_benchmark.py)
+    'usar_perfil_encoder': True,
+    
+    # Duração do crossfade entre cenas (segundos; ver src/timeline.py)
+    'transicao_segundos': 0.5,
+    
+    # Altura dos previews proxy (largura proporcional)
+    'preview_altura': 360,
+    
+    # Qualidade dos previews proxy (CRF - maior = menor arquivo)
+    'preview_crf': 30,
 }
 
 
@@ -55,6 +70,132 @@ AUDIO_CONFIG = {
     
     # Volume dos efeitos sonoros (dB)
     'sound_effects_volume': -5,  # -5dB mais baixo que narração
+    
+    # Arquivos de áudio intermediários sem perdas ('wav' ou 'flac'); a única
+    # codificação com perdas é a do vídeo final (VIDEO_CONFIG['audio_codec'])
+    'formato_intermediario': 'wav',
+    
+    # Pedir a narração em PCM (pcm_<sample_rate>) em vez de MP3; depende do
+    # plano do ElevenLabs, por isso vem desligado
+    'tts_pcm': False,
+    
+    # Narração em streaming: chunks gravados em disco conforme chegam da API
+    'tts_streaming': True,
+    
+    # Segundos de áudio que sinalizam "início pronto" aos consumidores do stream
+    'tts_segundos_iniciais': 5.0,
+    
+    # Tamanho dos chunks lidos do stream (bytes)
+    'tts_chunk_bytes': 16384,
+    
+    # Cache PCM (src/pcm_cache.py): memory-maps abertos ao mesmo tempo e
+    # tamanho máximo do diretório (os .npy usados há mais tempo saem primeiro)
+    'pcm_max_abertos': 32,
+    'pcm_cache_max_mb': 2048,
+    
+    # Normalizar narração e música por loudness (src/audio_processing.py)
+    'normalizar_loudness': True,
+    
+    # Loudness alvo de cada cena de narração (LUFS); a música fica em
+    # alvo + background_music_volume
+    'alvo_lufs_narracao': -16.0,
+    
+    # Pico máximo de amostra após o ganho (dBFS)
+    'pico_maximo_db': -1.0,
+    
+    # Atenuação extra da música enquanto há narração (dB)
+    'ducking_db': -8.0,
+    
+    # Nível RMS da narração que aciona o ducking (dBFS)
+    'ducking_limiar_db': -40.0,
+    
+    # Tempo para a música abaixar / voltar (ms)
+    'ducking_ataque_ms': 50,
+    'ducking_liberacao_ms': 400,
+    
+    # Remover silêncio do início/fim de cada narração (gera WAV sem perdas)
+    'aparar_silencio': True,
+    
+    # Nível RMS abaixo do qual um trecho é silêncio (dBFS)
+    'silencio_limiar_db': -45.0,
+    
+    # Silêncio preservado antes e depois da fala (ms)
+    'silencio_margem_ms': 80,
+    
+    # Cache de síntese: mesmo texto + voz + modelo não é sintetizado de novo
+    'tts_cache': True,
+    
+    # Diálogos (src/dialogo.py): pausa entre falas do mesmo personagem e na
+    # troca de personagem (ms)
+    'dialogo_pausa_ms': 250,
+    'dialogo_pausa_troca_ms': 450,
+    
+    # Personagem atribuído às linhas de diálogo sem "Nome:"
+    'dialogo_narrador': 'Narrador',
+}
+
+
+# ============================================================================
+# 💬 CONFIGURAÇÕES DE LEGENDAS
+# ============================================================================
+SUBTITLE_CONFIG = {
+    # Modo de aplicação das legendas
+    'modo': 'burn',  # Opções: burn (libass no encode), soft (faixa separada), moviepy
+    
+    # Fonte das legendas
+    'fonte': 'Arial',
+    
+    # Tamanho da fonte (pixels na resolução do vídeo)
+    'tamanho_fonte': 40,
+    
+    # Cor do texto (nome ou #RRGGBB)
+    'cor_texto': 'white',
+    
+    # Cor da caixa/contorno (nome ou #RRGGBB)
+    'cor_fundo': 'black',
+    
+    # Caixa opaca atrás do texto (True) ou apenas contorno (False)
+    'caixa_fundo': True,
+    
+    # Espessura do contorno (pixels)
+    'contorno': 2,
+    
+    # Distância da borda inferior (pixels)
+    'margem_vertical': 40,
+    
+    # Idioma da faixa de legenda no modo soft (ISO 639-2)
+    'idioma_faixa': 'por',
+    
+    # Máximo de caracteres por legenda gerada a partir do timing da narração
+    'max_caracteres': 42,
+    
+    # Duração máxima de uma legenda (segundos)
+    'max_duracao': 6.0,
+}
+
+
+# ============================================================================
+# 📦 PÓS-RENDERIZAÇÃO (CAPÍTULOS, THUMBNAILS E METADADOS)
+# ============================================================================
+POST_RENDER_CONFIG = {
+    # Quadros amostrados por cena para escolher thumbnails
+    'quadros_por_cena': 3,
+    
+    # Thumbnails candidatas salvas (melhores pontuações, no máximo uma por cena)
+    'num_thumbnails': 3,
+    
+    # Resolução das thumbnails (recomendação do YouTube)
+    'resolucao_thumbnail': (1280, 720),
+    
+    # Largura usada na análise dos quadros (reduzida por amostragem)
+    'largura_analise': 320,
+    
+    # Duração mínima de um capítulo do YouTube (segundos); cenas menores
+    # entram no capítulo anterior
+    'duracao_minima_capitulo': 10,
+    
+    # Capítulos mínimos para o YouTube exibir a lista
+    'minimo_capitulos': 3,
 }
 
 
@@ -79,6 +220,27 @@ CHARACTER_CONFIG = {
     
     # Prompt base para personagens
     'base_prompt': 'high quality 3D cartoon character, pixar style, professional render, clean background',
+    
+    # Máximo de imagens por predição SDXL (num_outputs)
+    'max_outputs_por_predicao': 4,
+    
+    # Personagens gerados em paralelo
+    'max_concorrencia': 3,
+}
+
+# Biblioteca de personagens (índice por hash perceptual, compartilhada entre projetos)
+CHARACTER_LIBRARY_CONFIG = {
+    # Distância de Hamming (de 64 bits) para considerar quase-duplicata na inserção
+    'limite_hamming_duplicata': 6,
+    
+    # Distância de Hamming máxima em buscas por imagem semelhante
+    'limite_hamming_similar': 12,
+    
+    # Similaridade de cosseno mínima para reaproveitar por descrição
+    'similaridade_descricao_minima': 0.6,
+    
+    # Reaproveitar personagens de outro nome só pela descrição (senão exige o mesmo nome)
+    'reutilizar_por_descricao': False,
 }
 
 
@@ -110,6 +272,9 @@ AI_CONFIG = {
     # Modelo Replicate para animação
     'replicate_animation_model': 'stability-ai/stable-video-diffusion:3f0457e4619daac51203dedb472816fd4af51f3149fa7a9e0b5ffcf1b8172438',
     
+    # Modelo para imagens de personagens
+    'replicate_image_model': 'stability-ai/sdxl:39ed52f2a78e934b3ba6e2a89f5b1c712de7dfea535525255b1aa35c5565e08b',
+    
     # Modelo para lip-sync
     'replicate_lipsync_model': 'devxpy/cog-wav2lip:8d65e3f4f4298520e079198b493c25adfc43c058ffec924f2aefc8010ed25eef',
     
@@ -123,6 +288,104 @@ AI_CONFIG = {
     'retry_delay': 5,
 }
 
+# Geração de roteiros (src/roteiro_generator.py). Vídeos longos são gerados
+# em blocos: um esboço com as partes da história e depois os blocos de cenas
+# em paralelo, cada um com o esboço como contexto
+ROTEIRO_CONFIG = {
+    # Duração média de uma cena (segundos) e mínimo de cenas por vídeo
+    'segundos_por_cena': 12,
+    'minimo_cenas': 10,
+    
+    # Tokens de saída estimados por cena no JSON do roteiro
+    'tokens_por_cena': 220,
+    
+    # Tokens de saída reservados para título, SEO, personagens etc.
+    'tokens_cabecalho': 900,
+    
+    # Janela de contexto do modelo (prompt + resposta)
+    'contexto_tokens': 128000,
+    
+    # Caracteres por token na estimativa local (texto em pt/es/en com JSON)
+    'caracteres_por_token': 3.5,
+    
+    # Gerar em blocos mesmo quando o roteiro caberia em uma resposta
+    'sempre_em_blocos': False,
+}
+
+# Camada de chamadas remotas (src/remote_calls.py): backoff, circuit breaker
+# e concorrência adaptativa (AIMD) por provedor
+REMOTE_CALLS_CONFIG = {
+    # Espera máxima entre tentativas (segundos)
+    'backoff_maximo': 60,
+    
+    # Falhas consecutivas que abrem o circuito do provedor
+    'falhas_para_abrir_circuito': 5,
+    
+    # Tempo com o circuito aberto antes de uma chamada de teste (segundos)
+    'tempo_circuito_aberto': 60,
+    
+    # Concorrência por provedor: inicial, mínima e máxima
+    'concorrencia': {
+        'replicate': {'inicial': 2, 'minima': 1, 'maxima': 8},
+        'elevenlabs': {'inicial': 2, 'minima': 1, 'maxima': 5},
+        'openai': {'inicial': 2, 'minima': 1, 'maxima': 8},
+    },
+}
+
+# Predições com hedge (src/hedged_predictions.py): uma predição que passa do
+# percentil de latência observado ganha uma duplicata; vale a primeira que terminar
+HEDGE_CONFIG = {
+    # Ativar por padrão em animar_imagem e aplicar_lipsync (opt-in por chamada)
+    'ativo': False,
+    
+    # Percentil da latência observada que dispara a duplicata
+    'percentil': 90,
+    
+    # Amostras necessárias antes de usar o percentil
+    'amostras_minimas': 5,
+    
+    # Limite usado enquanto não há amostras suficientes (segundos)
+    'limite_inicial_segundos': 240,
+    
+    # Fração máxima de predições que podem ganhar duplicata
+    'max_fracao_hedges': 0.2,
+    
+    # Gasto extra máximo com duplicatas por execução (USD)
+    'orcamento_usd': 2.0,
+    
+    # Custo estimado de uma predição por tipo (USD)
+    'custo_estimado': {
+        'animacao': 0.10,
+        'lipsync': 0.05,
+    },
+    
+    # Intervalo de consulta do status das predições (segundos)
+    'intervalo_consulta': 2.0,
+}
+
+# Aquecimento de modelos (src/warmup.py): predições mínimas disparadas antes
+# de cada etapa, seguindo o grafo de dependências do pipeline
+WARMUP_CONFIG = {
+    # Aquecer os modelos das próximas etapas
+    'ativo': True,
+    
+    # Tempo que um modelo continua quente sem uso (segundos)
+    'janela_quente_segundos': 300,
+    
+    # Aquecimentos máximos por modelo em uma execução (manter quente em etapas longas)
+    'max_aquecimentos_por_modelo': 6,
+    
+    # Deployments dedicados por etapa ('dono/nome'); com deployment, o
+    # aquecimento usa min_instances durante o lote em vez de predições
+    'deployments': {
+        # 'animacoes': 'minha-org/svd',
+        # 'lipsync': 'minha-org/wav2lip',
+    },
+    
+    # Instâncias mínimas mantidas durante uma janela de lote
+    'min_instancias_lote': 1,
+}
+
 
 # ============================================================================
 # 📁 DIRETÓRIOS
@@ -229,6 +492,13 @@ OPTIMIZATION_CONFIG = {
     # Qualidade de compressão (0-100)
     'compression_quality': 85,
     
+    # Formato das versões comprimidas de imagens (ver src/image_store.py)
+    'formato_imagem_comprimida': 'webp',  # Opções: webp, jpeg
+    
+    # Caixa em que a imagem enviada para animação deve caber, sem recorte
+    # nem ampliação (nativa do Stable Video Diffusion)
+    'resolucao_upload_animacao': (1024, 576),
+    
     # Deletar arquivos temporários após uso
     'cleanup_temp_files': True,
     
@@ -286,6 +556,62 @@ PERFORMANCE_CONFIG = {
     
     # Timeout geral (segundos)
     'global_timeout': 3600,  # 1 hora
+    
+    # Orçamento de tempo para 'import src.pipeline' (ms, ver utils.medir_importacao)
+    'orcamento_importacao_ms': 150,
+}
+
+# Modo daemon (python -m src daemon): processo residente que consome jobs
+# JSON de uma fila local, mantendo clientes, caches e workers carregados
+DAEMON_CONFIG = {
+    # Diretório da fila (um arquivo .json por job)
+    'diretorio_fila': DIRS['temp'] + 'fila/',
+    
+    # Socket unix para receber jobs (None desativa)
+    'socket': None,
+    
+    # Jobs executados simultaneamente
+    'max_jobs_simultaneos': 1,
+    
+    # Intervalo entre varreduras da fila (segundos)
+    'intervalo_varredura': 2.0,
+    
+    # Importar SDKs e MoviePy ao iniciar (o primeiro job não paga a importação)
+    'preaquecer_importacoes': True,
+}
+
+
+# ============================================================================
+# 🎚️ PERFIS DE RENDERIZAÇÃO (FINAL / RASCUNHO)
+# ============================================================================
+RENDER_PROFILES = {
+    # Qualidade de publicação
+    'final': {
+        'resolucao_video': VIDEO_CONFIG['resolution'],
+        'bitrate_video': VIDEO_CONFIG['bitrate'],
+        'preset': VIDEO_CONFIG['preset'],
+        'resolucao_personagem': CHARACTER_CONFIG['resolution'],
+        'passos_inferencia': 30,  # Passos do SDXL
+        'animacao_fps': 30,
+        'animacao_video_length': None,  # Padrão do modelo
+        'tts_formato': 'mp3_44100_128',
+        'aplicar_lipsync': True,
+    },
+    
+    # Revisão rápida: imagens menores, sem lip-sync, 480p ultrafast.
+    # Roteiro, áudio e timings são reaproveitados ao promover para final,
+    # por isso a narração já sai na qualidade final.
+    'rascunho': {
+        'resolucao_video': (854, 480),
+        'bitrate_video': '800k',
+        'preset': 'ultrafast',
+        'resolucao_personagem': 512,
+        'passos_inferencia': 15,
+        'animacao_fps': 10,
+        'animacao_video_length': '14_frames_with_svd',
+        'tts_formato': 'mp3_44100_128',
+        'aplicar_lipsync': False,
+    },
 }
 
 
@@ -303,6 +629,8 @@ DEFAULT_PROJECT_CONFIG = {
     'aplicar_lipsync': True,
     'gerar_legendas': False,
     'incluir_intro_outro': False,
+    'perfil': 'final',  # final ou rascunho (ver RENDER_PROFILES)
+    'serie': None,  # Projetos da mesma série compartilham o mapa de vozes
 }
 
 
@@ -323,6 +651,19 @@ def get_config_for_nicho(nicho: str) -> dict:
     return NICHO_STYLES.get(nicho, NICHO_STYLES['historias_infantis'])
 
 
+def get_render_profile(perfil: str = 'final') -> dict:
+    """
+    Retorna as configurações de um perfil de renderização.
+    
+    Args:
+        perfil: Nome do perfil ('final' ou 'rascunho')
+    
+    Returns:
+        Dicionário com configurações do perfil
+    """
+    return RENDER_PROFILES.get(perfil or 'final', RENDER_PROFILES['final'])
+
+
 def get_voice_for_language(language: str, voice_type: str = 'narrator') -> str:
     """
     Retorna o ID da voz adequado para o idioma.
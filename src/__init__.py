@@ -4,11 +4,27 @@
 Módulos principais:
 - pipeline: Orquestrador principal do sistema
 - roteiro_generator: Geração de roteiros com ChatGPT
+- roteiro_schema: Validação e reparo determinístico de roteiros
 - character_generator: Criação de personagens com IA
+- character_library: Biblioteca de personagens com hash perceptual
+- image_store: Armazenamento de imagens com versões comprimidas
+- remote_assets: Cache de uploads para a Replicate
+- remote_calls: Tentativas, circuit breaker e concorrência adaptativa
+- hedged_predictions: Predições com hedge contra a cauda de latência
+- warmup: Aquecimento de modelos à frente das etapas
 - audio_generator: Narração e música com ElevenLabs
+- dialogo: Diálogos com uma voz estável por personagem
+- pcm_cache: Áudio decodificado uma vez (memory-map)
+- audio_processing: Loudness EBU R128 e ducking da música
 - animation_generator: Animação de cenas
 - lipsync_generator: Sincronização labial
+- timeline: Linha do tempo única de vídeo, áudio, legendas e capítulos
 - video_editor: Edição final com MoviePy
+- post_render: Capítulos, thumbnails e metadados em paralelo com o encode
+- subtitle_generator: Faixas de legenda ASS/SRT
+- encoder_benchmark: Autoajuste do perfil de encoding
+- cli: Linha de comando (python -m src)
+- daemon: Processo residente com fila de jobs
 - utils: Funções auxiliares
 """
 
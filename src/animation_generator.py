@@ -7,18 +7,22 @@ Suporta Replicate (Stable Video Diffusion, Runway Gen-2, etc).
 
 import os
 import time
-import replicate
 from typing import Dict, List, Optional
 
 # Imports locais
 try:
     import sys
-    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-    from config.settings import AI_CONFIG
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import AI_CONFIG, OPTIMIZATION_CONFIG, HEDGE_CONFIG, get_render_profile
     from src.utils import (
         validar_api_key, download_arquivo, salvar_json,
         criar_diretorios, gerar_nome_arquivo_unico
     )
+    from src.remote_assets import obter_cache_remoto
+    from src.remote_calls import chamar_remoto, executar_em_paralelo
+    from src.hedged_predictions import HedgedPredictor, obter_hedger
 except ImportError:
     print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
 
@@ -30,12 +34,13 @@ class AnimationGenerator:
     Converte imagens estáticas em micro-cenas animadas.
     """
     
-    def __init__(self, api_token: str):
+    def __init__(self, api_token: str, perfil: str = 'final'):
         """
         Inicializa o gerador de animações.
         
         Args:
             api_token: Token da API Replicate
+            perfil: Perfil de renderização ('final' ou 'rascunho')
         """
         if not validar_api_key(api_token, 'replicate'):
             raise ValueError("❌ API token Replicate inválido")
@@ -49,9 +54,19 @@ class AnimationGenerator:
             'stability-ai/stable-video-diffusion:3f0457e4619daac51203dedb472816fd4af51f3149fa7a9e0b5ffcf1b8172438'
         )
         
+        self.perfil = perfil
+        perfil_cfg = get_render_profile(perfil)
+        self.fps = perfil_cfg.get('animacao_fps', 30)
+        self.video_length = perfil_cfg.get('animacao_video_length')
+        
         self.video_dir = '/tmp/animations_output'
+        if perfil != 'final':
+            self.video_dir = os.path.join(self.video_dir, perfil)
         criar_diretorios([self.video_dir])
         
+        # Versões comprimidas das imagens enviadas (criado sob demanda)
+        self._image_store = None
+        
         print(f"✅ AnimationGenerator inicializado")
         print(f"   Modelo: {self.modelo.split(':')[0]}")
     
@@ -61,7 +76,10 @@ class AnimationGenerator:
         duracao_segundos: int = 5,
         nome_saida: Optional[str] = None,
         motion_bucket_id: int = 127,
-        fps: int = 30
+        fps: Optional[int] = None,
+        hedge: Optional[bool] = None,
+        hedger: Optional[HedgedPredictor] = None,
+        diretorio: Optional[str] = None
     ) -> Optional[str]:
         """
         Anima uma imagem estática.
@@ -71,7 +89,12 @@ class AnimationGenerator:
             duracao_segundos: Duração do vídeo em segundos
             nome_saida: Nome do arquivo de saída (opcional)
             motion_bucket_id: Intensidade do movimento (0-255)
-            fps: Frames por segundo
+            fps: Frames por segundo (padrão: definido pelo perfil)
+            hedge: Enviar duplicata se a predição demorar além do percentil
+                   de latência (padrão: HEDGE_CONFIG['ativo'])
+            hedger: Executor com o orçamento da execução (padrão: obter_hedger())
+            diretorio: Diretório do vídeo (padrão: video_dir); projetos
+                       simultâneos usam diretórios próprios
         
         Returns:
             Caminho do vídeo gerado ou None
@@ -88,22 +111,36 @@ class AnimationGenerator:
         print(f"   Duração: {duracao_segundos}s")
         
         try:
-            # Upload da imagem (Replicate precisa de URL)
-            with open(caminho_imagem, 'rb') as f:
-                imagem_data = f.read()
+            import replicate
+            
+            # Enviar versão comprimida na resolução nativa do modelo, uma
+            # única vez por conteúdo (cenas repetidas reaproveitam a URL)
+            imagem_upload = self._imagem_para_upload(caminho_imagem)
+            imagem_url = obter_cache_remoto().url_para(imagem_upload)
             
             # Gerar animação
             print("   Processando animação (pode levar alguns minutos)...")
             
-            output = replicate.run(
-                self.modelo,
-                input={
-                    "image": caminho_imagem,
-                    "motion_bucket_id": motion_bucket_id,
-                    "fps": fps,
-                    "cond_aug": 0.02
-                }
-            )
+            parametros = {
+                "motion_bucket_id": motion_bucket_id,
+                "fps": fps or self.fps,
+                "cond_aug": 0.02
+            }
+            if self.video_length:
+                parametros["video_length"] = self.video_length
+            
+            # Arquivo reaberto a cada tentativa se o upload prévio falhou
+            def montar_input():
+                return {**parametros, "image": imagem_url or open(imagem_upload, "rb")}
+            
+            if HEDGE_CONFIG.get('ativo', False) if hedge is None else hedge:
+                output = (hedger or obter_hedger()).executar(self.modelo, montar_input, tipo='animacao')
+            else:
+                output = chamar_remoto(
+                    'replicate',
+                    lambda: replicate.run(self.modelo, input=montar_input()),
+                    descricao='animacao'
+                )
             
             # Output é uma URL de vídeo
             if output:
@@ -114,7 +151,9 @@ class AnimationGenerator:
                     base_name = os.path.splitext(os.path.basename(caminho_imagem))[0]
                     nome_saida = f"{base_name}_animated.mp4"
                 
-                caminho_saida = os.path.join(self.video_dir, nome_saida)
+                if diretorio:
+                    os.makedirs(diretorio, exist_ok=True)
+                caminho_saida = os.path.join(diretorio or self.video_dir, nome_saida)
                 
                 if download_arquivo(video_url, caminho_saida):
                     print(f"✅ Animação gerada: {caminho_saida}")
@@ -127,10 +166,35 @@ class AnimationGenerator:
             print(f"❌ Erro ao animar imagem: {e}")
             return None
     
+    def _imagem_para_upload(self, caminho_imagem: str) -> str:
+        """
+        Retorna a versão comprimida da imagem a enviar (ou a original).
+        """
+        if not OPTIMIZATION_CONFIG.get('compress_temp_images', True):
+            return caminho_imagem
+        
+        if self._image_store is None:
+            try:
+                from src.image_store import ImageStore
+                self._image_store = ImageStore()
+            except Exception as e:
+                print(f"⚠️ ImageStore indisponível, enviando original: {e}")
+                self._image_store = False
+        
+        if not self._image_store:
+            return caminho_imagem
+        
+        return self._image_store.para_upload(
+            caminho_imagem,
+            resolucao=OPTIMIZATION_CONFIG.get('resolucao_upload_animacao')
+        )
+    
     def animar_cenas(
         self,
         cenas_com_imagens: Dict[int, str],
-        duracoes: Optional[Dict[int, int]] = None
+        duracoes: Optional[Dict[int, int]] = None,
+        hedger: Optional[HedgedPredictor] = None,
+        diretorio: Optional[str] = None
     ) -> Dict[int, str]:
         """
         Anima múltiplas cenas.
@@ -138,36 +202,33 @@ class AnimationGenerator:
         Args:
             cenas_com_imagens: Dict mapeando número da cena -> caminho da imagem
             duracoes: Dict opcional com durações específicas por cena
+            hedger: Executor de hedge da execução (ver animar_imagem)
+            diretorio: Diretório dos vídeos do projeto (ver animar_imagem)
         
         Returns:
             Dict mapeando número da cena -> caminho do vídeo
         """
         print(f"🎬 Animando {len(cenas_com_imagens)} cenas...")
         
-        videos = {}
-        
-        for i, (num_cena, caminho_imagem) in enumerate(cenas_com_imagens.items()):
-            print(f"\n[{i+1}/{len(cenas_com_imagens)}] Cena {num_cena}")
-            
+        def animar(num_cena):
             # Duração específica ou padrão
             duracao = duracoes.get(num_cena, 10) if duracoes else 10
             
-            # Nome do arquivo
-            nome_saida = f"cena_{num_cena:03d}_video.mp4"
-            
-            # Animar
-            video_path = self.animar_imagem(
-                caminho_imagem=caminho_imagem,
+            print(f"\n🎬 Cena {num_cena}")
+            return self.animar_imagem(
+                caminho_imagem=cenas_com_imagens[num_cena],
                 duracao_segundos=duracao,
-                nome_saida=nome_saida
+                nome_saida=f"cena_{num_cena:03d}_video.mp4",
+                hedger=hedger,
+                diretorio=diretorio
             )
-            
-            if video_path:
-                videos[num_cena] = video_path
-            
-            # Delay entre requisições
-            if i < len(cenas_com_imagens) - 1:
-                time.sleep(3)
+        
+        # Paralelismo regulado pela camada de chamadas remotas (sem delay fixo)
+        videos = {
+            num_cena: video_path
+            for num_cena, video_path in executar_em_paralelo('replicate', animar, cenas_com_imagens)
+            if video_path
+        }
         
         print(f"\n✅ {len(videos)} cenas animadas com sucesso!")
         return videos
@@ -195,6 +256,8 @@ class AnimationGenerator:
         print(f"🎬 Gerando cena com prompt: {prompt[:50]}...")
         
         try:
+            import replicate
+            
             # Usar modelo text-to-video (exemplo: Runway Gen-2)
             # Nota: Modelo pode variar conforme disponibilidade
             output = replicate.run(
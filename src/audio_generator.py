@@ -5,23 +5,374 @@ Módulo responsável por gerar narração e música usando ElevenLabs.
 """
 
 import os
+import re
+import json
 import time
-from typing import Dict, List, Optional
-from elevenlabs import generate, save, Voice, VoiceSettings
+import base64
+import struct
+import hashlib
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
 
 # Imports locais
 try:
     import sys
-    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-    from config.settings import AUDIO_CONFIG, AI_CONFIG, LANGUAGE_CONFIG
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import AUDIO_CONFIG, AI_CONFIG, DIRS, LANGUAGE_CONFIG, get_render_profile
     from src.utils import (
-        validar_api_key, salvar_json, criar_diretorios,
-        gerar_nome_arquivo_unico
+        validar_api_key, salvar_json, carregar_json, criar_diretorios,
+        gerar_nome_arquivo_unico, obter_duracao_midia
     )
+    from src.remote_calls import chamar_remoto, executar_em_paralelo
+    from src.pcm_cache import obter_cache_pcm, salvar_wav, exportar_audio
+    from src.audio_processing import mixar, medir_fala
+    from src.dialogo import MapaVozes, extrair_falas, eh_dialogo
 except ImportError:
     print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
 
 
+ELEVENLABS_API_URL = 'https://api.elevenlabs.io/v1'
+
+
+def caminho_timing(caminho_audio: str) -> str:
+    """
+    Retorna o caminho do arquivo de timing associado a um áudio.
+    
+    Args:
+        caminho_audio: Caminho do áudio (ex: cena_001_audio.mp3)
+    
+    Returns:
+        Caminho do JSON de timing (ex: cena_001_audio.timing.json)
+    """
+    return os.path.splitext(caminho_audio)[0] + '.timing.json'
+
+
+def carregar_timing(caminho_audio: str) -> Optional[Dict]:
+    """
+    Carrega o timing de palavras/frases salvo ao lado de um áudio.
+    
+    Args:
+        caminho_audio: Caminho do áudio
+    
+    Returns:
+        Dict com 'palavras' e 'frases' ou None se não existir
+    """
+    caminho = caminho_timing(caminho_audio)
+    if not os.path.exists(caminho):
+        return None
+    return carregar_json(caminho)
+
+
+def agrupar_palavras(
+    caracteres: List[str],
+    inicios: List[float],
+    fins: List[float]
+) -> List[Dict]:
+    """
+    Agrupa um alinhamento por caractere em palavras.
+    
+    Args:
+        caracteres: Lista de caracteres do texto
+        inicios: Início de cada caractere (segundos)
+        fins: Fim de cada caractere (segundos)
+    
+    Returns:
+        Lista de dicts com 'texto', 'inicio', 'fim'
+    """
+    palavras = []
+    atual = []
+    inicio = None
+    fim = 0.0
+    
+    for char, ini, fi in zip(caracteres, inicios, fins):
+        if char.isspace():
+            if atual:
+                palavras.append({'texto': ''.join(atual), 'inicio': inicio, 'fim': fim})
+            atual, inicio = [], None
+            continue
+        
+        if inicio is None:
+            inicio = ini
+        atual.append(char)
+        fim = fi
+    
+    if atual:
+        palavras.append({'texto': ''.join(atual), 'inicio': inicio, 'fim': fim})
+    
+    return palavras
+
+
+def agrupar_frases(palavras: List[Dict]) -> List[Dict]:
+    """
+    Agrupa palavras em frases (terminadas em . ! ? ou reticências).
+    
+    Args:
+        palavras: Lista de palavras com 'texto', 'inicio', 'fim'
+    
+    Returns:
+        Lista de frases com 'texto', 'inicio', 'fim'
+    """
+    frases = []
+    atual = []
+    
+    for palavra in palavras:
+        atual.append(palavra)
+        if re.search(r"[.!?…][\"”')]*$", palavra['texto']):
+            frases.append({
+                'texto': ' '.join(p['texto'] for p in atual),
+                'inicio': atual[0]['inicio'],
+                'fim': atual[-1]['fim']
+            })
+            atual = []
+    
+    if atual:
+        frases.append({
+            'texto': ' '.join(p['texto'] for p in atual),
+            'inicio': atual[0]['inicio'],
+            'fim': atual[-1]['fim']
+        })
+    
+    return frases
+
+
+def alinhar_texto_localmente(texto: str, duracao: float) -> List[Dict]:
+    """
+    Alinhamento local (fallback) distribuindo a duração proporcionalmente.
+    
+    Cada caractere recebe peso 1 e pontuações recebem peso extra para
+    representar as pausas naturais da fala.
+    
+    Args:
+        texto: Texto narrado
+        duracao: Duração real do áudio em segundos
+    
+    Returns:
+        Lista de palavras com 'texto', 'inicio', 'fim'
+    """
+    pesos_pausa = {',': 4.0, ';': 5.0, ':': 5.0, '.': 8.0, '!': 8.0, '?': 8.0, '…': 8.0}
+    
+    caracteres = list(texto.strip())
+    pesos = [pesos_pausa.get(c, 1.0) for c in caracteres]
+    total = sum(pesos) or 1.0
+    
+    inicios, fins = [], []
+    acumulado = 0.0
+    for peso in pesos:
+        inicios.append(acumulado / total * duracao)
+        acumulado += peso
+        fins.append(acumulado / total * duracao)
+    
+    return agrupar_palavras(caracteres, inicios, fins)
+
+
+def bytes_por_segundo(formato: str) -> float:
+    """
+    Taxa de bytes de um formato de saída ElevenLabs.
+    
+    Args:
+        formato: Formato no padrão da API ('mp3_44100_128', 'pcm_24000', 'ulaw_8000')
+    
+    Returns:
+        Bytes por segundo de áudio (estimativa para formatos comprimidos)
+    """
+    partes = formato.split('_')
+    
+    if partes[0] == 'mp3' and len(partes) == 3:
+        return int(partes[2]) * 1000 / 8
+    if partes[0] == 'pcm':
+        return int(partes[1]) * 2  # 16 bits mono
+    if partes[0] == 'ulaw':
+        return int(partes[1])
+    
+    return 128 * 1000 / 8
+
+
+def extensao_formato(formato: str) -> str:
+    """
+    Extensão do arquivo para um formato de saída ElevenLabs.
+    
+    Args:
+        formato: Formato no padrão da API ('mp3_44100_128', 'pcm_44100')
+    
+    Returns:
+        'wav' para PCM (gravado com cabeçalho WAV) ou o codec do formato
+    """
+    codec = formato.split('_')[0]
+    return 'wav' if codec == 'pcm' else codec
+
+
+def cabecalho_wav(taxa: int, bytes_dados: Optional[int] = None, canais: int = 1) -> bytes:
+    """
+    Cabeçalho WAV (PCM 16 bits) para dados brutos.
+    
+    Args:
+        taxa: Taxa de amostragem
+        bytes_dados: Tamanho dos dados; None para stream de tamanho ainda
+                     desconhecido (corrigido ao final)
+        canais: Número de canais
+    
+    Returns:
+        44 bytes de cabeçalho RIFF/WAVE
+    """
+    if bytes_dados is None:
+        bytes_dados = 0xFFFFFFFF - 36
+    
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + bytes_dados, b'WAVE',
+        b'fmt ', 16, 1, canais, taxa, taxa * canais * 2, canais * 2, 16,
+        b'data', bytes_dados
+    )
+
+
+class NarracaoStream:
+    """
+    Narração gravada em disco enquanto chega da API.
+    
+    A memória fica limitada a um chunk, qualquer que seja a duração da
+    narração. Consumidores podem começar assim que os primeiros segundos
+    estiverem no arquivo parcial (inicio_pronto), sem esperar o fim.
+    
+    O pipeline usa apenas aguardar(): aparo de silêncio, timing e lip-sync
+    precisam da narração completa. inicio_pronto/ao_iniciar existem para
+    quem chama gerar_narracao_stream diretamente (ex.: pré-escuta).
+    
+    Example:
+        >>> stream = gen.gerar_narracao_stream(texto, "cena_001_audio")
+        >>> parcial = stream.aguardar_inicio()   # primeiros segundos em disco
+        >>> caminho = stream.aguardar()          # narração completa
+    """
+    
+    def __init__(
+        self,
+        caminho_saida: str,
+        formato: str,
+        segundos_iniciais: float,
+        ao_iniciar: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Inicializa o stream.
+        
+        Args:
+            caminho_saida: Caminho final do áudio
+            formato: Formato de saída ElevenLabs (para estimar a duração recebida)
+            segundos_iniciais: Segundos que disparam inicio_pronto
+            ao_iniciar: Callback chamado com o caminho parcial quando o início
+                        estiver pronto (executa na thread do stream)
+        """
+        self.caminho_saida = caminho_saida
+        self.caminho_parcial = f"{caminho_saida}.part"
+        self.taxa_bytes = bytes_por_segundo(formato)
+        self.taxa_pcm = int(formato.split('_')[1]) if formato.startswith('pcm_') else None
+        self.segundos_iniciais = segundos_iniciais
+        self.ao_iniciar = ao_iniciar
+        
+        self.bytes_recebidos = 0
+        self.erro: Optional[Exception] = None
+        self.inicio_pronto = threading.Event()
+        self.concluido = threading.Event()
+    
+    @property
+    def segundos_disponiveis(self) -> float:
+        """
+        Segundos de áudio já gravados (estimados pela taxa do formato).
+        """
+        return self.bytes_recebidos / self.taxa_bytes
+    
+    def aguardar_inicio(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Espera os primeiros segundos e retorna o arquivo que os contém.
+        
+        Returns:
+            Caminho parcial (ou final, se o stream já terminou) ou None em caso de erro
+        """
+        self.inicio_pronto.wait(timeout)
+        
+        if self.erro or not self.inicio_pronto.is_set():
+            return None
+        
+        return self.caminho_saida if self.concluido.is_set() else self.caminho_parcial
+    
+    def aguardar(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Espera o fim do stream.
+        
+        Returns:
+            Caminho final do áudio ou None em caso de erro
+        """
+        self.concluido.wait(timeout)
+        
+        if self.erro or not self.concluido.is_set():
+            return None
+        
+        return self.caminho_saida
+    
+    def receber(self, chunks: Iterable[bytes]) -> None:
+        """
+        Grava os chunks conforme chegam e finaliza o arquivo.
+        """
+        try:
+            with open(self.caminho_parcial, 'wb') as f:
+                # PCM bruto vira WAV: cabeçalho provisório, tamanhos corrigidos no fim
+                if self.taxa_pcm:
+                    f.write(cabecalho_wav(self.taxa_pcm))
+                
+                for chunk in chunks:
+                    if not chunk:
+                        continue
+                    
+                    f.write(chunk)
+                    f.flush()
+                    self.bytes_recebidos += len(chunk)
+                    
+                    if not self.inicio_pronto.is_set() and self.segundos_disponiveis >= self.segundos_iniciais:
+                        self._sinalizar_inicio(self.caminho_parcial)
+                
+                if self.taxa_pcm:
+                    f.seek(0)
+                    f.write(cabecalho_wav(self.taxa_pcm, self.bytes_recebidos))
+            
+            if not self.bytes_recebidos:
+                raise RuntimeError("Stream de áudio vazio")
+            
+            os.replace(self.caminho_parcial, self.caminho_saida)
+            
+        except Exception as e:
+            self.falhar(e)
+            return
+        
+        # Narrações mais curtas que segundos_iniciais
+        if not self.inicio_pronto.is_set():
+            self._sinalizar_inicio(self.caminho_saida)
+        
+        self.concluido.set()
+    
+    def falhar(self, erro: Exception) -> None:
+        """
+        Encerra o stream com erro, liberando quem estiver esperando.
+        """
+        self.erro = erro
+        if os.path.exists(self.caminho_parcial):
+            os.remove(self.caminho_parcial)
+        
+        self.inicio_pronto.set()
+        self.concluido.set()
+    
+    def _sinalizar_inicio(self, caminho: str) -> None:
+        """
+        Marca o início como pronto e avisa o consumidor.
+        """
+        self.inicio_pronto.set()
+        
+        if self.ao_iniciar:
+            try:
+                self.ao_iniciar(caminho)
+            except Exception as e:
+                print(f"⚠️ Erro no consumidor do stream: {e}")
+
+
 class AudioGenerator:
     """
     Gerador de áudio usando ElevenLabs Text-to-Speech.
@@ -29,12 +380,13 @@ class AudioGenerator:
     Cria narração profissional em múltiplos idiomas.
     """
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, perfil: str = 'final'):
         """
         Inicializa o gerador de áudio.
         
         Args:
             api_key: Chave da API ElevenLabs
+            perfil: Perfil de renderização ('final' ou 'rascunho')
         """
         if not validar_api_key(api_key, 'elevenlabs'):
             raise ValueError("❌ API key ElevenLabs inválida")
@@ -45,6 +397,10 @@ class AudioGenerator:
         self.model = AI_CONFIG.get('elevenlabs_model', 'eleven_multilingual_v2')
         self.stability = AI_CONFIG.get('elevenlabs_stability', 0.5)
         self.similarity_boost = AI_CONFIG.get('elevenlabs_similarity_boost', 0.75)
+        self.formato_saida = get_render_profile(perfil).get('tts_formato', 'mp3_44100_128')
+        if AUDIO_CONFIG.get('tts_pcm', False):
+            self.formato_saida = f"pcm_{AUDIO_CONFIG.get('sample_rate', 44100)}"
+        self.extensao = extensao_formato(self.formato_saida)
         
         self.audio_dir = '/tmp/audio_output'
         criar_diretorios([self.audio_dir])
@@ -58,7 +414,9 @@ class AudioGenerator:
         nome_arquivo: str,
         voice_id: Optional[str] = None,
         idioma: str = "pt-br",
-        emocao: str = "neutral"
+        emocao: str = "neutral",
+        com_timing: bool = False,
+        diretorio: Optional[str] = None
     ) -> Optional[str]:
         """
         Gera narração a partir de texto.
@@ -69,6 +427,10 @@ class AudioGenerator:
             voice_id: ID da voz (opcional, usa padrão do idioma)
             idioma: Código do idioma
             emocao: Emoção da narração
+            com_timing: Salvar timing de palavras/frases ao lado do áudio
+                        (ver caminho_timing)
+            diretorio: Diretório do áudio (padrão: audio_dir); projetos
+                       simultâneos usam diretórios próprios
         
         Returns:
             Caminho do arquivo de áudio gerado ou None
@@ -94,8 +456,27 @@ class AudioGenerator:
                 from config.settings import get_voice_for_language
                 voice_id = get_voice_for_language(idioma, 'narrator')
             
+            caminho_saida = self._caminho_saida(nome_arquivo, self.extensao, diretorio)
+            
+            # Com timing: o alinhamento vem junto da própria síntese
+            if com_timing:
+                return self._gerar_com_timing(texto, voice_id, caminho_saida)
+            
+            # Streaming: grava em disco conforme chega (memória limitada a um chunk)
+            if AUDIO_CONFIG.get('tts_streaming', True):
+                stream = self.gerar_narracao_stream(texto, nome_arquivo, voice_id=voice_id, diretorio=diretorio)
+                if not stream.aguardar():
+                    raise stream.erro or RuntimeError("Stream interrompido")
+                
+                print(f"✅ Narração gerada: {caminho_saida}")
+                print(f"   Tamanho: {stream.bytes_recebidos / (1024 * 1024):.2f} MB")
+                return caminho_saida
+            
+            from elevenlabs import generate, save, Voice, VoiceSettings
+            
             # Gerar áudio
-            audio = generate(
+            audio = chamar_remoto(
+                'elevenlabs', generate,
                 text=texto,
                 voice=Voice(
                     voice_id=voice_id,
@@ -104,16 +485,13 @@ class AudioGenerator:
                         similarity_boost=self.similarity_boost
                     )
                 ),
-                model=self.model
+                model=self.model,
+                output_format=self.formato_saida,
+                descricao='tts'
             )
             
             # Salvar arquivo
-            caminho_saida = os.path.join(
-                self.audio_dir,
-                f"{nome_arquivo}.mp3"
-            )
-            
-            save(audio, caminho_saida)
+            save(self._empacotar(audio), caminho_saida)
             
             # Verificar tamanho do arquivo
             tamanho_mb = os.path.getsize(caminho_saida) / (1024 * 1024)
@@ -127,17 +505,262 @@ class AudioGenerator:
             print(f"❌ Erro ao gerar narração: {e}")
             return None
     
+    def gerar_narracao_stream(
+        self,
+        texto: str,
+        nome_arquivo: str,
+        voice_id: Optional[str] = None,
+        idioma: str = "pt-br",
+        segundos_iniciais: Optional[float] = None,
+        ao_iniciar: Optional[Callable[[str], None]] = None,
+        diretorio: Optional[str] = None
+    ) -> NarracaoStream:
+        """
+        Inicia a narração em streaming e retorna imediatamente.
+        
+        Os chunks do endpoint '/stream' do ElevenLabs são gravados em um
+        arquivo parcial enquanto chegam; quando os primeiros segundos estão em
+        disco, o stream sinaliza inicio_pronto (e chama ao_iniciar), para que
+        o chamador comece a consumir o arquivo parcial antes do fim. As etapas
+        do pipeline não usam esse sinal: esperam o arquivo completo.
+        
+        Args:
+            texto: Texto a ser narrado
+            nome_arquivo: Nome do arquivo de saída (sem extensão)
+            voice_id: ID da voz (opcional, usa padrão do idioma)
+            idioma: Código do idioma
+            segundos_iniciais: Segundos que sinalizam o início (padrão: AUDIO_CONFIG)
+            ao_iniciar: Callback com o caminho parcial quando o início estiver pronto
+            diretorio: Diretório do áudio (padrão: audio_dir)
+        
+        Returns:
+            NarracaoStream em andamento
+        
+        Example:
+            >>> stream = gen.gerar_narracao_stream(texto, "cena_001_audio", ao_iniciar=print)
+            >>> caminho = stream.aguardar()
+        """
+        if voice_id is None:
+            from config.settings import get_voice_for_language
+            voice_id = get_voice_for_language(idioma, 'narrator')
+        
+        stream = NarracaoStream(
+            self._caminho_saida(nome_arquivo, self.extensao, diretorio),
+            self.formato_saida,
+            segundos_iniciais or AUDIO_CONFIG.get('tts_segundos_iniciais', 5.0),
+            ao_iniciar
+        )
+        
+        def transmitir():
+            try:
+                response = self._abrir_stream(voice_id, texto, 'stream')
+            except Exception as e:
+                print(f"❌ Erro ao iniciar stream de narração: {e}")
+                stream.falhar(e)
+                return
+            
+            with response:
+                stream.receber(response.iter_content(chunk_size=AUDIO_CONFIG.get('tts_chunk_bytes', 16384)))
+        
+        threading.Thread(target=transmitir, name=f"tts-{nome_arquivo}", daemon=True).start()
+        return stream
+    
+    def _abrir_stream(self, voice_id: str, texto: str, endpoint: str):
+        """
+        Abre uma resposta em streaming do text-to-speech.
+        
+        As tentativas valem apenas para a abertura: um stream já parcialmente
+        gravado não é repetível.
+        
+        Args:
+            voice_id: ID da voz
+            texto: Texto a ser narrado
+            endpoint: 'stream' ou 'stream/with-timestamps'
+        """
+        import requests
+        
+        def abrir():
+            response = requests.post(
+                f"{ELEVENLABS_API_URL}/text-to-speech/{voice_id}/{endpoint}",
+                headers={'xi-api-key': self.api_key},
+                params={'output_format': self.formato_saida},
+                json=self._corpo_tts(texto),
+                stream=True,
+                timeout=AI_CONFIG.get('timeout', 300)
+            )
+            response.raise_for_status()
+            return response
+        
+        return chamar_remoto('elevenlabs', abrir, descricao='tts_stream')
+    
+    def _caminho_saida(self, nome_arquivo: str, extensao: str, diretorio: Optional[str] = None) -> str:
+        """
+        Caminho de um áudio gerado (no diretório do projeto, se informado).
+        """
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        return os.path.join(diretorio or self.audio_dir, f"{nome_arquivo}.{extensao}")
+    
+    def _empacotar(self, dados: bytes) -> bytes:
+        """
+        Conteúdo do arquivo de áudio: PCM bruto ganha cabeçalho WAV.
+        """
+        if self.formato_saida.startswith('pcm_'):
+            return cabecalho_wav(int(self.formato_saida.split('_')[1]), len(dados)) + dados
+        return dados
+    
+    def _corpo_tts(self, texto: str) -> Dict:
+        """
+        Corpo das requisições de text-to-speech da API HTTP.
+        """
+        return {
+            'text': texto,
+            'model_id': self.model,
+            'voice_settings': {
+                'stability': self.stability,
+                'similarity_boost': self.similarity_boost
+            }
+        }
+    
+    def _gerar_com_timing(
+        self,
+        texto: str,
+        voice_id: str,
+        caminho_saida: str
+    ) -> Optional[str]:
+        """
+        Gera narração e salva o timing de palavras e frases.
+        
+        Usa o endpoint 'with-timestamps' do ElevenLabs (em streaming, com
+        tts_streaming), que devolve o áudio e o alinhamento por caractere na
+        mesma chamada. Se o alinhamento não vier, usa o alinhamento local
+        sobre a duração real do áudio.
+        
+        Args:
+            texto: Texto a ser narrado
+            voice_id: ID da voz
+            caminho_saida: Caminho do áudio de saída
+        
+        Returns:
+            Caminho do áudio gerado ou None
+        """
+        if AUDIO_CONFIG.get('tts_streaming', True):
+            alinhamento = self._sintetizar_stream_com_timing(texto, voice_id, caminho_saida)
+        else:
+            import requests
+            
+            def sintetizar():
+                response = requests.post(
+                    f"{ELEVENLABS_API_URL}/text-to-speech/{voice_id}/with-timestamps",
+                    headers={'xi-api-key': self.api_key},
+                    params={'output_format': self.formato_saida},
+                    json=self._corpo_tts(texto),
+                    timeout=AI_CONFIG.get('timeout', 300)
+                )
+                response.raise_for_status()
+                return response.json()
+            
+            resultado = chamar_remoto('elevenlabs', sintetizar, descricao='tts_timestamps')
+            
+            with open(caminho_saida, 'wb') as f:
+                f.write(self._empacotar(base64.b64decode(resultado['audio_base64'])))
+            
+            alinhamento = resultado.get('alignment') or resultado.get('normalized_alignment')
+        
+        if alinhamento and alinhamento.get('characters'):
+            fonte = 'elevenlabs'
+            palavras = agrupar_palavras(
+                alinhamento['characters'],
+                alinhamento['character_start_times_seconds'],
+                alinhamento['character_end_times_seconds']
+            )
+        else:
+            fonte = 'local'
+            duracao = obter_duracao_midia(caminho_saida) or len(texto) / 15.0
+            palavras = alinhar_texto_localmente(texto, duracao)
+        
+        timing = {
+            'fonte': fonte,
+            'duracao': palavras[-1]['fim'] if palavras else 0.0,
+            'palavras': palavras,
+            'frases': agrupar_frases(palavras)
+        }
+        
+        salvar_json(timing, caminho_timing(caminho_saida), identado=False)
+        
+        print(f"✅ Narração gerada: {caminho_saida}")
+        print(f"   Timing ({fonte}): {len(palavras)} palavras, {len(timing['frases'])} frases")
+        
+        return caminho_saida
+    
+    def _sintetizar_stream_com_timing(self, texto: str, voice_id: str, caminho_saida: str) -> Optional[Dict]:
+        """
+        Síntese com timestamps em streaming (uma linha JSON por chunk).
+        
+        O áudio de cada chunk vai direto para o disco; apenas o alinhamento é
+        acumulado em memória. Os tempos de cada chunk são deslocados quando a
+        API os envia relativos ao próprio chunk.
+        
+        Returns:
+            Alinhamento por caractere (formato da API) ou None
+        """
+        response = self._abrir_stream(voice_id, texto, 'stream/with-timestamps')
+        
+        stream = NarracaoStream(caminho_saida, self.formato_saida, AUDIO_CONFIG.get('tts_segundos_iniciais', 5.0))
+        alinhamento = {'characters': [], 'character_start_times_seconds': [], 'character_end_times_seconds': []}
+        
+        def chunks():
+            deslocamento = 0.0
+            for linha in response.iter_lines():
+                if not linha:
+                    continue
+                
+                dados = json.loads(linha)
+                parte = dados.get('alignment') or dados.get('normalized_alignment')
+                
+                if parte and parte.get('characters'):
+                    fins = alinhamento['character_end_times_seconds']
+                    fim_anterior = fins[-1] if fins else 0.0
+                    if parte['character_start_times_seconds'][0] + deslocamento < fim_anterior - 0.05:
+                        deslocamento = fim_anterior
+                    
+                    alinhamento['characters'].extend(parte['characters'])
+                    alinhamento['character_start_times_seconds'].extend(
+                        t + deslocamento for t in parte['character_start_times_seconds']
+                    )
+                    fins.extend(t + deslocamento for t in parte['character_end_times_seconds'])
+                
+                if dados.get('audio_base64'):
+                    yield base64.b64decode(dados['audio_base64'])
+        
+        with response:
+            stream.receber(chunks())
+        
+        if stream.erro:
+            raise stream.erro
+        
+        return alinhamento if alinhamento['characters'] else None
+    
     def gerar_audio_cenas(
         self,
         roteiro: Dict,
-        idioma: str = "pt-br"
+        idioma: str = "pt-br",
+        com_timing: bool = True,
+        mapa_vozes: Optional[MapaVozes] = None,
+        diretorio: Optional[str] = None
     ) -> Dict[int, str]:
         """
         Gera áudio para todas as cenas de um roteiro.
         
+        Cenas com tipo_audio 'dialogo' e falas de personagens ("Nome: texto")
+        são sintetizadas fala a fala, cada personagem com sua voz.
+        
         Args:
             roteiro: Roteiro completo com cenas
             idioma: Código do idioma
+            com_timing: Salvar timing de palavras/frases de cada cena
+            mapa_vozes: Vozes dos personagens (padrão: mapa 'padrao')
+            diretorio: Diretório dos áudios do projeto (padrão: audio_dir)
         
         Returns:
             Dicionário mapeando número da cena -> caminho do áudio
@@ -150,45 +773,264 @@ class AudioGenerator:
         
         print(f"🎬 Gerando áudio para {len(cenas)} cenas...")
         
-        audios = {}
-        
+        # Cenas sem narração ou só com música são puladas
+        cenas_narradas = []
         for cena in cenas:
+            if not cena.get('narrativa') or cena.get('tipo_audio', 'narracao') == 'musica_apenas':
+                print(f"   Cena {cena.get('numero', 0)}: pulando (sem narração)")
+            else:
+                cenas_narradas.append(cena)
+        
+        mapa_vozes = mapa_vozes or MapaVozes('padrao')
+        
+        def narrar(cena):
             numero = cena.get('numero', 0)
-            narrativa = cena.get('narrativa', '')
-            tipo_audio = cena.get('tipo_audio', 'narracao')
-            emocao = cena.get('emocao', 'neutral')
-            
-            # Pular se não houver narrativa ou se for música apenas
-            if not narrativa or tipo_audio == 'musica_apenas':
-                print(f"   Cena {numero}: pulando (sem narração)")
-                continue
-            
             print(f"   Processando cena {numero}...")
             
-            # Gerar narração
-            nome_arquivo = f"cena_{numero:03d}_audio"
+            falas = extrair_falas(cena) if cena.get('tipo_audio') == 'dialogo' else []
+            if eh_dialogo(falas):
+                return self.gerar_dialogo(
+                    falas,
+                    nome_arquivo=f"cena_{numero:03d}_audio",
+                    idioma=idioma,
+                    mapa_vozes=mapa_vozes,
+                    com_timing=com_timing,
+                    diretorio=diretorio
+                )
             
             caminho_audio = self.gerar_narracao(
-                texto=narrativa,
-                nome_arquivo=nome_arquivo,
+                texto=cena['narrativa'],
+                nome_arquivo=f"cena_{numero:03d}_audio",
                 idioma=idioma,
-                emocao=emocao
+                emocao=cena.get('emocao', 'neutral'),
+                com_timing=com_timing,
+                diretorio=diretorio
             )
             
-            if caminho_audio:
-                audios[numero] = caminho_audio
+            if caminho_audio and AUDIO_CONFIG.get('aparar_silencio', True):
+                caminho_audio = self.aparar_silencio(caminho_audio)
             
-            # Delay para evitar rate limiting
-            time.sleep(0.5)
+            return caminho_audio
+        
+        # Paralelismo regulado pela camada de chamadas remotas (sem delay fixo)
+        audios = {
+            cena.get('numero', 0): caminho_audio
+            for cena, caminho_audio in executar_em_paralelo('elevenlabs', narrar, cenas_narradas)
+            if caminho_audio
+        }
         
         print(f"✅ {len(audios)} áudios gerados com sucesso!")
         
         return audios
     
+    def aparar_silencio(self, caminho_audio: str) -> str:
+        """
+        Remove o silêncio do início e do fim de uma narração.
+        
+        A fala é medida por RMS sobre o PCM em cache; o timing de palavras e
+        frases (se existir) é deslocado para o áudio aparado.
+        
+        Args:
+            caminho_audio: Caminho da narração
+        
+        Returns:
+            Caminho do WAV aparado (ou o original se não houver o que aparar)
+        """
+        try:
+            amostras, meta = obter_cache_pcm().carregar(caminho_audio)
+            taxa = meta['taxa']
+            fala = medir_fala(amostras, taxa)
+            
+            if fala['duracao_fala'] <= 0:
+                return caminho_audio
+            
+            # Menos de um quadro de vídeo de cada lado: nada a aparar
+            if fala['inicio_fala'] < 0.04 and fala['duracao'] - fala['fim_fala'] < 0.04:
+                return caminho_audio
+            
+            inicio = int(fala['inicio_fala'] * taxa)
+            fim = int(fala['fim_fala'] * taxa)
+            
+            destino = f"{os.path.splitext(caminho_audio)[0]}_aparado.wav"
+            salvar_wav(amostras[inicio:fim], taxa, destino)
+            
+            timing = carregar_timing(caminho_audio)
+            if timing:
+                deslocamento = fala['inicio_fala']
+                duracao = fala['duracao_fala']
+                
+                for item in timing.get('palavras', []) + timing.get('frases', []):
+                    item['inicio'] = round(min(max(item['inicio'] - deslocamento, 0.0), duracao), 3)
+                    item['fim'] = round(min(max(item['fim'] - deslocamento, 0.0), duracao), 3)
+                
+                timing['duracao'] = round(duracao, 3)
+                salvar_json(timing, caminho_timing(destino), identado=False)
+            
+            print(
+                f"   ✂️ Silêncio aparado: {fala['duracao']:.2f}s → {fala['duracao_fala']:.2f}s "
+                f"({os.path.basename(destino)})"
+            )
+            return destino
+            
+        except Exception as e:
+            print(f"⚠️ Não foi possível aparar o silêncio de {caminho_audio}: {e}")
+            return caminho_audio
+    
+    def gerar_narracao_em_cache(self, texto: str, voice_id: str) -> Optional[str]:
+        """
+        Narração (com timing) reaproveitada do cache de síntese.
+        
+        A chave é o conteúdo (texto, voz, modelo, ajustes e formato); falas
+        repetidas entre cenas, vídeos ou execuções não voltam à API.
+        
+        Args:
+            texto: Texto a ser narrado
+            voice_id: ID da voz
+        
+        Returns:
+            Caminho do áudio em cache ou None
+        """
+        chave = hashlib.sha256(json.dumps(
+            [texto.strip(), voice_id, self.model, self.stability, self.similarity_boost, self.formato_saida],
+            ensure_ascii=False
+        ).encode('utf-8')).hexdigest()[:32]
+        
+        diretorio = os.path.join(DIRS['cache'], 'tts')
+        criar_diretorios([diretorio])
+        caminho = os.path.join(diretorio, f"{chave}.{self.extensao}")
+        
+        # O timing é gravado depois do áudio: sua presença indica entrada completa
+        if AUDIO_CONFIG.get('tts_cache', True) and os.path.exists(caminho_timing(caminho)):
+            return caminho
+        
+        try:
+            return self._gerar_com_timing(texto, voice_id, caminho)
+        except Exception as e:
+            print(f"❌ Erro ao gerar fala: {e}")
+            return None
+    
+    def gerar_dialogo(
+        self,
+        falas: List[Dict],
+        nome_arquivo: str,
+        idioma: str = "pt-br",
+        mapa_vozes: Optional[MapaVozes] = None,
+        com_timing: bool = True,
+        diretorio: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Sintetiza um diálogo fala a fala e monta o áudio da cena.
+        
+        Todas as falas são sintetizadas em paralelo (com cache); depois são
+        aparadas e colocadas em sequência com as pausas de AUDIO_CONFIG.
+        
+        Args:
+            falas: Lista de dicts com 'personagem' e 'texto' (ver extrair_falas)
+            nome_arquivo: Nome do arquivo de saída (sem extensão)
+            idioma: Código do idioma
+            mapa_vozes: Vozes dos personagens (padrão: mapa 'padrao')
+            com_timing: Salvar timing de palavras, frases e falas
+            diretorio: Diretório do áudio (padrão: audio_dir)
+        
+        Returns:
+            Caminho do WAV do diálogo ou None
+        
+        Example:
+            >>> falas = extrair_falas(cena)
+            >>> gen.gerar_dialogo(falas, "cena_003_audio", mapa_vozes=MapaVozes("serie_rei"))
+        """
+        import numpy as np
+        
+        if not falas:
+            return None
+        
+        mapa_vozes = mapa_vozes or MapaVozes('padrao')
+        print(f"💬 Gerando diálogo: {nome_arquivo} ({len(falas)} falas)")
+        
+        # Falas idênticas (mesmo texto e voz) são sintetizadas uma vez
+        pedidos = {(fala['texto'], mapa_vozes.voz(fala['personagem'], idioma)) for fala in falas}
+        sintetizados = dict(executar_em_paralelo(
+            'elevenlabs',
+            lambda pedido: self.gerar_narracao_em_cache(*pedido),
+            sorted(pedidos)
+        ))
+        
+        cache = obter_cache_pcm()
+        pausa = AUDIO_CONFIG.get('dialogo_pausa_ms', 250) / 1000
+        pausa_troca = AUDIO_CONFIG.get('dialogo_pausa_troca_ms', 450) / 1000
+        
+        partes = []
+        palavras = []
+        linhas = []
+        inicio = 0.0
+        anterior = None
+        
+        for fala in falas:
+            caminho = sintetizados.get((fala['texto'], mapa_vozes.voz(fala['personagem'], idioma)))
+            if not caminho:
+                print(f"❌ Fala de {fala['personagem']} não gerada, diálogo incompleto")
+                return None
+            
+            amostras, meta = cache.carregar(caminho)
+            taxa = meta['taxa']
+            
+            corte = (0.0, meta['duracao'])
+            if AUDIO_CONFIG.get('aparar_silencio', True):
+                medida = medir_fala(amostras, taxa)
+                if medida['duracao_fala'] > 0:
+                    corte = (medida['inicio_fala'], medida['fim_fala'])
+            
+            if anterior is not None:
+                intervalo = pausa if fala['personagem'] == anterior else pausa_troca
+                partes.append(np.zeros((int(intervalo * taxa), amostras.shape[1]), dtype=np.float32))
+                inicio += int(intervalo * taxa) / taxa
+            
+            trecho = amostras[int(corte[0] * taxa):int(corte[1] * taxa)]
+            duracao = len(trecho) / taxa
+            partes.append(trecho)
+            
+            timing = carregar_timing(caminho) or {}
+            for palavra in timing.get('palavras', []):
+                palavras.append({
+                    'texto': palavra['texto'],
+                    'inicio': round(inicio + min(max(palavra['inicio'] - corte[0], 0.0), duracao), 3),
+                    'fim': round(inicio + min(max(palavra['fim'] - corte[0], 0.0), duracao), 3)
+                })
+            
+            linhas.append({
+                'personagem': fala['personagem'],
+                'texto': fala['texto'],
+                'inicio': round(inicio, 3),
+                'fim': round(inicio + duracao, 3)
+            })
+            
+            inicio += duracao
+            anterior = fala['personagem']
+        
+        caminho_saida = self._caminho_saida(nome_arquivo, 'wav', diretorio)
+        salvar_wav(np.concatenate(partes), taxa, caminho_saida)
+        
+        if com_timing:
+            timing = {
+                'fonte': 'dialogo',
+                'duracao': round(inicio, 3),
+                'palavras': palavras,
+                'frases': agrupar_frases(palavras),
+                'falas': linhas
+            }
+            salvar_json(timing, caminho_timing(caminho_saida), identado=False)
+        
+        personagens = sorted({fala['personagem'] for fala in falas})
+        print(f"✅ Diálogo gerado: {caminho_saida}")
+        print(f"   {inicio:.1f}s, {len(personagens)} vozes: {', '.join(personagens)}")
+        
+        return caminho_saida
+    
     def gerar_multiplas_vozes(
         self,
         textos_por_personagem: Dict[str, str],
-        idioma: str = "pt-br"
+        idioma: str = "pt-br",
+        mapa_vozes: Optional[MapaVozes] = None
     ) -> Dict[str, str]:
         """
         Gera áudio com vozes diferentes para cada personagem.
@@ -196,33 +1038,32 @@ class AudioGenerator:
         Args:
             textos_por_personagem: Dict mapeando nome -> texto
             idioma: Código do idioma
+            mapa_vozes: Vozes dos personagens (padrão: mapa 'padrao'); a voz de
+                        um personagem não muda entre chamadas
         
         Returns:
             Dict mapeando nome -> caminho do áudio
         """
         print(f"👥 Gerando vozes para {len(textos_por_personagem)} personagens...")
         
-        audios = {}
-        voice_types = ['narrator', 'character_male', 'character_female']
+        mapa_vozes = mapa_vozes or MapaVozes('padrao')
         
-        for i, (personagem, texto) in enumerate(textos_por_personagem.items()):
-            # Alternar entre tipos de voz
-            voice_type = voice_types[i % len(voice_types)]
-            
-            from config.settings import get_voice_for_language
-            voice_id = get_voice_for_language(idioma, voice_type)
-            
-            nome_arquivo = f"personagem_{personagem.replace(' ', '_').lower()}"
-            
-            caminho_audio = self.gerar_narracao(
+        def sintetizar(item):
+            personagem, texto = item
+            return self.gerar_narracao(
                 texto=texto,
-                nome_arquivo=nome_arquivo,
-                voice_id=voice_id,
+                nome_arquivo=f"personagem_{personagem.replace(' ', '_').lower()}",
+                voice_id=mapa_vozes.voz(personagem, idioma),
                 idioma=idioma
             )
-            
-            if caminho_audio:
-                audios[personagem] = caminho_audio
+        
+        audios = {
+            personagem: caminho_audio
+            for (personagem, _), caminho_audio in executar_em_paralelo(
+                'elevenlabs', sintetizar, list(textos_por_personagem.items())
+            )
+            if caminho_audio
+        }
         
         return audios
     
@@ -238,29 +1079,28 @@ class AudioGenerator:
         Args:
             caminho_audio: Caminho do áudio original
             volume_db: Ajuste em decibéis (negativo para diminuir)
-            caminho_saida: Caminho de saída (opcional)
+            caminho_saida: Caminho de saída (opcional; o formato segue a
+                           extensão, padrão AUDIO_CONFIG['formato_intermediario'])
         
         Returns:
             Caminho do áudio ajustado
         """
         try:
-            from pydub import AudioSegment
-            
             print(f"🔊 Ajustando volume: {volume_db}dB")
             
-            # Carregar áudio
-            audio = AudioSegment.from_file(caminho_audio)
+            # Carregar áudio (PCM em cache)
+            amostras, meta = obter_cache_pcm().carregar(caminho_audio)
             
             # Ajustar volume
-            audio_ajustado = audio + volume_db
+            audio_ajustado = amostras * (10 ** (volume_db / 20))
             
             # Determinar caminho de saída
             if caminho_saida is None:
-                base, ext = os.path.splitext(caminho_audio)
-                caminho_saida = f"{base}_vol{int(volume_db)}{ext}"
+                base = os.path.splitext(caminho_audio)[0]
+                caminho_saida = f"{base}_vol{int(volume_db)}.{AUDIO_CONFIG.get('formato_intermediario', 'wav')}"
             
-            # Exportar
-            audio_ajustado.export(caminho_saida, format='mp3')
+            # Exportar (sem perdas, salvo extensão de entrega)
+            exportar_audio(audio_ajustado, meta['taxa'], caminho_saida)
             
             print(f"✅ Volume ajustado: {caminho_saida}")
             return caminho_saida
@@ -280,33 +1120,39 @@ class AudioGenerator:
         
         Args:
             audios: Lista de caminhos de áudio
-            caminho_saida: Caminho do áudio mesclado
+            caminho_saida: Caminho do áudio mesclado (o formato segue a extensão;
+                           use .wav/.flac para intermediários)
             crossfade_ms: Duração do crossfade em milissegundos
         
         Returns:
             Caminho do áudio mesclado
         """
+        import numpy as np
+        
         try:
-            from pydub import AudioSegment
-            
             print(f"🎵 Mesclando {len(audios)} áudios...")
             
             if not audios:
                 print("❌ Nenhum áudio para mesclar")
                 return None
             
-            # Carregar primeiro áudio
-            audio_final = AudioSegment.from_file(audios[0])
+            # Carregar primeiro áudio (PCM em cache)
+            cache = obter_cache_pcm()
+            audio_final = np.array(cache.carregar(audios[0])[0])
             
-            # Adicionar os demais com crossfade
+            # Adicionar os demais com crossfade linear
             for caminho in audios[1:]:
-                audio_novo = AudioSegment.from_file(caminho)
-                audio_final = audio_final.append(audio_novo, crossfade=crossfade_ms)
+                audio_novo = cache.carregar(caminho)[0]
+                n = min(int(crossfade_ms * cache.taxa / 1000), len(audio_final), len(audio_novo))
+                
+                rampa = np.linspace(0.0, 1.0, n, dtype=np.float32)[:, None]
+                transicao = audio_final[len(audio_final) - n:] * (1 - rampa) + audio_novo[:n] * rampa
+                audio_final = np.concatenate([audio_final[:len(audio_final) - n], transicao, audio_novo[n:]])
             
-            # Exportar
-            audio_final.export(caminho_saida, format='mp3', bitrate='192k')
+            # Exportar (única codificação)
+            exportar_audio(audio_final, cache.taxa, caminho_saida)
             
-            duracao_seg = len(audio_final) / 1000.0
+            duracao_seg = len(audio_final) / cache.taxa
             print(f"✅ Áudio mesclado: {duracao_seg:.1f}s - {caminho_saida}")
             
             return caminho_saida
@@ -328,37 +1174,32 @@ class AudioGenerator:
         Args:
             audio_principal: Caminho da narração
             musica_fundo: Caminho da música
-            caminho_saida: Caminho de saída
-            volume_musica_db: Volume da música (negativo para reduzir)
+            caminho_saida: Caminho de saída (o formato segue a extensão)
+            volume_musica_db: Nível da música relativo à narração (dB, após
+                              normalização por loudness)
         
         Returns:
             Caminho do áudio com música de fundo
         """
         try:
-            from pydub import AudioSegment
-            
             print(f"🎶 Adicionando música de fundo...")
             
-            # Carregar áudios
-            narracao = AudioSegment.from_file(audio_principal)
-            musica = AudioSegment.from_file(musica_fundo)
+            # Carregar áudios (PCM em cache)
+            cache = obter_cache_pcm()
+            narracao, meta = cache.carregar(audio_principal)
+            musica, _ = cache.carregar(musica_fundo)
             
-            # Ajustar volume da música
-            musica = musica + volume_musica_db
-            
-            # Loop da música se necessário
-            if len(musica) < len(narracao):
-                repeticoes = (len(narracao) // len(musica)) + 1
-                musica = musica * repeticoes
-            
-            # Cortar música para duração da narração
-            musica = musica[:len(narracao)]
-            
-            # Sobrepor
-            audio_final = narracao.overlay(musica)
+            # Normalizar, repetir/cortar a música e abaixá-la sob a narração
+            mix = mixar(
+                [(narracao, 0.0)],
+                duracao=meta['duracao'],
+                taxa=meta['taxa'],
+                musica=musica,
+                volume_musica_db=volume_musica_db
+            )
             
-            # Exportar
-            audio_final.export(caminho_saida, format='mp3', bitrate='192k')
+            # Exportar (única codificação)
+            exportar_audio(mix, meta['taxa'], caminho_saida)
             
             print(f"✅ Música de fundo adicionada: {caminho_saida}")
             return caminho_saida
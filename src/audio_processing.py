@@ -0,0 +1,406 @@
+"""
+🎚️ AUDIO PROCESSING - ProjetoX
+
+Análise de loudness (ITU-R BS.1770 / EBU R128) e mixagem com ducking.
+
+- Loudness integrado em LUFS com ponderação K e gating absoluto/relativo,
+  vetorizado em NumPy (a ponderação K é aplicada no domínio da frequência,
+  com a resposta exata dos dois biquads da norma)
+- Ganho por cena até o alvo, limitado pelo pico
+- Música de fundo normalizada e abaixada (sidechain) enquanto há narração,
+  tudo em uma única passada que gera o áudio final entregue ao encode
+"""
+
+import os
+import math
+from typing import Dict, List, Optional, Tuple
+
+# Imports locais
+try:
+    import sys
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import AUDIO_CONFIG
+except ImportError:
+    print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
+
+
+# Blocos de gating da BS.1770: 400 ms com 75% de sobreposição
+BLOCO_SEGUNDOS = 0.4
+PASSO_SEGUNDOS = 0.1
+
+# Gates absoluto (LUFS) e relativo (LU abaixo do loudness com gate absoluto)
+GATE_ABSOLUTO = -70.0
+GATE_RELATIVO = -10.0
+
+# Quadro de análise do envelope de ducking (segundos)
+QUADRO_DUCKING = 0.01
+
+
+def coeficientes_k(taxa: int) -> List[Tuple[List[float], List[float]]]:
+    """
+    Coeficientes (b, a) dos dois estágios da ponderação K para uma taxa.
+    
+    Estágio 1: shelf de alta (efeito acústico da cabeça).
+    Estágio 2: passa-altas RLB.
+    
+    Args:
+        taxa: Taxa de amostragem (Hz)
+    
+    Returns:
+        Lista com os dois biquads [(b, a), (b, a)]
+    """
+    # Shelf de alta
+    f0, ganho_db, q = 1681.974450955533, 3.999843853973347, 0.7071752369554196
+    k = math.tan(math.pi * f0 / taxa)
+    vh = 10 ** (ganho_db / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf = (
+        [(vh + vb * k / q + k * k) / a0, 2 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0],
+        [1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0],
+    )
+    
+    # Passa-altas
+    f0, q = 38.13547087602444, 0.5003270373238773
+    k = math.tan(math.pi * f0 / taxa)
+    a0 = 1 + k / q + k * k
+    passa_altas = (
+        [1.0, -2.0, 1.0],
+        [1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0],
+    )
+    
+    return [shelf, passa_altas]
+
+
+def filtrar_k(amostras, taxa: int):
+    """
+    Aplica a ponderação K a um sinal [amostras, canais].
+    
+    Sem SciPy, o filtro IIR é aplicado multiplicando o espectro pela
+    resposta em frequência dos biquads (com preenchimento de zeros para
+    evitar convolução circular).
+    
+    Args:
+        amostras: Array float [amostras, canais]
+        taxa: Taxa de amostragem
+    
+    Returns:
+        Sinal filtrado (float64)
+    """
+    import numpy as np
+    
+    n = amostras.shape[0]
+    tamanho = 1 << (n + taxa // 10).bit_length()  # cauda de ~100 ms para a resposta do IIR
+    
+    espectro = np.fft.rfft(np.asarray(amostras, dtype=np.float64), n=tamanho, axis=0)
+    z = np.exp(-1j * np.linspace(0, np.pi, espectro.shape[0]))
+    
+    resposta = np.ones_like(z)
+    for b, a in coeficientes_k(taxa):
+        resposta *= (b[0] + b[1] * z + b[2] * z * z) / (a[0] + a[1] * z + a[2] * z * z)
+    
+    return np.fft.irfft(espectro * resposta[:, None], n=tamanho, axis=0)[:n]
+
+
+def potencia_blocos(amostras, taxa: int):
+    """
+    Potência média ponderada (soma dos canais) de cada bloco de gating.
+    
+    Returns:
+        Array com a potência de cada bloco de 400 ms (passo de 100 ms)
+    """
+    import numpy as np
+    
+    filtrado = filtrar_k(amostras, taxa)
+    bloco = int(BLOCO_SEGUNDOS * taxa)
+    passo = int(PASSO_SEGUNDOS * taxa)
+    
+    if filtrado.shape[0] < bloco:
+        return np.array([])
+    
+    # Somas por bloco a partir da soma acumulada (sem laço por bloco)
+    acumulado = np.concatenate([np.zeros((1, filtrado.shape[1])), np.cumsum(filtrado ** 2, axis=0)])
+    inicios = np.arange(0, filtrado.shape[0] - bloco + 1, passo)
+    medias = (acumulado[inicios + bloco] - acumulado[inicios]) / bloco
+    
+    return medias.sum(axis=1)  # pesos G = 1 para L/R (e mono)
+
+
+def loudness_integrado(amostras, taxa: int) -> float:
+    """
+    Loudness integrado (LUFS) segundo a BS.1770-4.
+    
+    Args:
+        amostras: Array float [amostras, canais]
+        taxa: Taxa de amostragem
+    
+    Returns:
+        Loudness em LUFS (-inf para silêncio ou trechos menores que 400 ms)
+    
+    Example:
+        >>> amostras, meta = obter_cache_pcm().carregar("cena_001_audio.mp3")
+        >>> loudness_integrado(amostras, meta['taxa'])
+        -19.4
+    """
+    import numpy as np
+    
+    potencias = potencia_blocos(amostras, taxa)
+    if potencias.size == 0:
+        return float('-inf')
+    
+    with np.errstate(divide='ignore'):
+        loudness = -0.691 + 10 * np.log10(potencias)
+    
+    acima_absoluto = potencias[loudness > GATE_ABSOLUTO]
+    if acima_absoluto.size == 0:
+        return float('-inf')
+    
+    limite_relativo = -0.691 + 10 * np.log10(acima_absoluto.mean()) + GATE_RELATIVO
+    selecionados = potencias[(loudness > GATE_ABSOLUTO) & (loudness > limite_relativo)]
+    
+    return float(-0.691 + 10 * np.log10(selecionados.mean()))
+
+
+def ganho_para_alvo(
+    amostras,
+    taxa: int,
+    alvo_lufs: float,
+    pico_maximo_db: Optional[float] = None
+) -> float:
+    """
+    Ganho linear que leva o sinal ao loudness alvo sem passar do pico.
+    
+    Args:
+        amostras: Array float [amostras, canais]
+        taxa: Taxa de amostragem
+        alvo_lufs: Loudness alvo
+        pico_maximo_db: Pico máximo de amostra em dBFS (padrão: AUDIO_CONFIG)
+    
+    Returns:
+        Ganho linear (1.0 para silêncio)
+    """
+    import numpy as np
+    
+    loudness = loudness_integrado(amostras, taxa)
+    if not math.isfinite(loudness):
+        return 1.0
+    
+    ganho = 10 ** ((alvo_lufs - loudness) / 20)
+    
+    if pico_maximo_db is None:
+        pico_maximo_db = AUDIO_CONFIG.get('pico_maximo_db', -1.0)
+    
+    pico = float(np.abs(amostras).max()) if amostras.size else 0.0
+    pico_maximo = 10 ** (pico_maximo_db / 20)
+    if pico > 0 and pico * ganho > pico_maximo:
+        ganho = pico_maximo / pico
+    
+    return ganho
+
+
+def envelope_ducking(
+    voz,
+    taxa: int,
+    reducao_db: Optional[float] = None,
+    limiar_db: Optional[float] = None,
+    ataque_ms: Optional[float] = None,
+    liberacao_ms: Optional[float] = None
+):
+    """
+    Ganho por amostra para a música, abaixando-a enquanto há voz.
+    
+    O nível da voz é medido por quadros de 10 ms (RMS vetorizado); ataque e
+    liberação suavizam o ganho quadro a quadro e o resultado é interpolado
+    para a taxa de amostragem.
+    
+    Args:
+        voz: Sinal de controle [amostras, canais] (a narração)
+        taxa: Taxa de amostragem
+        reducao_db: Atenuação com voz ativa (padrão: AUDIO_CONFIG['ducking_db'])
+        limiar_db: Nível RMS (dBFS) a partir do qual há voz
+        ataque_ms: Tempo para abaixar a música
+        liberacao_ms: Tempo para a música voltar
+    
+    Returns:
+        Array float32 [amostras] com o ganho linear
+    """
+    import numpy as np
+    
+    reducao_db = AUDIO_CONFIG.get('ducking_db', -8.0) if reducao_db is None else reducao_db
+    limiar_db = AUDIO_CONFIG.get('ducking_limiar_db', -40.0) if limiar_db is None else limiar_db
+    ataque_ms = ataque_ms or AUDIO_CONFIG.get('ducking_ataque_ms', 50)
+    liberacao_ms = liberacao_ms or AUDIO_CONFIG.get('ducking_liberacao_ms', 400)
+    
+    n = voz.shape[0]
+    quadro = max(1, int(QUADRO_DUCKING * taxa))
+    num_quadros = max(1, -(-n // quadro))
+    
+    mono = np.zeros(num_quadros * quadro, dtype=np.float32)
+    mono[:n] = np.asarray(voz, dtype=np.float32).mean(axis=1)
+    rms = np.sqrt((mono.reshape(num_quadros, quadro) ** 2).mean(axis=1))
+    
+    with np.errstate(divide='ignore'):
+        ativo = 20 * np.log10(rms) > limiar_db
+    alvo = np.where(ativo, reducao_db, 0.0)
+    
+    # Suavização de um polo: ataque ao abaixar, liberação ao subir
+    coef_ataque = math.exp(-QUADRO_DUCKING * 1000 / ataque_ms)
+    coef_liberacao = math.exp(-QUADRO_DUCKING * 1000 / liberacao_ms)
+    
+    ganho_db = np.empty(num_quadros)
+    atual = 0.0
+    for i, valor in enumerate(alvo):
+        coef = coef_ataque if valor < atual else coef_liberacao
+        atual = coef * atual + (1 - coef) * valor
+        ganho_db[i] = atual
+    
+    centros = (np.arange(num_quadros) + 0.5) * quadro
+    return (10 ** (np.interp(np.arange(n), centros, ganho_db) / 20)).astype(np.float32)
+
+
+def mixar(
+    narracoes: List[Tuple[object, float]],
+    duracao: float,
+    taxa: int,
+    musica=None,
+    normalizar: Optional[bool] = None,
+    volume_musica_db: Optional[float] = None
+):
+    """
+    Mixagem final em uma passada: narrações normalizadas + música com ducking.
+    
+    Args:
+        narracoes: Lista de (amostras [n, canais], início em segundos)
+        duracao: Duração total (segundos)
+        taxa: Taxa de amostragem
+        musica: Amostras da música de fundo (repetida/cortada até a duração)
+        normalizar: Normalizar por loudness (padrão: AUDIO_CONFIG)
+        volume_musica_db: Nível da música relativo à narração (padrão:
+                          AUDIO_CONFIG['background_music_volume'])
+    
+    Returns:
+        Array float32 [amostras, canais] pronto para o encode
+    
+    Example:
+        >>> mix = mixar([(cena1, 0.0), (cena2, 9.5)], duracao=20.0, taxa=44100, musica=trilha)
+    """
+    import numpy as np
+    
+    normalizar = AUDIO_CONFIG.get('normalizar_loudness', True) if normalizar is None else normalizar
+    alvo_narracao = AUDIO_CONFIG.get('alvo_lufs_narracao', -16.0)
+    volume_musica = AUDIO_CONFIG.get('background_music_volume', -10) if volume_musica_db is None else volume_musica_db
+    
+    canais = max([a.shape[1] for a, _ in narracoes] + ([musica.shape[1]] if musica is not None else [1]))
+    total = int(round(duracao * taxa))
+    voz = np.zeros((total, canais), dtype=np.float32)
+    
+    for amostras, inicio in narracoes:
+        ganho = ganho_para_alvo(amostras, taxa, alvo_narracao) if normalizar else 1.0
+        inicio = int(round(inicio * taxa))
+        fim = min(total, inicio + amostras.shape[0])
+        if fim > inicio:
+            voz[inicio:fim] += amostras[:fim - inicio] * np.float32(ganho)
+    
+    if musica is None or musica.shape[0] == 0:
+        mix = voz
+    else:
+        # Música no alvo da narração + volume de fundo (em vez de offset fixo)
+        if normalizar:
+            ganho_musica = ganho_para_alvo(musica, taxa, alvo_narracao + volume_musica)
+        else:
+            ganho_musica = 10 ** (volume_musica / 20)
+        
+        repeticoes = -(-total // musica.shape[0])
+        trilha = np.tile(musica, (repeticoes, 1))[:total] if repeticoes > 1 else np.asarray(musica[:total])
+        trilha = np.broadcast_to(trilha, (total, canais)) if trilha.shape[1] != canais else trilha
+        
+        ganho = envelope_ducking(voz, taxa) * np.float32(ganho_musica)
+        mix = voz + trilha * ganho[:, None]
+    
+    # Segurança contra clipping na soma
+    pico = float(np.abs(mix).max()) if mix.size else 0.0
+    if pico > 1.0:
+        mix /= pico
+    
+    return mix
+
+
+def medir_fala(
+    amostras,
+    taxa: int,
+    limiar_db: Optional[float] = None,
+    margem_ms: Optional[float] = None
+) -> Dict:
+    """
+    Início e fim da fala, pelo RMS de quadros de 10 ms (vetorizado).
+    
+    Args:
+        amostras: Array float [amostras, canais]
+        taxa: Taxa de amostragem
+        limiar_db: Nível RMS (dBFS) abaixo do qual o quadro é silêncio
+                   (padrão: AUDIO_CONFIG['silencio_limiar_db'])
+        margem_ms: Silêncio preservado antes e depois da fala
+                   (padrão: AUDIO_CONFIG['silencio_margem_ms'])
+    
+    Returns:
+        Dict com 'duracao', 'inicio_fala', 'fim_fala' e 'duracao_fala' (segundos)
+    """
+    import numpy as np
+    
+    limiar_db = AUDIO_CONFIG.get('silencio_limiar_db', -45.0) if limiar_db is None else limiar_db
+    margem_ms = AUDIO_CONFIG.get('silencio_margem_ms', 80) if margem_ms is None else margem_ms
+    
+    n = amostras.shape[0]
+    duracao = n / taxa
+    quadro = max(1, int(QUADRO_DUCKING * taxa))
+    num_quadros = n // quadro
+    
+    if num_quadros == 0:
+        return {'duracao': duracao, 'inicio_fala': 0.0, 'fim_fala': duracao, 'duracao_fala': duracao}
+    
+    blocos = np.asarray(amostras[:num_quadros * quadro], dtype=np.float32).reshape(num_quadros, quadro, -1)
+    rms = np.sqrt((blocos ** 2).mean(axis=(1, 2)))
+    
+    with np.errstate(divide='ignore'):
+        com_fala = np.flatnonzero(20 * np.log10(rms) > limiar_db)
+    
+    if com_fala.size == 0:
+        return {'duracao': duracao, 'inicio_fala': 0.0, 'fim_fala': 0.0, 'duracao_fala': 0.0}
+    
+    margem = margem_ms / 1000
+    inicio = max(0.0, com_fala[0] * quadro / taxa - margem)
+    fim = min(duracao, (com_fala[-1] + 1) * quadro / taxa + margem)
+    
+    return {
+        'duracao': duracao,
+        'inicio_fala': round(inicio, 3),
+        'fim_fala': round(fim, 3),
+        'duracao_fala': round(fim - inicio, 3),
+    }
+
+
+def exemplo_uso():
+    """
+    Exemplo de uso: loudness de arquivos de áudio.
+    """
+    from src.pcm_cache import obter_cache_pcm
+    
+    if len(sys.argv) < 2:
+        print("Uso: python audio_processing.py audio.mp3 [audio2.mp3 ...]")
+        return
+    
+    alvo = AUDIO_CONFIG.get('alvo_lufs_narracao', -16.0)
+    
+    for caminho in sys.argv[1:]:
+        amostras, meta = obter_cache_pcm().carregar(caminho)
+        loudness = loudness_integrado(amostras, meta['taxa'])
+        ganho = ganho_para_alvo(amostras, meta['taxa'], alvo)
+        fala = medir_fala(amostras, meta['taxa'])
+        print(f"   {caminho}: {loudness:.1f} LUFS -> ganho {20 * math.log10(ganho):+.1f} dB (alvo {alvo} LUFS)")
+        print(f"      Fala: {fala['inicio_fala']:.2f}s - {fala['fim_fala']:.2f}s de {fala['duracao']:.2f}s")
+
+
+if __name__ == '__main__':
+    exemplo_uso()
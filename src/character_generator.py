@@ -7,19 +7,22 @@ Suporta Leonardo.AI e Replicate para geração de imagens.
 
 import os
 import time
-import replicate
 from typing import Dict, List, Optional
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # Imports locais
 try:
     import sys
-    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-    from config.settings import CHARACTER_CONFIG, AI_CONFIG
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import CHARACTER_CONFIG, AI_CONFIG, OPTIMIZATION_CONFIG, get_render_profile
     from src.utils import (
         validar_api_key, download_arquivo, salvar_json,
         gerar_nome_arquivo_unico, criar_diretorios
     )
+    from src.remote_calls import chamar_remoto
 except ImportError:
     print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
 
@@ -31,13 +34,14 @@ class CharacterGenerator:
     Cria personagens consistentes no estilo especificado para uso em vídeos.
     """
     
-    def __init__(self, api_token: str, use_leonardo: bool = False):
+    def __init__(self, api_token: str, use_leonardo: bool = False, perfil: str = 'final'):
         """
         Inicializa o gerador de personagens.
         
         Args:
             api_token: Token da API (Replicate ou Leonardo)
             use_leonardo: Se True, usa Leonardo.AI; se False, usa Replicate
+            perfil: Perfil de renderização ('final' ou 'rascunho')
         """
         if not validar_api_key(api_token, 'replicate' if not use_leonardo else 'leonardo'):
             raise ValueError(f"❌ API token inválido")
@@ -49,14 +53,24 @@ class CharacterGenerator:
         if not use_leonardo:
             os.environ['REPLICATE_API_TOKEN'] = api_token
         
+        self.perfil = perfil
+        perfil_cfg = get_render_profile(perfil)
+        
         self.style = CHARACTER_CONFIG.get('style', 'cartoon_3d')
-        self.resolution = CHARACTER_CONFIG.get('resolution', 1024)
+        self.resolution = perfil_cfg.get('resolucao_personagem', CHARACTER_CONFIG.get('resolution', 1024))
+        self.passos_inferencia = perfil_cfg.get('passos_inferencia', 30)
         self.cache_dir = '/tmp/characters_cache'
+        if perfil != 'final':
+            self.cache_dir = os.path.join(self.cache_dir, perfil)
         criar_diretorios([self.cache_dir])
         
+        # Biblioteca compartilhada entre projetos (criada sob demanda)
+        self._biblioteca = None
+        
         print(f"✅ CharacterGenerator inicializado")
         print(f"   Serviço: {'Leonardo.AI' if use_leonardo else 'Replicate'}")
         print(f"   Estilo: {self.style}")
+        print(f"   Perfil: {perfil} ({self.resolution}px)")
     
     def gerar_personagem(
         self,
@@ -64,7 +78,9 @@ class CharacterGenerator:
         nome: str,
         num_variacoes: int = 1,
         estilo_override: Optional[str] = None,
-        cache_enabled: bool = True
+        cache_enabled: bool = True,
+        em_lote: bool = True,
+        diretorio: Optional[str] = None
     ) -> List[Dict]:
         """
         Gera um personagem com base na descrição.
@@ -75,6 +91,9 @@ class CharacterGenerator:
             num_variacoes: Número de variações a gerar
             estilo_override: Sobrescrever estilo padrão
             cache_enabled: Usar cache se disponível
+            em_lote: Pedir todas as variações em uma predição (num_outputs)
+            diretorio: Diretório das imagens (padrão: cache do gerador); projetos
+                       simultâneos usam diretórios próprios
         
         Returns:
             Lista de dicionários com informações das imagens geradas
@@ -90,10 +109,40 @@ class CharacterGenerator:
         print(f"   Variações: {num_variacoes}")
         
         estilo = estilo_override or self.style
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        diretorio = diretorio or self.cache_dir
         
         # Construir prompt melhorado
         prompt = self._construir_prompt(descricao, estilo)
         
+        if em_lote and not self.use_leonardo:
+            resultados = self._gerar_variacoes_em_lote(prompt, descricao, nome, estilo, num_variacoes, diretorio)
+        else:
+            resultados = self._gerar_variacoes_serial(prompt, descricao, nome, estilo, num_variacoes, diretorio)
+        
+        if resultados:
+            print(f"✅ {len(resultados)} personagens gerados com sucesso!")
+        else:
+            print(f"❌ Nenhum personagem foi gerado")
+        
+        return resultados
+    
+    def _gerar_variacoes_serial(
+        self,
+        prompt: str,
+        descricao: str,
+        nome: str,
+        estilo: str,
+        num_variacoes: int,
+        diretorio: str
+    ) -> List[Dict]:
+        """
+        Gera as variações uma predição por vez.
+        
+        Returns:
+            Lista de dicionários com informações das imagens geradas
+        """
         resultados = []
         
         for i in range(num_variacoes):
@@ -108,38 +157,92 @@ class CharacterGenerator:
                 if url_imagem:
                     # Baixar imagem
                     nome_arquivo = f"{nome.replace(' ', '_').lower()}_v{i+1}.png"
-                    caminho_local = os.path.join(self.cache_dir, nome_arquivo)
+                    caminho_local = os.path.join(diretorio, nome_arquivo)
                     
                     if download_arquivo(url_imagem, caminho_local):
-                        resultado = {
-                            'nome': nome,
-                            'variacao': i + 1,
-                            'url': url_imagem,
-                            'caminho_local': caminho_local,
-                            'descricao': descricao,
-                            'estilo': estilo,
-                            'prompt_usado': prompt,
-                            'gerado_em': time.strftime('%Y-%m-%d %H:%M:%S')
-                        }
+                        resultado = self._montar_resultado(
+                            nome, i + 1, url_imagem, caminho_local, descricao, estilo, prompt
+                        )
                         resultados.append(resultado)
                         print(f"   ✅ Variação {i+1} gerada e salva")
                     else:
                         print(f"   ⚠️ Erro ao baixar variação {i+1}")
-                
-                # Delay para evitar rate limiting
-                if i < num_variacoes - 1:
-                    time.sleep(2)
                     
             except Exception as e:
                 print(f"   ❌ Erro na variação {i+1}: {e}")
         
-        if resultados:
-            print(f"✅ {len(resultados)} personagens gerados com sucesso!")
-        else:
-            print(f"❌ Nenhum personagem foi gerado")
-        
         return resultados
     
+    def _gerar_variacoes_em_lote(
+        self,
+        prompt: str,
+        descricao: str,
+        nome: str,
+        estilo: str,
+        num_variacoes: int,
+        diretorio: str
+    ) -> List[Dict]:
+        """
+        Gera as variações com num_outputs e baixa as imagens em paralelo.
+        
+        Todas as variações (até max_outputs_por_predicao por predição) saem
+        de uma única chamada ao SDXL.
+        
+        Returns:
+            Lista de dicionários com informações das imagens geradas
+        """
+        max_por_predicao = CHARACTER_CONFIG.get('max_outputs_por_predicao', 4)
+        
+        urls = []
+        while len(urls) < num_variacoes:
+            lote = min(max_por_predicao, num_variacoes - len(urls))
+            print(f"   Gerando {lote} variações em uma predição...")
+            
+            novas = self._gerar_urls_replicate(prompt, num_outputs=lote)
+            if not novas:
+                break
+            urls.extend(novas)
+        
+        def baixar(indice_url):
+            i, url_imagem = indice_url
+            nome_arquivo = f"{nome.replace(' ', '_').lower()}_v{i+1}.png"
+            caminho_local = os.path.join(diretorio, nome_arquivo)
+            
+            if download_arquivo(url_imagem, caminho_local):
+                return self._montar_resultado(nome, i + 1, url_imagem, caminho_local, descricao, estilo, prompt)
+            
+            print(f"   ⚠️ Erro ao baixar variação {i+1}")
+            return None
+        
+        with ThreadPoolExecutor(max_workers=max(1, len(urls))) as executor:
+            baixados = list(executor.map(baixar, enumerate(urls[:num_variacoes])))
+        
+        return [r for r in baixados if r]
+    
+    @staticmethod
+    def _montar_resultado(
+        nome: str,
+        variacao: int,
+        url_imagem: str,
+        caminho_local: str,
+        descricao: str,
+        estilo: str,
+        prompt: str
+    ) -> Dict:
+        """
+        Monta o dicionário de informações de uma variação gerada.
+        """
+        return {
+            'nome': nome,
+            'variacao': variacao,
+            'url': url_imagem,
+            'caminho_local': caminho_local,
+            'descricao': descricao,
+            'estilo': estilo,
+            'prompt_usado': prompt,
+            'gerado_em': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+    
     def _construir_prompt(self, descricao: str, estilo: str) -> str:
         """
         Constrói prompt otimizado para geração de personagem.
@@ -184,25 +287,46 @@ class CharacterGenerator:
         Returns:
             URL da imagem gerada ou None
         """
+        urls = self._gerar_urls_replicate(prompt, num_outputs=1)
+        return urls[0] if urls else None
+    
+    def _gerar_urls_replicate(self, prompt: str, num_outputs: int = 1) -> List[str]:
+        """
+        Gera uma ou mais imagens em uma única predição do Replicate.
+        
+        Args:
+            prompt: Prompt para geração
+            num_outputs: Número de imagens (SDXL aceita até 4)
+        
+        Returns:
+            Lista de URLs das imagens geradas (vazia se falhar)
+        """
         try:
+            import replicate
+            
             # Usar SDXL (Stable Diffusion XL) para qualidade
-            output = replicate.run(
-                "stability-ai/sdxl:39ed52f2a78e934b3ba6e2a89f5b1c712de7dfea535525255b1aa35c5565e08b",
+            output = chamar_remoto(
+                'replicate', replicate.run,
+                AI_CONFIG.get(
+                    'replicate_image_model',
+                    "stability-ai/sdxl:39ed52f2a78e934b3ba6e2a89f5b1c712de7dfea535525255b1aa35c5565e08b"
+                ),
                 input={
                     "prompt": prompt,
                     "width": self.resolution,
                     "height": self.resolution,
-                    "num_outputs": 1,
+                    "num_outputs": num_outputs,
                     "guidance_scale": 7.5,
-                    "num_inference_steps": 30,
-                }
+                    "num_inference_steps": self.passos_inferencia,
+                },
+                descricao='sdxl'
             )
             
             # Output é uma lista de URLs
             if output and len(output) > 0:
-                return output[0]
+                return [str(url) for url in output]
             
-            return None
+            return []
             
         except Exception as e:
             error_msg = str(e).lower()
@@ -237,7 +361,7 @@ class CharacterGenerator:
             else:
                 print(f"❌ Erro no Replicate: {e}")
             
-            return None
+            return []
     
     def _gerar_com_leonardo(self, prompt: str) -> Optional[str]:
         """
@@ -258,7 +382,10 @@ class CharacterGenerator:
     def gerar_conjunto_personagens(
         self,
         lista_personagens: List[Dict],
-        cache_enabled: bool = True
+        cache_enabled: bool = True,
+        paralelo: bool = True,
+        max_concorrencia: Optional[int] = None,
+        diretorio: Optional[str] = None
     ) -> Dict[str, List[Dict]]:
         """
         Gera múltiplos personagens de uma vez.
@@ -266,6 +393,10 @@ class CharacterGenerator:
         Args:
             lista_personagens: Lista de dicts com 'nome' e 'descricao'
             cache_enabled: Usar cache
+            paralelo: Gerar personagens diferentes simultaneamente
+            max_concorrencia: Limite de personagens simultâneos
+                              (padrão: CHARACTER_CONFIG['max_concorrencia'])
+            diretorio: Diretório das imagens (ver gerar_personagem)
         
         Returns:
             Dicionário mapeando nome -> lista de variações
@@ -279,9 +410,8 @@ class CharacterGenerator:
         """
         print(f"👥 Gerando conjunto de {len(lista_personagens)} personagens...")
         
-        resultados = {}
-        
-        for i, personagem in enumerate(lista_personagens):
+        def processar(indice_personagem):
+            i, personagem = indice_personagem
             nome = personagem.get('nome', f'Personagem_{i+1}')
             descricao = personagem.get('descricao', '')
             num_variacoes = personagem.get('num_variacoes', 1)
@@ -292,11 +422,21 @@ class CharacterGenerator:
                 descricao=descricao,
                 nome=nome,
                 num_variacoes=num_variacoes,
-                cache_enabled=cache_enabled
+                cache_enabled=cache_enabled,
+                diretorio=diretorio
             )
             
-            if variacoes:
-                resultados[nome] = variacoes
+            return nome, variacoes
+        
+        if paralelo and len(lista_personagens) > 1:
+            limite = max_concorrencia or CHARACTER_CONFIG.get('max_concorrencia', 3)
+            with ThreadPoolExecutor(max_workers=limite) as executor:
+                gerados = list(executor.map(processar, enumerate(lista_personagens)))
+        else:
+            gerados = [processar(item) for item in enumerate(lista_personagens)]
+        
+        # Manter a ordem original da lista
+        resultados = {nome: variacoes for nome, variacoes in gerados if variacoes}
         
         print(f"\n✅ Conjunto completo: {len(resultados)} personagens gerados")
         return resultados
@@ -343,13 +483,22 @@ class CharacterGenerator:
     
     def criar_personagem_de_roteiro(
         self,
-        roteiro: Dict
+        roteiro: Dict,
+        usar_biblioteca: Optional[bool] = None,
+        diretorio: Optional[str] = None
     ) -> Dict[str, List[Dict]]:
         """
         Cria todos os personagens necessários de um roteiro.
         
+        Personagens de mesmo nome já existentes na biblioteca são
+        reaproveitados em vez de gerados novamente (ver
+        CharacterLibrary.reutilizar_para_roteiro).
+        
         Args:
             roteiro: Roteiro completo com seção 'personagens_necessarios'
+            usar_biblioteca: Consultar/alimentar a biblioteca de personagens
+                             (padrão: OPTIMIZATION_CONFIG['enable_character_cache'])
+            diretorio: Diretório das imagens geradas (ver gerar_personagem)
         
         Returns:
             Dicionário com todos os personagens gerados
@@ -362,6 +511,17 @@ class CharacterGenerator:
         
         print(f"📋 Criando personagens do roteiro...")
         
+        if usar_biblioteca is None:
+            usar_biblioteca = OPTIMIZATION_CONFIG.get('enable_character_cache', True)
+        
+        biblioteca = self._obter_biblioteca() if usar_biblioteca else None
+        reaproveitados = {}
+        
+        if biblioteca:
+            reaproveitados, personagens_info = biblioteca.reutilizar_para_roteiro(
+                personagens_info, estilo=self.style
+            )
+        
         # Converter para formato adequado
         lista_personagens = []
         for p in personagens_info:
@@ -371,7 +531,33 @@ class CharacterGenerator:
                 'num_variacoes': 2  # Gerar 2 variações por personagem
             })
         
-        return self.gerar_conjunto_personagens(lista_personagens)
+        gerados = self.gerar_conjunto_personagens(lista_personagens, diretorio=diretorio) if lista_personagens else {}
+        
+        # Somente imagens do perfil final entram na biblioteca
+        if biblioteca and self.perfil == 'final':
+            for variacoes in gerados.values():
+                for v in variacoes:
+                    biblioteca.adicionar(
+                        v['caminho_local'], v['nome'], v['descricao'], v['estilo'],
+                        projeto=roteiro.get('titulo', '')
+                    )
+        
+        reaproveitados.update(gerados)
+        return reaproveitados
+    
+    def _obter_biblioteca(self):
+        """
+        Retorna a biblioteca de personagens, ou None se indisponível.
+        """
+        if self._biblioteca is None:
+            try:
+                from src.character_library import CharacterLibrary
+                self._biblioteca = CharacterLibrary()
+            except Exception as e:
+                print(f"⚠️ Biblioteca de personagens indisponível: {e}")
+                self._biblioteca = False
+        
+        return self._biblioteca or None
     
     def salvar_catalogo_personagens(
         self,
@@ -0,0 +1,451 @@
+"""
+📚 CHARACTER LIBRARY - ProjetoX
+
+Biblioteca de personagens reutilizáveis entre projetos.
+
+Cada imagem é armazenada uma única vez (nome derivado do conteúdo) e
+indexada por hash perceptual (pHash/dHash calculados com NumPy), o que
+permite detectar quase-duplicatas na inserção e reaproveitar personagens
+visualmente semelhantes em novos roteiros.
+"""
+
+import os
+import re
+import math
+import shutil
+import hashlib
+import threading
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+# Imports condicionais (podem não estar disponíveis em todos ambientes)
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Imports locais
+try:
+    import sys
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import DIRS, CHARACTER_LIBRARY_CONFIG
+    from src.utils import criar_diretorios, salvar_json, carregar_json
+except ImportError:
+    print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
+
+
+# Dimensão do embedding de descrição (hashing de tokens)
+DIMENSAO_EMBEDDING = 256
+
+
+def _matriz_dct(n: int) -> 'np.ndarray':
+    """
+    Matriz da DCT-II ortonormal de tamanho n x n.
+    """
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matriz = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * math.sqrt(2.0 / n)
+    matriz[0, :] = math.sqrt(1.0 / n)
+    return matriz
+
+
+def calcular_phash(caminho_imagem: str, tamanho_hash: int = 8, fator: int = 4) -> str:
+    """
+    Calcula o hash perceptual (pHash) de uma imagem.
+    
+    A imagem é reduzida para (tamanho_hash * fator)² em tons de cinza, passa
+    por uma DCT 2D e os coeficientes de baixa frequência são comparados
+    com a mediana.
+    
+    Args:
+        caminho_imagem: Caminho da imagem
+        tamanho_hash: Lado do bloco de baixa frequência (8 -> hash de 64 bits)
+        fator: Fator de sobreamostragem antes da DCT
+    
+    Returns:
+        Hash em hexadecimal
+    """
+    lado = tamanho_hash * fator
+    
+    with Image.open(caminho_imagem) as img:
+        img.draft('L', (lado * 2, lado * 2))
+        pixels = np.asarray(img.convert('L').resize((lado, lado), Image.Resampling.LANCZOS), dtype=np.float64)
+    
+    dct = _matriz_dct(lado)
+    coeficientes = dct @ pixels @ dct.T
+    baixa_frequencia = coeficientes[:tamanho_hash, :tamanho_hash]
+    
+    # Ignora o termo DC no cálculo da mediana
+    mediana = np.median(baixa_frequencia.flatten()[1:])
+    return _bits_para_hex(baixa_frequencia > mediana)
+
+
+def calcular_dhash(caminho_imagem: str, tamanho_hash: int = 8) -> str:
+    """
+    Calcula o hash de diferença (dHash) de uma imagem.
+    
+    Args:
+        caminho_imagem: Caminho da imagem
+        tamanho_hash: Lado do hash (8 -> hash de 64 bits)
+    
+    Returns:
+        Hash em hexadecimal
+    """
+    with Image.open(caminho_imagem) as img:
+        img.draft('L', ((tamanho_hash + 1) * 4, tamanho_hash * 4))
+        pixels = np.asarray(
+            img.convert('L').resize((tamanho_hash + 1, tamanho_hash), Image.Resampling.LANCZOS),
+            dtype=np.int16
+        )
+    
+    return _bits_para_hex(pixels[:, 1:] > pixels[:, :-1])
+
+
+def distancia_hamming(hash_a: str, hash_b: str) -> int:
+    """
+    Número de bits diferentes entre dois hashes hexadecimais.
+    
+    Args:
+        hash_a: Primeiro hash
+        hash_b: Segundo hash
+    
+    Returns:
+        Distância de Hamming
+    """
+    return bin(int(hash_a, 16) ^ int(hash_b, 16)).count('1')
+
+
+def embedding_descricao(descricao: str) -> List[float]:
+    """
+    Embedding local da descrição (hashing de tokens e bigramas, L2-normalizado).
+    
+    Não depende de API externa: descrições com as mesmas palavras-chave
+    ("rei", "barba branca", "coroa dourada") ficam próximas no espaço.
+    
+    Args:
+        descricao: Descrição textual do personagem
+    
+    Returns:
+        Vetor de DIMENSAO_EMBEDDING posições
+    """
+    texto = unicodedata.normalize('NFKD', descricao.lower())
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    tokens = [t for t in re.findall(r'[a-z0-9]+', texto) if len(t) > 2]
+    termos = tokens + [f"{a}_{b}" for a, b in zip(tokens, tokens[1:])]
+    
+    vetor = np.zeros(DIMENSAO_EMBEDDING, dtype=np.float64)
+    for termo in termos:
+        digest = hashlib.md5(termo.encode()).digest()
+        indice = int.from_bytes(digest[:4], 'little') % DIMENSAO_EMBEDDING
+        vetor[indice] += 1.0 if digest[4] % 2 == 0 else -1.0
+    
+    norma = np.linalg.norm(vetor)
+    return np.round(vetor / norma if norma > 0 else vetor, 4).tolist()
+
+
+def normalizar_nome(nome: str) -> str:
+    """
+    Nome comparável entre roteiros (sem acentos, caixa e espaços extras).
+    
+    Args:
+        nome: Nome do personagem
+    
+    Returns:
+        Nome normalizado (ex: "Rei  Salomão" -> "rei salomao")
+    """
+    texto = unicodedata.normalize('NFKD', nome.lower())
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return ' '.join(re.findall(r'[a-z0-9]+', texto))
+
+
+def _bits_para_hex(bits: 'np.ndarray') -> str:
+    """
+    Converte uma matriz booleana em string hexadecimal.
+    """
+    valor = 0
+    for bit in bits.flatten():
+        valor = (valor << 1) | int(bit)
+    return f"{valor:0{bits.size // 4}x}"
+
+
+class CharacterLibrary:
+    """
+    Biblioteca de personagens indexada por hash perceptual.
+    
+    O índice fica em JSON no diretório da biblioteca; as imagens são
+    armazenadas com nome derivado do conteúdo, então não colidem entre
+    projetos diferentes.
+    """
+    
+    def __init__(self, diretorio: Optional[str] = None):
+        """
+        Inicializa a biblioteca.
+        
+        Args:
+            diretorio: Diretório da biblioteca (padrão: DIRS['cache']/personagens)
+        """
+        if not (PILLOW_AVAILABLE and NUMPY_AVAILABLE):
+            raise RuntimeError("❌ CharacterLibrary requer Pillow e NumPy")
+        
+        self.diretorio = diretorio or os.path.join(DIRS['cache'], 'personagens')
+        self.caminho_indice = os.path.join(self.diretorio, 'indice.json')
+        criar_diretorios([self.diretorio])
+        
+        self.limite_duplicata = CHARACTER_LIBRARY_CONFIG.get('limite_hamming_duplicata', 6)
+        self.limite_similar = CHARACTER_LIBRARY_CONFIG.get('limite_hamming_similar', 12)
+        self.similaridade_minima = CHARACTER_LIBRARY_CONFIG.get('similaridade_descricao_minima', 0.6)
+        self.reutilizar_por_descricao = CHARACTER_LIBRARY_CONFIG.get('reutilizar_por_descricao', False)
+        
+        self._lock = threading.Lock()
+        self.entradas: List[Dict] = []
+        
+        if os.path.exists(self.caminho_indice):
+            dados = carregar_json(self.caminho_indice) or {}
+            self.entradas = dados.get('entradas', [])
+        
+        print(f"✅ CharacterLibrary inicializada: {len(self.entradas)} personagens")
+    
+    def adicionar(
+        self,
+        caminho_imagem: str,
+        nome: str,
+        descricao: str = '',
+        estilo: str = '',
+        projeto: str = ''
+    ) -> Dict:
+        """
+        Adiciona uma imagem à biblioteca, reaproveitando quase-duplicatas.
+        
+        Args:
+            caminho_imagem: Imagem gerada
+            nome: Nome do personagem
+            descricao: Descrição usada na geração
+            estilo: Estilo visual
+            projeto: ID do projeto de origem
+        
+        Returns:
+            Entrada da biblioteca (existente, se for quase-duplicata)
+        """
+        phash = calcular_phash(caminho_imagem)
+        dhash = calcular_dhash(caminho_imagem)
+        
+        with self._lock:
+            duplicata = self._mais_proxima(phash, dhash, self.limite_duplicata)
+            
+            if duplicata:
+                entrada, distancia = duplicata
+                if projeto and projeto not in entrada['projetos']:
+                    entrada['projetos'].append(projeto)
+                self._salvar_indice()
+                print(f"♻️ Quase-duplicata de '{entrada['nome']}' (distância {distancia}), reaproveitando")
+                return entrada
+            
+            with open(caminho_imagem, 'rb') as f:
+                sha1 = hashlib.sha1(f.read()).hexdigest()
+            
+            extensao = os.path.splitext(caminho_imagem)[1] or '.png'
+            destino = os.path.join(self.diretorio, f"{phash}_{sha1[:8]}{extensao}")
+            if not os.path.exists(destino):
+                shutil.copy2(caminho_imagem, destino)
+            
+            entrada = {
+                'id': f"{phash}_{sha1[:8]}",
+                'nome': nome,
+                'descricao': descricao,
+                'estilo': estilo,
+                'caminho': destino,
+                'phash': phash,
+                'dhash': dhash,
+                'embedding': embedding_descricao(f"{nome} {descricao}"),
+                'projetos': [projeto] if projeto else [],
+            }
+            self.entradas.append(entrada)
+            self._salvar_indice()
+        
+        print(f"📚 Personagem adicionado à biblioteca: {nome}")
+        return entrada
+    
+    def buscar_por_imagem(self, caminho_imagem: str, limite: Optional[int] = None) -> List[Tuple[Dict, int]]:
+        """
+        Busca personagens visualmente semelhantes a uma imagem.
+        
+        Args:
+            caminho_imagem: Imagem de consulta
+            limite: Distância de Hamming máxima (padrão: limite_hamming_similar)
+        
+        Returns:
+            Lista de (entrada, distância) ordenada por distância
+        """
+        limite = self.limite_similar if limite is None else limite
+        phash = calcular_phash(caminho_imagem)
+        dhash = calcular_dhash(caminho_imagem)
+        
+        encontrados = [(e, self._distancia(e, phash, dhash)) for e in self.entradas]
+        return sorted([(e, d) for e, d in encontrados if d <= limite], key=lambda x: x[1])
+    
+    def buscar_por_descricao(
+        self,
+        descricao: str,
+        estilo: Optional[str] = None,
+        similaridade_minima: Optional[float] = None
+    ) -> List[Tuple[Dict, float]]:
+        """
+        Busca personagens pela similaridade (cosseno) da descrição.
+        
+        Args:
+            descricao: Descrição do personagem desejado
+            estilo: Filtrar por estilo visual (opcional)
+            similaridade_minima: Similaridade mínima (0-1)
+        
+        Returns:
+            Lista de (entrada, similaridade) ordenada da mais parecida
+        """
+        minimo = self.similaridade_minima if similaridade_minima is None else similaridade_minima
+        candidatas = [e for e in self.entradas if not estilo or e.get('estilo') == estilo]
+        
+        if not candidatas:
+            return []
+        
+        consulta = np.asarray(embedding_descricao(descricao))
+        matriz = np.asarray([e['embedding'] for e in candidatas])
+        similaridades = matriz @ consulta
+        
+        ordem = np.argsort(-similaridades)
+        return [
+            (candidatas[i], float(similaridades[i]))
+            for i in ordem
+            if similaridades[i] >= minimo
+        ]
+    
+    def buscar_por_nome(
+        self,
+        nome: str,
+        descricao: str = '',
+        estilo: Optional[str] = None
+    ) -> List[Tuple[Dict, float]]:
+        """
+        Busca personagens com o mesmo nome (normalizado).
+        
+        Args:
+            nome: Nome do personagem
+            descricao: Descrição, para ordenar entre homônimos
+            estilo: Filtrar por estilo visual (opcional)
+        
+        Returns:
+            Lista de (entrada, similaridade da descrição) ordenada da mais parecida
+        """
+        chave = normalizar_nome(nome)
+        candidatas = [
+            e for e in self.entradas
+            if normalizar_nome(e.get('nome', '')) == chave and (not estilo or e.get('estilo') == estilo)
+        ]
+        
+        if not candidatas:
+            return []
+        
+        consulta = np.asarray(embedding_descricao(f"{nome} {descricao}"))
+        similaridades = [float(np.asarray(e['embedding']) @ consulta) for e in candidatas]
+        return sorted(zip(candidatas, similaridades), key=lambda x: -x[1])
+    
+    def reutilizar_para_roteiro(
+        self,
+        personagens_necessarios: List[Dict],
+        estilo: Optional[str] = None
+    ) -> Tuple[Dict[str, List[Dict]], List[Dict]]:
+        """
+        Separa os personagens de um roteiro entre reaproveitados e a gerar.
+        
+        O reaproveitamento exige o mesmo nome (normalizado): descrições
+        parecidas de personagens diferentes ("Rei Davi" e "Rei Salomão",
+        ambos idosos de barba e coroa) não trocam de imagem. A busca só pela
+        descrição vale com CHARACTER_LIBRARY_CONFIG['reutilizar_por_descricao'].
+        
+        Args:
+            personagens_necessarios: Lista do roteiro com 'nome' e 'descricao'
+            estilo: Estilo visual exigido
+        
+        Returns:
+            Tupla (reaproveitados no formato de CharacterGenerator, pendentes)
+        """
+        reaproveitados = {}
+        pendentes = []
+        
+        for personagem in personagens_necessarios:
+            nome = personagem.get('nome', 'Personagem')
+            encontrados = self.buscar_por_nome(nome, personagem.get('descricao', ''), estilo=estilo)
+            
+            if not encontrados and self.reutilizar_por_descricao:
+                consulta = f"{nome} {personagem.get('descricao', '')}"
+                encontrados = self.buscar_por_descricao(consulta, estilo=estilo)
+            
+            if encontrados:
+                entrada, similaridade = encontrados[0]
+                print(f"📚 '{nome}' reaproveitado da biblioteca ({similaridade:.2f})")
+                reaproveitados[nome] = [{
+                    'nome': nome,
+                    'variacao': 1,
+                    'url': None,
+                    'caminho_local': entrada['caminho'],
+                    'descricao': entrada['descricao'],
+                    'estilo': entrada['estilo'],
+                    'biblioteca_id': entrada['id'],
+                }]
+            else:
+                pendentes.append(personagem)
+        
+        return reaproveitados, pendentes
+    
+    def _mais_proxima(self, phash: str, dhash: str, limite: int) -> Optional[Tuple[Dict, int]]:
+        """
+        Entrada mais próxima dentro do limite de distância, se houver.
+        """
+        melhor = None
+        for entrada in self.entradas:
+            distancia = self._distancia(entrada, phash, dhash)
+            if distancia <= limite and (melhor is None or distancia < melhor[1]):
+                melhor = (entrada, distancia)
+        return melhor
+    
+    @staticmethod
+    def _distancia(entrada: Dict, phash: str, dhash: str) -> int:
+        """
+        Distância combinada: as duas assinaturas precisam concordar.
+        """
+        return max(distancia_hamming(entrada['phash'], phash), distancia_hamming(entrada['dhash'], dhash))
+    
+    def _salvar_indice(self) -> None:
+        """
+        Persiste o índice da biblioteca.
+        """
+        salvar_json({'total': len(self.entradas), 'entradas': self.entradas}, self.caminho_indice, identado=False)
+
+
+def exemplo_uso():
+    """
+    Exemplo de uso da biblioteca de personagens.
+    """
+    biblioteca = CharacterLibrary()
+    
+    # Buscar personagem por descrição
+    encontrados = biblioteca.buscar_por_descricao("rei idoso com barba branca e coroa dourada")
+    
+    for entrada, similaridade in encontrados[:5]:
+        print(f"   {entrada['nome']} ({similaridade:.2f}): {entrada['caminho']}")
+    
+    # Buscar quase-duplicatas de uma imagem
+    if len(sys.argv) > 1:
+        for entrada, distancia in biblioteca.buscar_por_imagem(sys.argv[1]):
+            print(f"   {entrada['nome']} (distância {distancia}): {entrada['caminho']}")
+
+
+if __name__ == '__main__':
+    exemplo_uso()
@@ -0,0 +1,309 @@
+"""
+⌨️ CLI - ProjetoX
+
+Interface de linha de comando do ProjetoX.
+
+Uso:
+    python -m src run --tema "A História do Rei Salomão" --duracao 5
+    python -m src resume historias_infantis_20240101_120000
+    python -m src batch projetos.json --paralelo 2
+    python -m src preview video.mp4 --duracao 20 --modo proxy
+    python -m src bench cena_001.mp4 cena_002.mp4
+    python -m src bench --importacao
+    python -m src daemon --socket /tmp/projetox.sock
+    python -m src enviar projeto.json
+"""
+
+import os
+import time
+import argparse
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+# Imports locais
+try:
+    import sys
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import DAEMON_CONFIG, DEFAULT_PROJECT_CONFIG, RENDER_PROFILES
+    from src.utils import carregar_json, formatar_duracao
+    from src.warmup import ETAPAS_PIPELINE
+except ImportError:
+    print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    """
+    Monta o parser de argumentos com todos os subcomandos.
+    
+    Returns:
+        ArgumentParser configurado
+    """
+    parser = argparse.ArgumentParser(
+        prog='projetox',
+        description='Automação de vídeos para YouTube com IA'
+    )
+    sub = parser.add_subparsers(dest='comando', required=True)
+    
+    # run
+    run = sub.add_parser('run', help='Gera um vídeo do início ao fim')
+    run.add_argument('--tema', help='Tema do vídeo')
+    run.add_argument('--nicho', default=DEFAULT_PROJECT_CONFIG['nicho'], help='Nicho do vídeo')
+    run.add_argument('--duracao', type=int, default=DEFAULT_PROJECT_CONFIG['duracao_minutos'], help='Duração em minutos')
+    run.add_argument('--idioma', default=DEFAULT_PROJECT_CONFIG['idioma'], help='Código do idioma')
+    run.add_argument('--perfil', choices=list(RENDER_PROFILES), default=DEFAULT_PROJECT_CONFIG['perfil'])
+    run.add_argument('--config', help='JSON com a configuração do projeto (argumentos sobrescrevem)')
+    run.add_argument('--output-dir', help='Diretório de saída')
+    run.add_argument('--serie', help='Série do vídeo (personagens mantêm a mesma voz entre episódios)')
+    run.add_argument('--legendas', action='store_true', help='Gerar legendas automáticas')
+    run.add_argument('--sem-lipsync', action='store_true', help='Não aplicar lip-sync')
+    run.add_argument('--pular', nargs='+', choices=list(ETAPAS_PIPELINE), default=[], help='Etapas a carregar do checkpoint')
+    
+    # resume
+    resume = sub.add_parser('resume', help='Retoma um projeto a partir do checkpoint')
+    resume.add_argument('projeto_id', help='ID do projeto')
+    
+    # batch
+    batch = sub.add_parser('batch', help='Gera vários vídeos de um arquivo JSON (lista de configurações)')
+    batch.add_argument('arquivo', help='JSON com a lista de configurações')
+    batch.add_argument('--paralelo', type=int, default=1, help='Projetos executados simultaneamente')
+    batch.add_argument('--sem-janela', action='store_true', help='Não elevar min_instances dos deployments no lote')
+    
+    # preview
+    preview = sub.add_parser('preview', help='Cria um preview curto de um vídeo')
+    preview.add_argument('video', help='Vídeo completo')
+    preview.add_argument('--duracao', type=int, default=30, help='Duração do preview (segundos)')
+    preview.add_argument('--inicio', type=float, default=0.0, help='Início do preview (segundos)')
+    preview.add_argument('--modo', choices=['rapido', 'proxy', 'moviepy'], default='rapido')
+    preview.add_argument('--saida', help='Caminho de saída')
+    
+    # bench
+    bench = sub.add_parser('bench', help='Benchmark do encoder e do tempo de importação')
+    bench.add_argument('cenas', nargs='*', help='Vídeos de cenas para a amostra do encoder')
+    bench.add_argument('--importacao', action='store_true', help='Medir o tempo de "import src.pipeline"')
+    bench.add_argument('--ssim-minimo', type=float, default=0.97, help='Qualidade mínima aceitável')
+    
+    # daemon
+    daemon = sub.add_parser('daemon', help='Processo residente que consome a fila de jobs')
+    daemon.add_argument('--fila', help=f"Diretório da fila (padrão: {DAEMON_CONFIG['diretorio_fila']})")
+    daemon.add_argument('--socket', help='Socket unix para receber jobs')
+    daemon.add_argument('--jobs', type=int, help='Jobs simultâneos')
+    
+    # enviar
+    enviar = sub.add_parser('enviar', help='Envia um job ao daemon (fila ou socket)')
+    enviar.add_argument('arquivo', help='JSON do job ou da configuração do projeto')
+    enviar.add_argument('--fila', help='Diretório da fila')
+    enviar.add_argument('--socket', help='Socket unix do daemon')
+    
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Ponto de entrada da CLI.
+    
+    Args:
+        argv: Argumentos (padrão: sys.argv[1:])
+    
+    Returns:
+        Código de saída (0 = sucesso)
+    """
+    args = criar_parser().parse_args(argv)
+    
+    comandos = {
+        'run': _cmd_run,
+        'resume': _cmd_resume,
+        'batch': _cmd_batch,
+        'preview': _cmd_preview,
+        'bench': _cmd_bench,
+        'daemon': _cmd_daemon,
+        'enviar': _cmd_enviar,
+    }
+    
+    try:
+        return comandos[args.comando](args)
+    except KeyboardInterrupt:
+        print("\n⚠️ Interrompido")
+        return 130
+    except Exception as e:
+        print(f"❌ {e}")
+        return 1
+
+
+def _config_de_args(args: argparse.Namespace) -> Dict:
+    """
+    Monta a configuração do projeto a partir de --config e dos argumentos.
+    """
+    config = {}
+    if args.config:
+        config = carregar_json(args.config) or {}
+    
+    config.setdefault('nicho', args.nicho)
+    config.setdefault('duracao_minutos', args.duracao)
+    config.setdefault('idioma', args.idioma)
+    config.setdefault('perfil', args.perfil)
+    
+    if args.tema:
+        config['tema'] = args.tema
+    if args.output_dir:
+        config['output_dir'] = args.output_dir
+    if args.serie:
+        config['serie'] = args.serie
+    if args.legendas:
+        config['gerar_legendas'] = True
+    if args.sem_lipsync:
+        config['aplicar_lipsync'] = False
+    
+    if not config.get('tema'):
+        raise ValueError("Informe --tema ou um --config com 'tema'")
+    
+    return config
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    """
+    Subcomando run.
+    """
+    from src.pipeline import VideoAutomationPipeline
+    
+    pipeline = VideoAutomationPipeline(_config_de_args(args))
+    video = pipeline.executar_completo(pular_etapas=args.pular)
+    return 0 if video else 1
+
+
+def _cmd_resume(args: argparse.Namespace) -> int:
+    """
+    Subcomando resume.
+    """
+    from src.pipeline import retomar_projeto
+    
+    return 0 if retomar_projeto(args.projeto_id) else 1
+
+
+def _cmd_batch(args: argparse.Namespace) -> int:
+    """
+    Subcomando batch: vários projetos no mesmo processo.
+    
+    Geradores, clientes e caches são compartilhados entre os projetos; os
+    deployments dedicados ficam com instâncias mínimas durante o lote.
+    """
+    from src.pipeline import VideoAutomationPipeline
+    from src.warmup import WarmupScheduler
+    
+    configs = carregar_json(args.arquivo)
+    if not isinstance(configs, list) or not configs:
+        raise ValueError(f"{args.arquivo} deve conter uma lista de configurações")
+    
+    print(f"📦 Lote com {len(configs)} projetos ({args.paralelo} em paralelo)")
+    
+    warmup = WarmupScheduler()
+    if not args.sem_janela:
+        warmup.iniciar_janela_lote()
+    
+    def executar(config: Dict) -> Optional[str]:
+        try:
+            return VideoAutomationPipeline(config).executar_completo()
+        except Exception as e:
+            print(f"❌ Projeto '{config.get('tema')}' falhou: {e}")
+            return None
+    
+    inicio = time.time()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.paralelo)) as executor:
+            videos = list(executor.map(executar, configs))
+    finally:
+        if not args.sem_janela:
+            warmup.encerrar_janela_lote()
+    
+    print(f"\n📊 LOTE CONCLUÍDO em {formatar_duracao(time.time() - inicio)}")
+    for config, video in zip(configs, videos):
+        print(f"   {'✅' if video else '❌'} {config.get('tema')}: {video or 'falhou'}")
+    
+    return 0 if all(videos) else 1
+
+
+def _cmd_preview(args: argparse.Namespace) -> int:
+    """
+    Subcomando preview.
+    """
+    from src.video_editor import VideoEditor
+    
+    preview = VideoEditor().criar_preview(
+        args.video,
+        duracao_preview=args.duracao,
+        caminho_saida=args.saida,
+        inicio=args.inicio,
+        modo=args.modo
+    )
+    return 0 if preview else 1
+
+
+def _cmd_bench(args: argparse.Namespace) -> int:
+    """
+    Subcomando bench: perfil de encoder e/ou orçamento de importação.
+    """
+    ok = True
+    
+    if args.importacao or not args.cenas:
+        from src.utils import medir_importacao
+        
+        ok = medir_importacao()['dentro_orcamento']
+    
+    if args.cenas:
+        from src.encoder_benchmark import EncoderBenchmark, caminho_perfil_encoder
+        
+        relatorio = EncoderBenchmark(args.cenas).executar(ssim_minimo=args.ssim_minimo)
+        if relatorio:
+            print(f"💾 Perfil salvo: {caminho_perfil_encoder()}")
+        ok = ok and relatorio is not None
+    
+    return 0 if ok else 1
+
+
+def _cmd_daemon(args: argparse.Namespace) -> int:
+    """
+    Subcomando daemon.
+    """
+    from src.daemon import JobDaemon
+    
+    JobDaemon(diretorio_fila=args.fila, caminho_socket=args.socket, max_jobs=args.jobs).executar()
+    return 0
+
+
+def _cmd_enviar(args: argparse.Namespace) -> int:
+    """
+    Subcomando enviar: um arquivo sem 'tipo' é tratado como configuração de projeto.
+    """
+    from src.daemon import enfileirar_job, enviar_por_socket
+    
+    job = carregar_json(args.arquivo)
+    if not isinstance(job, dict):
+        raise ValueError(f"{args.arquivo} deve conter um objeto JSON")
+    
+    if 'tipo' not in job:
+        job = {'tipo': 'run', 'config': job}
+    
+    caminho_socket = args.socket or DAEMON_CONFIG.get('socket')
+    if caminho_socket:
+        resposta = enviar_por_socket(job, caminho_socket)
+        if 'erro' in resposta:
+            print(f"❌ {resposta['erro']}")
+            return 1
+        job_id = resposta['id']
+    else:
+        job_id = enfileirar_job(job, args.fila)
+    
+    print(f"📥 Job enfileirado: {job_id}")
+    return 0
+
+
+def exemplo_uso():
+    """
+    Exemplo de uso: mostra a ajuda da CLI.
+    """
+    criar_parser().print_help()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,391 @@
+"""
+🛰️ DAEMON - ProjetoX
+
+Processo residente que executa jobs de uma fila local.
+
+Os jobs são arquivos JSON em um diretório de fila (ou enviados por um
+socket unix, que os grava na mesma fila). Como o processo não termina entre
+jobs, clientes de SDK e seus pools de conexão (ver pipeline.obter_gerador),
+caches de upload, histórico de latências e o pool de workers continuam
+carregados de um vídeo para o seguinte.
+
+Formato de um job:
+    {"tipo": "run", "config": {...}}
+    {"tipo": "resume", "projeto_id": "..."}
+    {"tipo": "preview", "video": "...", "duracao": 30}
+
+Estrutura da fila:
+    fila/*.json            jobs pendentes
+    fila/processando/      jobs em execução
+    fila/concluidos/       resultado dos jobs bem-sucedidos
+    fila/falhas/           resultado dos jobs com erro
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import signal
+import threading
+import importlib
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+# Imports locais
+try:
+    import sys
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import DAEMON_CONFIG
+    from src.utils import criar_diretorios, salvar_json, carregar_json, formatar_duracao
+except ImportError:
+    print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
+
+
+# Tipos de job aceitos
+TIPOS_JOB = ('run', 'resume', 'preview')
+
+# Módulos importados ao iniciar o daemon (ver preaquecer_importacoes)
+MODULOS_RESIDENTES = ('replicate', 'elevenlabs', 'openai', 'requests', 'moviepy.editor')
+
+
+def enfileirar_job(job: Dict, diretorio_fila: Optional[str] = None) -> str:
+    """
+    Grava um job na fila do daemon.
+    
+    Args:
+        job: Job ({'tipo': ..., ...})
+        diretorio_fila: Diretório da fila (padrão: DAEMON_CONFIG)
+    
+    Returns:
+        ID do job
+    
+    Raises:
+        ValueError: Se o tipo do job não for suportado
+    
+    Example:
+        >>> enfileirar_job({'tipo': 'run', 'config': {'tema': 'O Leão e o Rato', ...}})
+    """
+    tipo = job.get('tipo', 'run')
+    if tipo not in TIPOS_JOB:
+        raise ValueError(f"Tipo de job não suportado: {tipo}")
+    
+    diretorio_fila = diretorio_fila or DAEMON_CONFIG['diretorio_fila']
+    criar_diretorios([diretorio_fila])
+    
+    # Prefixo com timestamp: a fila é consumida em ordem de chegada
+    job_id = job.get('id') or f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    caminho = os.path.join(diretorio_fila, f"{job_id}.json")
+    
+    # Escrita atômica: o daemon nunca lê um job pela metade
+    temporario = os.path.join(diretorio_fila, f".{job_id}.tmp")
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump({**job, 'tipo': tipo, 'id': job_id}, f, ensure_ascii=False)
+    os.replace(temporario, caminho)
+    
+    return job_id
+
+
+class JobDaemon:
+    """
+    Executor residente de jobs da fila.
+    
+    Example:
+        >>> daemon = JobDaemon(max_jobs=2)
+        >>> daemon.executar()  # bloqueia até SIGINT/SIGTERM
+    """
+    
+    def __init__(
+        self,
+        diretorio_fila: Optional[str] = None,
+        caminho_socket: Optional[str] = None,
+        max_jobs: Optional[int] = None
+    ):
+        """
+        Inicializa o daemon.
+        
+        Args:
+            diretorio_fila: Diretório da fila (padrão: DAEMON_CONFIG)
+            caminho_socket: Socket unix para receber jobs (opcional)
+            max_jobs: Jobs executados simultaneamente
+        """
+        self.diretorio_fila = diretorio_fila or DAEMON_CONFIG['diretorio_fila']
+        self.caminho_socket = caminho_socket or DAEMON_CONFIG.get('socket')
+        self.max_jobs = max_jobs or DAEMON_CONFIG.get('max_jobs_simultaneos', 1)
+        self.intervalo = DAEMON_CONFIG.get('intervalo_varredura', 2.0)
+        
+        self.dir_processando = os.path.join(self.diretorio_fila, 'processando')
+        self.dir_concluidos = os.path.join(self.diretorio_fila, 'concluidos')
+        self.dir_falhas = os.path.join(self.diretorio_fila, 'falhas')
+        criar_diretorios([self.diretorio_fila, self.dir_processando, self.dir_concluidos, self.dir_falhas])
+        
+        self._parar = threading.Event()
+        self._acordar = threading.Event()
+        self._vagas = threading.Semaphore(self.max_jobs)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._servidor: Optional[socket.socket] = None
+        
+        self.inicio = time.time()
+        self._lock = threading.Lock()
+        self.estatisticas = {'concluidos': 0, 'falhas': 0, 'em_execucao': 0}
+    
+    def executar(self) -> None:
+        """
+        Consome a fila até receber SIGINT/SIGTERM.
+        
+        Jobs em execução terminam antes do processo sair.
+        """
+        print("=" * 70)
+        print("🛰️ PROJETOX DAEMON")
+        print("=" * 70)
+        print(f"   Fila: {self.diretorio_fila}")
+        print(f"   Socket: {self.caminho_socket or '-'}")
+        print(f"   Jobs simultâneos: {self.max_jobs}")
+        
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, lambda *_: self.parar())
+            signal.signal(signal.SIGTERM, lambda *_: self.parar())
+        
+        if DAEMON_CONFIG.get('preaquecer_importacoes', True):
+            self._preaquecer_importacoes()
+        
+        self._recuperar_interrompidos()
+        
+        if self.caminho_socket:
+            threading.Thread(target=self._servir_socket, name='daemon-socket', daemon=True).start()
+        
+        self._executor = ThreadPoolExecutor(max_workers=self.max_jobs, thread_name_prefix='job')
+        
+        try:
+            while not self._parar.is_set():
+                for caminho in self._pendentes():
+                    if self._parar.is_set() or not self._vagas.acquire(blocking=False):
+                        break
+                    
+                    reservado = self._reservar(caminho)
+                    if not reservado:
+                        self._vagas.release()
+                        continue
+                    
+                    self._executor.submit(self._processar, reservado)
+                
+                self._acordar.wait(self.intervalo)
+                self._acordar.clear()
+        finally:
+            print("\n🛑 Encerrando daemon (aguardando jobs em execução)...")
+            self._executor.shutdown(wait=True)
+            self._fechar_socket()
+            print(f"📊 {self.status()}")
+    
+    def parar(self) -> None:
+        """
+        Solicita o encerramento do daemon.
+        """
+        self._parar.set()
+        self._acordar.set()
+    
+    def status(self) -> Dict:
+        """
+        Estado atual do daemon e da fila.
+        """
+        return {
+            **self.estatisticas,
+            'pendentes': len(self._pendentes()),
+            'ativo_ha': formatar_duracao(time.time() - self.inicio),
+        }
+    
+    def _pendentes(self) -> List[str]:
+        """
+        Jobs pendentes, por nome (IDs gerados começam pelo timestamp).
+        """
+        nomes = sorted(n for n in os.listdir(self.diretorio_fila) if n.endswith('.json'))
+        return [os.path.join(self.diretorio_fila, n) for n in nomes]
+    
+    def _reservar(self, caminho: str) -> Optional[str]:
+        """
+        Move o job para 'processando' (rename atômico: um único consumidor).
+        """
+        destino = os.path.join(self.dir_processando, os.path.basename(caminho))
+        try:
+            os.replace(caminho, destino)
+            return destino
+        except FileNotFoundError:
+            return None
+    
+    def _processar(self, caminho: str) -> None:
+        """
+        Executa um job e grava o resultado em 'concluidos' ou 'falhas'.
+        """
+        job = carregar_json(caminho) or {}
+        job_id = job.get('id') or os.path.splitext(os.path.basename(caminho))[0]
+        inicio = time.time()
+        
+        self._contar('em_execucao', 1)
+        print(f"\n🛰️ Job {job_id} ({job.get('tipo', 'run')}) iniciado")
+        
+        resultado = {'id': job_id, 'job': job, 'inicio': time.strftime('%Y-%m-%d %H:%M:%S')}
+        
+        try:
+            saida = self._executar_job(job)
+            if not saida:
+                raise RuntimeError("Job terminou sem arquivo de saída")
+            
+            resultado.update({'status': 'ok', 'saida': saida})
+            destino = self.dir_concluidos
+            self._contar('concluidos', 1)
+            print(f"✅ Job {job_id} concluído: {saida}")
+            
+        except Exception as e:
+            resultado.update({'status': 'erro', 'erro': str(e)})
+            destino = self.dir_falhas
+            self._contar('falhas', 1)
+            print(f"❌ Job {job_id} falhou: {e}")
+            
+        finally:
+            self._contar('em_execucao', -1)
+            resultado['duracao_s'] = round(time.time() - inicio, 1)
+            salvar_json(resultado, os.path.join(destino, f"{job_id}.json"))
+            os.remove(caminho)
+            self._vagas.release()
+            self._acordar.set()
+    
+    def _contar(self, chave: str, delta: int) -> None:
+        """
+        Atualiza um contador das estatísticas (jobs rodam em threads).
+        """
+        with self._lock:
+            self.estatisticas[chave] += delta
+    
+    @staticmethod
+    def _executar_job(job: Dict) -> Optional[str]:
+        """
+        Executa um job no próprio processo (geradores e caches residentes).
+        """
+        tipo = job.get('tipo', 'run')
+        
+        if tipo == 'run':
+            from src.pipeline import VideoAutomationPipeline
+            return VideoAutomationPipeline(job['config']).executar_completo()
+        
+        if tipo == 'resume':
+            from src.pipeline import retomar_projeto
+            return retomar_projeto(job['projeto_id'])
+        
+        if tipo == 'preview':
+            from src.pipeline import obter_gerador
+            from src.video_editor import VideoEditor
+            editor = obter_gerador(VideoEditor)
+            return editor.criar_preview(
+                job['video'],
+                duracao_preview=job.get('duracao', 30),
+                inicio=job.get('inicio', 0.0),
+                modo=job.get('modo', 'rapido')
+            )
+        
+        raise ValueError(f"Tipo de job não suportado: {tipo}")
+    
+    def _recuperar_interrompidos(self) -> None:
+        """
+        Devolve à fila jobs que ficaram em 'processando' (daemon interrompido).
+        """
+        for nome in os.listdir(self.dir_processando):
+            os.replace(os.path.join(self.dir_processando, nome), os.path.join(self.diretorio_fila, nome))
+            print(f"🔁 Job interrompido devolvido à fila: {nome}")
+    
+    @staticmethod
+    def _preaquecer_importacoes() -> None:
+        """
+        Importa SDKs e MoviePy uma vez, fora do caminho dos jobs.
+        """
+        inicio = time.time()
+        carregados = []
+        
+        for modulo in MODULOS_RESIDENTES:
+            try:
+                importlib.import_module(modulo)
+                carregados.append(modulo)
+            except ImportError:
+                pass
+        
+        print(f"🔥 Módulos residentes: {', '.join(carregados) or '-'} ({time.time() - inicio:.1f}s)")
+    
+    def _servir_socket(self) -> None:
+        """
+        Aceita jobs por socket unix (uma linha JSON por conexão).
+        
+        A resposta também é uma linha JSON: {'id': ...} para jobs,
+        o status do daemon para {'tipo': 'status'}, ou {'erro': ...}.
+        """
+        if os.path.exists(self.caminho_socket):
+            os.remove(self.caminho_socket)
+        
+        self._servidor = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._servidor.bind(self.caminho_socket)
+        self._servidor.listen()
+        print(f"🔌 Aguardando jobs em {self.caminho_socket}")
+        
+        while not self._parar.is_set():
+            try:
+                conexao, _ = self._servidor.accept()
+            except OSError:
+                break
+            
+            with conexao, conexao.makefile('rwb') as canal:
+                try:
+                    job = json.loads(canal.readline().decode('utf-8'))
+                    if job.get('tipo') == 'status':
+                        resposta = self.status()
+                    else:
+                        resposta = {'id': enfileirar_job(job, self.diretorio_fila)}
+                        self._acordar.set()
+                except Exception as e:
+                    resposta = {'erro': str(e)}
+                
+                canal.write((json.dumps(resposta, ensure_ascii=False) + '\n').encode('utf-8'))
+    
+    def _fechar_socket(self) -> None:
+        """
+        Fecha o socket e remove o arquivo.
+        """
+        if self._servidor:
+            self._servidor.close()
+            if os.path.exists(self.caminho_socket):
+                os.remove(self.caminho_socket)
+
+
+def enviar_por_socket(job: Dict, caminho_socket: str) -> Dict:
+    """
+    Envia um job a um daemon em execução.
+    
+    Args:
+        job: Job ou {'tipo': 'status'}
+        caminho_socket: Socket unix do daemon
+    
+    Returns:
+        Resposta do daemon
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as cliente:
+        cliente.connect(caminho_socket)
+        with cliente.makefile('rwb') as canal:
+            canal.write((json.dumps(job, ensure_ascii=False) + '\n').encode('utf-8'))
+            canal.flush()
+            return json.loads(canal.readline().decode('utf-8'))
+
+
+def exemplo_uso():
+    """
+    Exemplo de uso: enfileira um job de preview.
+    """
+    if len(sys.argv) < 2:
+        print("Uso: python daemon.py video.mp4")
+        print("     (com o daemon ativo: python -m src daemon)")
+        return
+    
+    job_id = enfileirar_job({'tipo': 'preview', 'video': sys.argv[1]})
+    print(f"📥 Job enfileirado: {job_id}")
+
+
+if __name__ == '__main__':
+    exemplo_uso()
@@ -0,0 +1,210 @@
+"""
+💬 DIÁLOGO - ProjetoX
+
+Diálogos com várias vozes.
+
+O texto de uma cena de diálogo é dividido em falas ("Nome: texto"), cada
+personagem recebe uma voz estável (mapa persistido por projeto ou série) e
+as falas são sintetizadas em paralelo pelo AudioGenerator.gerar_dialogo.
+"""
+
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+
+# Imports locais
+try:
+    import sys
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import AUDIO_CONFIG, DIRS, get_voice_for_language
+    from src.utils import criar_diretorios, salvar_json, carregar_json
+except ImportError:
+    print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
+
+
+# Tipos de voz distribuídos entre os personagens (o narrador tem voz própria)
+TIPOS_VOZ_PERSONAGEM = ['character_male', 'character_female']
+
+# "Nome: fala", "- Nome: fala" ou "NOME — fala"
+_PADRAO_FALA = re.compile(r"^\s*[-–—]?\s*([^\W\d][\w .'-]{0,40}?)\s*(?::|\s[–—])\s*(.+)$")
+
+# Partículas aceitas em minúscula dentro de nomes ("Maria da Silva")
+_PARTICULAS_NOME = {'de', 'da', 'do', 'das', 'dos', 'e', 'of', 'the', 'del', 'la'}
+
+
+def _parece_nome(candidato: str, personagens: List[str]) -> bool:
+    """
+    Indica se o trecho antes de ":" é um personagem e não parte da narração.
+    """
+    if candidato.lower() in (p.lower() for p in personagens):
+        return True
+    
+    palavras = candidato.split()
+    return len(palavras) <= 4 and palavras[0][0].isupper() and all(
+        p[0].isupper() or p.lower() in _PARTICULAS_NOME for p in palavras
+    )
+
+
+def extrair_falas(cena: Dict, narrador: Optional[str] = None) -> List[Dict]:
+    """
+    Divide o texto de uma cena em falas por personagem.
+    
+    Usa a lista 'falas' da cena, se existir; senão, cada linha da narrativa
+    no formato "Nome: texto" vira uma fala e as demais linhas ficam com o
+    narrador.
+    
+    Args:
+        cena: Cena do roteiro
+        narrador: Personagem das linhas sem nome (padrão: AUDIO_CONFIG['dialogo_narrador'])
+    
+    Returns:
+        Lista de dicts com 'personagem' e 'texto', na ordem da cena
+    
+    Example:
+        >>> extrair_falas({'narrativa': "Rei: Quem está aí?\\nMenino: Sou eu!"})
+        [{'personagem': 'Rei', 'texto': 'Quem está aí?'}, {'personagem': 'Menino', 'texto': 'Sou eu!'}]
+    """
+    narrador = narrador or AUDIO_CONFIG.get('dialogo_narrador', 'Narrador')
+    
+    if cena.get('falas'):
+        return [
+            {
+                'personagem': (fala.get('personagem') or narrador).strip(),
+                'texto': (fala.get('texto') or fala.get('fala') or '').strip()
+            }
+            for fala in cena['falas']
+            if (fala.get('texto') or fala.get('fala') or '').strip()
+        ]
+    
+    personagens = cena.get('personagens') or []
+    
+    falas = []
+    for linha in (cena.get('narrativa') or '').splitlines():
+        linha = linha.strip()
+        if not linha:
+            continue
+        
+        combinacao = _PADRAO_FALA.match(linha)
+        if combinacao and _parece_nome(combinacao.group(1).strip(), personagens):
+            personagem, texto = combinacao.group(1).strip(), combinacao.group(2)
+        else:
+            personagem, texto = narrador, linha
+        
+        texto = texto.strip().strip('"“”').strip()
+        if texto:
+            falas.append({'personagem': personagem, 'texto': texto})
+    
+    return falas
+
+
+def eh_dialogo(falas: List[Dict], narrador: Optional[str] = None) -> bool:
+    """
+    Indica se as falas têm algum personagem além do narrador.
+    """
+    narrador = (narrador or AUDIO_CONFIG.get('dialogo_narrador', 'Narrador')).lower()
+    return any(fala['personagem'].lower() != narrador for fala in falas)
+
+
+class MapaVozes:
+    """
+    Associação estável personagem -> voz, persistida em JSON.
+    
+    Um personagem novo recebe o tipo de voz menos usado até então; depois
+    disso a voz não muda entre cenas, chamadas ou projetos da mesma série.
+    O JSON pode ser editado à mão com um tipo ('character_female') ou um
+    voice_id do ElevenLabs.
+    
+    Example:
+        >>> mapa = MapaVozes('serie_rei_salomao')
+        >>> mapa.voz('Rei Salomão', 'pt-br')
+        'yoZ06aMxZJJ28mfd3POQ'
+    """
+    
+    def __init__(self, nome: str, diretorio: Optional[str] = None):
+        """
+        Carrega (ou cria) o mapa.
+        
+        Args:
+            nome: Projeto ou série dona do mapa
+            diretorio: Diretório dos mapas (padrão: DIRS['cache']/vozes)
+        """
+        diretorio = diretorio or os.path.join(DIRS['cache'], 'vozes')
+        criar_diretorios([diretorio])
+        
+        self.caminho = os.path.join(diretorio, f"{nome}.json")
+        self._lock = threading.Lock()
+        
+        dados = carregar_json(self.caminho) if os.path.exists(self.caminho) else None
+        self.vozes: Dict[str, str] = (dados or {}).get('vozes', {})
+    
+    def tipo(self, personagem: str) -> str:
+        """
+        Tipo de voz (ou voice_id) do personagem, atribuindo um se for novo.
+        
+        Args:
+            personagem: Nome do personagem
+        
+        Returns:
+            Tipo de voz ('narrator', 'character_male', ...) ou voice_id
+        """
+        chave = personagem.strip().lower()
+        
+        with self._lock:
+            if chave in self.vozes:
+                return self.vozes[chave]
+            
+            narrador = AUDIO_CONFIG.get('dialogo_narrador', 'Narrador').lower()
+            if chave == narrador:
+                tipo = 'narrator'
+            else:
+                usos = list(self.vozes.values())
+                tipo = min(TIPOS_VOZ_PERSONAGEM, key=usos.count)
+            
+            self.vozes[chave] = tipo
+            salvar_json({'vozes': self.vozes}, self.caminho)
+            return tipo
+    
+    def voz(self, personagem: str, idioma: str = 'pt-br') -> str:
+        """
+        voice_id do personagem no idioma.
+        
+        Args:
+            personagem: Nome do personagem
+            idioma: Código do idioma
+        
+        Returns:
+            ID da voz do ElevenLabs
+        """
+        tipo = self.tipo(personagem)
+        if tipo == 'narrator' or tipo in TIPOS_VOZ_PERSONAGEM:
+            return get_voice_for_language(idioma, tipo)
+        return tipo
+
+
+def exemplo_uso():
+    """
+    Exemplo de uso: falas e vozes de uma cena de diálogo.
+    """
+    cena = {
+        'tipo_audio': 'dialogo',
+        'narrativa': (
+            "O rei olhou para o menino.\n"
+            "Rei Salomão: Quem está aí?\n"
+            "Menino: Sou eu, majestade!\n"
+            "Rei Salomão: Aproxime-se."
+        )
+    }
+    
+    mapa = MapaVozes('exemplo')
+    
+    for fala in extrair_falas(cena):
+        print(f"   {fala['personagem']:>12} [{mapa.tipo(fala['personagem'])}]: {fala['texto']}")
+    
+    print(f"💾 Mapa de vozes: {mapa.caminho}")
+
+
+if __name__ == '__main__':
+    exemplo_uso()
@@ -0,0 +1,429 @@
+"""
+⏱️ ENCODER BENCHMARK - ProjetoX
+
+Módulo responsável por medir perfis de encoding (preset, CRF/bitrate,
+threads e tune do x264) na máquina atual e escolher o perfil Pareto-ótimo
+entre velocidade, tamanho do arquivo e qualidade (SSIM/PSNR via ffmpeg).
+"""
+
+import os
+import re
+import time
+import socket
+import itertools
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+# Imports locais
+try:
+    import sys
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import VIDEO_CONFIG, DIRS
+    from src.utils import (
+        criar_diretorios, executar_ffmpeg, obter_duracao_midia,
+        ffmpeg_disponivel, salvar_json, carregar_json
+    )
+except ImportError:
+    print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
+
+
+# Grade padrão do benchmark (pode ser sobrescrita no construtor)
+GRADE_PADRAO = {
+    'presets': ['ultrafast', 'veryfast', 'faster', 'fast', 'medium'],
+    'modos': [('crf', 20), ('crf', 23), ('bitrate', VIDEO_CONFIG.get('bitrate', '5000k'))],
+    # 0 = automático; metade e todos os núcleos comparam o custo de contenção
+    'threads': sorted({0, max(1, (os.cpu_count() or 1) // 2), os.cpu_count() or 1}),
+    'tunes': [None, 'animation'],
+}
+
+# Pesos do critério de escolha no conjunto Pareto-ótimo
+PESOS_PADRAO = {'velocidade': 0.4, 'tamanho': 0.3, 'qualidade': 0.3}
+
+
+def caminho_perfil_encoder(host: Optional[str] = None) -> str:
+    """
+    Retorna o caminho do perfil de encoder medido para um host.
+    
+    Args:
+        host: Nome da máquina (padrão: máquina atual)
+    
+    Returns:
+        Caminho do JSON do perfil
+    """
+    host = host or socket.gethostname()
+    return os.path.join(DIRS['cache'], f"encoder_profile_{host}.json")
+
+
+def carregar_perfil_encoder(host: Optional[str] = None) -> Optional[Dict]:
+    """
+    Carrega o perfil de encoder medido para a máquina atual, se existir.
+    
+    Args:
+        host: Nome da máquina (padrão: máquina atual)
+    
+    Returns:
+        Dict com 'preset', 'modo', 'valor', 'threads', 'tune' ou None
+    """
+    caminho = caminho_perfil_encoder(host)
+    if not os.path.exists(caminho):
+        return None
+    
+    dados = carregar_json(caminho)
+    return dados.get('perfil') if dados else None
+
+
+def fronteira_pareto(resultados: List[Dict]) -> List[Dict]:
+    """
+    Filtra os resultados não dominados (maior fps, menor tamanho, maior SSIM).
+    
+    Args:
+        resultados: Lista de medições com 'fps', 'tamanho_mb' e 'ssim'
+    
+    Returns:
+        Lista dos resultados na fronteira de Pareto
+    """
+    def domina(a: Dict, b: Dict) -> bool:
+        melhor_ou_igual = (
+            a['fps'] >= b['fps'] and a['tamanho_mb'] <= b['tamanho_mb'] and a['ssim'] >= b['ssim']
+        )
+        estritamente_melhor = (
+            a['fps'] > b['fps'] or a['tamanho_mb'] < b['tamanho_mb'] or a['ssim'] > b['ssim']
+        )
+        return melhor_ou_igual and estritamente_melhor
+    
+    return [r for r in resultados if not any(domina(o, r) for o in resultados if o is not r)]
+
+
+def escolher_perfil(
+    resultados: List[Dict],
+    ssim_minimo: float = 0.97,
+    pesos: Optional[Dict[str, float]] = None
+) -> Optional[Dict]:
+    """
+    Escolhe o melhor perfil da fronteira de Pareto.
+    
+    Descarta perfis abaixo do SSIM mínimo e pontua os restantes com pesos
+    para velocidade, tamanho e qualidade (cada métrica normalizada 0-1).
+    
+    Args:
+        resultados: Medições do benchmark
+        ssim_minimo: Qualidade mínima aceitável
+        pesos: Pesos de 'velocidade', 'tamanho' e 'qualidade'
+    
+    Returns:
+        Medição escolhida ou None
+    """
+    pesos = pesos or PESOS_PADRAO
+    
+    candidatos = [r for r in fronteira_pareto(resultados) if r['ssim'] >= ssim_minimo]
+    if not candidatos:
+        # Nenhum perfil atinge a qualidade mínima: fica com o de maior SSIM
+        return max(resultados, key=lambda r: r['ssim']) if resultados else None
+    
+    def normalizar(valor: float, valores: List[float]) -> float:
+        minimo, maximo = min(valores), max(valores)
+        return 1.0 if maximo == minimo else (valor - minimo) / (maximo - minimo)
+    
+    fps = [r['fps'] for r in candidatos]
+    tamanhos = [r['tamanho_mb'] for r in candidatos]
+    ssims = [r['ssim'] for r in candidatos]
+    
+    def pontuar(r: Dict) -> float:
+        return (
+            pesos['velocidade'] * normalizar(r['fps'], fps)
+            + pesos['tamanho'] * (1.0 - normalizar(r['tamanho_mb'], tamanhos))
+            + pesos['qualidade'] * normalizar(r['ssim'], ssims)
+        )
+    
+    return max(candidatos, key=pontuar)
+
+
+def argumentos_encoder(perfil: Dict) -> List[str]:
+    """
+    Converte um perfil de encoder em argumentos do ffmpeg/x264.
+    
+    Args:
+        perfil: Dict com 'preset', 'modo', 'valor', 'threads', 'tune'
+    
+    Returns:
+        Lista de argumentos (sem codec)
+    """
+    argumentos = ['-preset', perfil['preset']]
+    
+    if perfil['modo'] == 'crf':
+        argumentos += ['-crf', str(perfil['valor'])]
+    else:
+        argumentos += ['-b:v', str(perfil['valor'])]
+    
+    if perfil.get('tune'):
+        argumentos += ['-tune', perfil['tune']]
+    
+    argumentos += ['-threads', str(perfil.get('threads', 0))]
+    
+    return argumentos
+
+
+class EncoderBenchmark:
+    """
+    Benchmark de perfis de encoding x264 na máquina atual.
+    
+    Monta uma amostra representativa das cenas, encoda a amostra com cada
+    combinação da grade e mede fps, tamanho e qualidade contra a referência.
+    """
+    
+    def __init__(
+        self,
+        cenas: List[str],
+        segundos_por_cena: float = 3.0,
+        max_cenas: int = 6,
+        grade: Optional[Dict] = None,
+        diretorio_trabalho: str = '/tmp/encoder_benchmark'
+    ):
+        """
+        Inicializa o benchmark.
+        
+        Args:
+            cenas: Vídeos de cenas usados como amostra
+            segundos_por_cena: Trecho extraído do meio de cada cena
+            max_cenas: Máximo de cenas na amostra (distribuídas uniformemente)
+            grade: Sobrescreve GRADE_PADRAO ('presets', 'modos', 'threads', 'tunes')
+            diretorio_trabalho: Diretório para arquivos temporários
+        """
+        if not ffmpeg_disponivel():
+            raise RuntimeError("❌ ffmpeg/ffprobe não encontrados no PATH")
+        
+        passo = max(1, len(cenas) // max_cenas) if cenas else 1
+        self.cenas = [c for c in cenas if os.path.exists(c)][::passo][:max_cenas]
+        self.segundos_por_cena = segundos_por_cena
+        self.grade = {**GRADE_PADRAO, **(grade or {})}
+        self.diretorio = diretorio_trabalho
+        criar_diretorios([self.diretorio])
+        
+        self.resolucao = VIDEO_CONFIG.get('resolution', (1920, 1080))
+        self.fps = VIDEO_CONFIG.get('fps', 30)
+        self.codec = VIDEO_CONFIG.get('codec', 'libx264')
+        
+        print(f"✅ EncoderBenchmark inicializado")
+        print(f"   Cenas na amostra: {len(self.cenas)}")
+        print(f"   Combinações: {len(self._combinacoes())}")
+    
+    def executar(
+        self,
+        ssim_minimo: float = 0.97,
+        pesos: Optional[Dict[str, float]] = None,
+        salvar: bool = True
+    ) -> Optional[Dict]:
+        """
+        Executa o benchmark completo e escolhe o perfil.
+        
+        Args:
+            ssim_minimo: Qualidade mínima aceitável (SSIM)
+            pesos: Pesos de 'velocidade', 'tamanho' e 'qualidade'
+            salvar: Salvar o perfil escolhido para o editor usar
+        
+        Returns:
+            Dict com 'perfil', 'resultados' e 'pareto' ou None
+        
+        Example:
+            >>> bench = EncoderBenchmark(['cena_001.mp4', 'cena_002.mp4'])
+            >>> relatorio = bench.executar()
+        """
+        referencia = self.preparar_amostra()
+        if not referencia:
+            return None
+        
+        combinacoes = self._combinacoes()
+        resultados = []
+        
+        for i, (preset, (modo, valor), threads, tune) in enumerate(combinacoes):
+            perfil = {'preset': preset, 'modo': modo, 'valor': valor, 'threads': threads, 'tune': tune}
+            print(f"   [{i+1}/{len(combinacoes)}] {self._descrever(perfil)}")
+            
+            medicao = self.medir_perfil(referencia, perfil)
+            if medicao:
+                resultados.append(medicao)
+                print(f"      {medicao['fps']:.1f} fps | {medicao['tamanho_mb']:.2f} MB | "
+                      f"SSIM {medicao['ssim']:.4f} | PSNR {medicao['psnr']:.2f} dB")
+        
+        if not resultados:
+            print("❌ Nenhuma medição concluída")
+            return None
+        
+        pareto = fronteira_pareto(resultados)
+        escolhido = escolher_perfil(resultados, ssim_minimo, pesos)
+        
+        relatorio = {
+            'host': socket.gethostname(),
+            'cpus': os.cpu_count(),
+            'medido_em': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'perfil': escolhido['perfil'],
+            'resultados': resultados,
+            'pareto': pareto,
+        }
+        
+        print(f"\n🏆 Perfil escolhido: {self._descrever(escolhido['perfil'])}")
+        print(f"   {len(pareto)} perfis na fronteira de Pareto")
+        
+        if salvar:
+            criar_diretorios([os.path.dirname(caminho_perfil_encoder())])
+            salvar_json(relatorio, caminho_perfil_encoder())
+        
+        return relatorio
+    
+    def preparar_amostra(self) -> Optional[str]:
+        """
+        Monta o clipe de referência (trechos do meio de cada cena).
+        
+        A referência é encodada sem perdas na resolução e fps finais, para que
+        todas as medições partam da mesma entrada.
+        
+        Returns:
+            Caminho do clipe de referência ou None
+        """
+        if not self.cenas:
+            print("❌ Nenhuma cena disponível para a amostra")
+            return None
+        
+        print(f"🎞️ Preparando amostra com {len(self.cenas)} cenas...")
+        
+        largura, altura = self.resolucao
+        trechos = []
+        
+        for i, cena in enumerate(self.cenas):
+            duracao = obter_duracao_midia(cena) or self.segundos_por_cena
+            inicio = max(0.0, (duracao - self.segundos_por_cena) / 2)
+            trecho = os.path.join(self.diretorio, f"trecho_{i:03d}.mkv")
+            
+            if executar_ffmpeg([
+                '-ss', f"{inicio:.3f}", '-i', cena, '-t', f"{self.segundos_por_cena:.3f}",
+                '-vf', f"scale={largura}:{altura}:force_original_aspect_ratio=decrease,"
+                       f"pad={largura}:{altura}:(ow-iw)/2:(oh-ih)/2,fps={self.fps}",
+                '-an', '-c:v', 'libx264', '-qp', '0', '-preset', 'ultrafast',
+                trecho
+            ], 'preparo da amostra'):
+                trechos.append(trecho)
+        
+        if not trechos:
+            return None
+        
+        lista = os.path.join(self.diretorio, 'trechos.txt')
+        with open(lista, 'w', encoding='utf-8') as f:
+            for trecho in trechos:
+                f.write(f"file '{trecho}'\n")
+        
+        referencia = os.path.join(self.diretorio, 'referencia.mkv')
+        if not executar_ffmpeg(['-f', 'concat', '-safe', '0', '-i', lista, '-c', 'copy', referencia],
+                               'concat da amostra'):
+            return None
+        
+        return referencia
+    
+    def medir_perfil(self, referencia: str, perfil: Dict) -> Optional[Dict]:
+        """
+        Encoda a referência com um perfil e mede velocidade, tamanho e qualidade.
+        
+        Args:
+            referencia: Clipe de referência
+            perfil: Dict com 'preset', 'modo', 'valor', 'threads', 'tune'
+        
+        Returns:
+            Dict com 'perfil', 'fps', 'tamanho_mb', 'ssim', 'psnr' ou None
+        """
+        saida = os.path.join(self.diretorio, 'encode.mp4')
+        
+        inicio = time.perf_counter()
+        ok = executar_ffmpeg(
+            ['-i', referencia, '-an', '-c:v', self.codec] + argumentos_encoder(perfil) + [saida],
+            'encode do benchmark'
+        )
+        tempo = time.perf_counter() - inicio
+        
+        if not ok:
+            return None
+        
+        duracao = obter_duracao_midia(referencia) or 0.0
+        ssim, psnr = self._medir_qualidade(saida, referencia)
+        
+        medicao = {
+            'perfil': perfil,
+            'fps': (duracao * self.fps) / tempo if tempo > 0 else 0.0,
+            'tamanho_mb': os.path.getsize(saida) / (1024 * 1024),
+            'ssim': ssim,
+            'psnr': psnr,
+        }
+        
+        os.remove(saida)
+        return medicao
+    
+    @staticmethod
+    def _medir_qualidade(distorcido: str, referencia: str) -> Tuple[float, float]:
+        """
+        Mede SSIM e PSNR com os filtros do ffmpeg.
+        """
+        comando = [
+            'ffmpeg', '-hide_banner', '-i', distorcido, '-i', referencia,
+            '-lavfi', '[0:v]split[a][b];[1:v]split[c][d];[a][c]ssim;[b][d]psnr',
+            '-f', 'null', '-'
+        ]
+        resultado = subprocess.run(comando, capture_output=True, text=True)
+        
+        ssim = re.search(r'SSIM .*All:([\d.]+)', resultado.stderr)
+        psnr = re.search(r'PSNR .*average:([\d.]+|inf)', resultado.stderr)
+        
+        valor_psnr = psnr.group(1) if psnr else '0'
+        return (
+            float(ssim.group(1)) if ssim else 0.0,
+            100.0 if valor_psnr == 'inf' else float(valor_psnr)
+        )
+    
+    def _combinacoes(self) -> List[Tuple]:
+        """
+        Lista todas as combinações da grade.
+        """
+        return list(itertools.product(
+            self.grade['presets'],
+            self.grade['modos'],
+            self.grade['threads'],
+            self.grade['tunes']
+        ))
+    
+    @staticmethod
+    def _descrever(perfil: Dict) -> str:
+        """
+        Descrição curta de um perfil para exibição.
+        """
+        threads = perfil.get('threads') or 'auto'
+        tune = perfil.get('tune') or '-'
+        return f"{perfil['preset']} | {perfil['modo']}={perfil['valor']} | threads={threads} | tune={tune}"
+
+
+def exemplo_uso():
+    """
+    Exemplo de uso do EncoderBenchmark.
+    """
+    print("=" * 60)
+    print("⏱️ EXEMPLO: EncoderBenchmark")
+    print("=" * 60)
+    
+    cenas = sys.argv[1:]
+    
+    if not cenas:
+        print("💡 Informe vídeos de cenas para a amostra:")
+        print("   python src/encoder_benchmark.py cena_001.mp4 cena_002.mp4 ...")
+        return
+    
+    try:
+        bench = EncoderBenchmark(cenas)
+        relatorio = bench.executar()
+        
+        if relatorio:
+            print(f"\n💾 Perfil salvo: {caminho_perfil_encoder()}")
+        
+    except Exception as e:
+        print(f"❌ Erro no exemplo: {e}")
+
+
+if __name__ == '__main__':
+    exemplo_uso()
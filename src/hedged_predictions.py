@@ -0,0 +1,286 @@
+"""
+🏁 HEDGED PREDICTIONS - ProjetoX
+
+Predições Replicate com hedge para reduzir a cauda de latência.
+
+Quando uma predição passa do percentil configurado da latência observada
+(boot a frio, fila), uma duplicata é enviada; a primeira que terminar vence
+e a outra é cancelada. As duplicatas são limitadas por fração de predições
+e por orçamento em USD, contados por execução do pipeline (nova_execucao);
+o histórico de latências é compartilhado pelo processo.
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+# Imports locais
+try:
+    import sys
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import DIRS, HEDGE_CONFIG
+    from src.utils import salvar_json, carregar_json, criar_diretorios
+    from src.remote_calls import chamar_remoto
+except ImportError:
+    print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
+
+
+# Latências guardadas por tipo de predição
+MAX_AMOSTRAS = 200
+
+# Status finais de uma predição Replicate
+STATUS_FINAIS = ('succeeded', 'failed', 'canceled')
+
+
+class HedgedPredictor:
+    """
+    Executor de predições com hedge baseado em percentil de latência.
+    
+    Example:
+        >>> hedger = obter_hedger().nova_execucao()
+        >>> output = hedger.executar(modelo, lambda: {"image": url}, tipo="animacao")
+        >>> print(hedger.relatorio())
+    """
+    
+    def __init__(
+        self,
+        caminho_latencias: Optional[str] = None,
+        historico: Optional['HedgedPredictor'] = None
+    ):
+        """
+        Inicializa o executor.
+        
+        Args:
+            caminho_latencias: JSON com as latências observadas
+                               (padrão: DIRS['cache']/latencias_replicate.json)
+            historico: Executor cujo histórico de latências é compartilhado
+                       (estatísticas e orçamento começam zerados)
+        """
+        self.percentil = HEDGE_CONFIG.get('percentil', 90)
+        self.amostras_minimas = HEDGE_CONFIG.get('amostras_minimas', 5)
+        self.limite_inicial = HEDGE_CONFIG.get('limite_inicial_segundos', 240)
+        self.max_fracao = HEDGE_CONFIG.get('max_fracao_hedges', 0.2)
+        self.orcamento = HEDGE_CONFIG.get('orcamento_usd', 2.0)
+        self.custos = HEDGE_CONFIG.get('custo_estimado', {})
+        self.intervalo = HEDGE_CONFIG.get('intervalo_consulta', 2.0)
+        
+        self._lock = threading.Lock()
+        
+        if historico is not None:
+            self.caminho_latencias = historico.caminho_latencias
+            self.latencias = historico.latencias
+            self._lock_latencias = historico._lock_latencias
+        else:
+            self.caminho_latencias = caminho_latencias or os.path.join(DIRS['cache'], 'latencias_replicate.json')
+            criar_diretorios([os.path.dirname(self.caminho_latencias)])
+            
+            self.latencias: Dict[str, deque] = {}
+            self._lock_latencias = threading.Lock()
+            
+            dados = carregar_json(self.caminho_latencias) if os.path.exists(self.caminho_latencias) else None
+            for tipo, valores in (dados or {}).items():
+                self.latencias[tipo] = deque(valores, maxlen=MAX_AMOSTRAS)
+        
+        self.estatisticas = {
+            'predicoes': 0,
+            'hedges_disparados': 0,
+            'hedges_vencedores': 0,
+            'hedges_negados_orcamento': 0,
+            'custo_extra_usd': 0.0,
+        }
+    
+    def nova_execucao(self) -> 'HedgedPredictor':
+        """
+        Executor para uma execução do pipeline: orçamento e fração de
+        duplicatas próprios, mesmo histórico de latências.
+        """
+        return HedgedPredictor(historico=self)
+    
+    def limite_hedge(self, tipo: str) -> float:
+        """
+        Segundos após os quais uma predição do tipo ganha duplicata.
+        
+        Args:
+            tipo: Tipo da predição ('animacao', 'lipsync', ...)
+        
+        Returns:
+            Percentil configurado das latências, ou o limite inicial
+        """
+        with self._lock_latencias:
+            amostras = sorted(self.latencias.get(tipo, []))
+        if len(amostras) < self.amostras_minimas:
+            return self.limite_inicial
+        
+        indice = min(len(amostras) - 1, int(round(self.percentil / 100 * (len(amostras) - 1))))
+        return amostras[indice]
+    
+    def executar(self, modelo: str, montar_input: Callable[[], Dict], tipo: str) -> Any:
+        """
+        Executa uma predição com hedge e retorna o output da vencedora.
+        
+        Args:
+            modelo: Modelo no formato 'dono/nome:versao'
+            montar_input: Função que monta o input (chamada por predição, para
+                          que arquivos abertos não sejam compartilhados)
+            tipo: Tipo da predição, para latência e custo
+        
+        Returns:
+            Output da primeira predição bem-sucedida
+        
+        Raises:
+            RuntimeError: Se todas as predições falharem
+        """
+        versao = modelo.split(':')[-1]
+        limite = self.limite_hedge(tipo)
+        
+        with self._lock:
+            self.estatisticas['predicoes'] += 1
+        
+        original = self._criar(versao, montar_input, tipo)
+        predicoes = [original]
+        inicio = time.time()
+        inicios = {predicoes[0].id: inicio}
+        hedge = None
+        tentou_hedge = False
+        erros: List[str] = []
+        
+        try:
+            while True:
+                for predicao in list(predicoes):
+                    # Erro de rede na consulta não deve cancelar as predições
+                    chamar_remoto('replicate', predicao.reload, descricao=f"consultar_{tipo}")
+                    
+                    if predicao.status == 'succeeded':
+                        self._registrar_latencia(tipo, time.time() - inicios[predicao.id])
+                        if hedge and predicao.id == hedge.id:
+                            with self._lock:
+                                self.estatisticas['hedges_vencedores'] += 1
+                            # A original (cancelada) levaria pelo menos esse tempo:
+                            # sem a amostra, o percentil encolheria a cada hedge
+                            if original in predicoes:
+                                self._registrar_latencia(tipo, time.time() - inicio)
+                            print(f"   🏁 Duplicata venceu ({tipo}, {time.time() - inicio:.0f}s)")
+                        return predicao.output
+                    
+                    if predicao.status in ('failed', 'canceled'):
+                        erros.append(f"{predicao.id}: {predicao.error or predicao.status}")
+                        predicoes.remove(predicao)
+                
+                if not predicoes:
+                    raise RuntimeError(f"Predição {tipo} falhou: {'; '.join(erros)}")
+                
+                # No máximo uma duplicata por predição
+                if not tentou_hedge and time.time() - inicio > limite:
+                    tentou_hedge = True
+                    if self._reservar_hedge(tipo):
+                        print(f"   🏁 Predição {tipo} passou de {limite:.0f}s, enviando duplicata")
+                        hedge = self._criar(versao, montar_input, tipo)
+                        inicios[hedge.id] = time.time()
+                        predicoes.append(hedge)
+                
+                time.sleep(self.intervalo)
+            
+        finally:
+            # Cancelar as predições perdedoras (ou todas, em caso de erro)
+            for predicao in predicoes:
+                if predicao.status not in STATUS_FINAIS:
+                    try:
+                        predicao.cancel()
+                    except Exception as e:
+                        print(f"⚠️ Não foi possível cancelar {predicao.id}: {e}")
+    
+    def relatorio(self) -> Dict:
+        """
+        Estatísticas de hedge desta execução e limites atuais por tipo.
+        """
+        with self._lock_latencias:
+            tipos = list(self.latencias)
+        
+        predicoes = self.estatisticas['predicoes']
+        return {
+            **self.estatisticas,
+            'taxa_hedge': self.estatisticas['hedges_disparados'] / predicoes if predicoes else 0.0,
+            'limites_segundos': {tipo: round(self.limite_hedge(tipo), 1) for tipo in tipos},
+        }
+    
+    def _criar(self, versao: str, montar_input: Callable[[], Dict], tipo: str):
+        """
+        Cria uma predição (com tentativas da camada de chamadas remotas).
+        """
+        import replicate
+        
+        return chamar_remoto(
+            'replicate',
+            lambda: replicate.predictions.create(version=versao, input=montar_input()),
+            descricao=f"criar_{tipo}"
+        )
+    
+    def _reservar_hedge(self, tipo: str) -> bool:
+        """
+        Reserva orçamento para uma duplicata, se os limites permitirem.
+        """
+        custo = self.custos.get(tipo, 0.0)
+        
+        with self._lock:
+            disparados = self.estatisticas['hedges_disparados']
+            dentro_fracao = disparados + 1 <= max(1, self.max_fracao * self.estatisticas['predicoes'])
+            dentro_orcamento = self.estatisticas['custo_extra_usd'] + custo <= self.orcamento
+            
+            if not (dentro_fracao and dentro_orcamento):
+                self.estatisticas['hedges_negados_orcamento'] += 1
+                return False
+            
+            self.estatisticas['hedges_disparados'] += 1
+            self.estatisticas['custo_extra_usd'] += custo
+            return True
+    
+    def _registrar_latencia(self, tipo: str, segundos: float) -> None:
+        """
+        Adiciona uma amostra de latência e persiste o histórico.
+        """
+        with self._lock_latencias:
+            self.latencias.setdefault(tipo, deque(maxlen=MAX_AMOSTRAS)).append(round(segundos, 1))
+            salvar_json(
+                {t: list(v) for t, v in self.latencias.items()},
+                self.caminho_latencias,
+                identado=False
+            )
+
+
+_hedger: Optional[HedgedPredictor] = None
+_hedger_lock = threading.Lock()
+
+
+def obter_hedger() -> HedgedPredictor:
+    """
+    Instância compartilhada do processo, dona do histórico de latências.
+    
+    Cada execução do pipeline usa obter_hedger().nova_execucao(), para que
+    orçamento e estatísticas valham por execução (lotes e daemon).
+    """
+    global _hedger
+    
+    with _hedger_lock:
+        if _hedger is None:
+            _hedger = HedgedPredictor()
+        return _hedger
+
+
+def exemplo_uso():
+    """
+    Exemplo de uso: limites atuais a partir do histórico de latências.
+    """
+    hedger = obter_hedger()
+    
+    for tipo in ('animacao', 'lipsync'):
+        print(f"   {tipo}: duplicata após {hedger.limite_hedge(tipo):.0f}s")
+    
+    print(f"📊 {hedger.relatorio()}")
+
+
+if __name__ == '__main__':
+    exemplo_uso()
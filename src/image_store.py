@@ -0,0 +1,395 @@
+"""
+🖼️ IMAGE STORE - ProjetoX
+
+Armazenamento de imagens em camadas: um master sem perdas por conteúdo
+(endereçado pelo SHA-256) e versões derivadas (WebP/JPEG comprimidos,
+miniaturas, recortes na resolução do vídeo) geradas sob demanda e
+memoizadas por (hash do master, transformação).
+"""
+
+import os
+import shutil
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Imports condicionais (podem não estar disponíveis em todos ambientes)
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+
+# Imports locais
+try:
+    import sys
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import DIRS, OPTIMIZATION_CONFIG, VIDEO_CONFIG
+    from src.utils import (
+        criar_diretorios, get_tamanho_arquivo_mb, hash_arquivo,
+        transformar_imagens_lote, transformar_imagem
+    )
+except ImportError:
+    print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
+
+
+# Extensão e formato Pillow de cada formato de saída
+FORMATOS = {
+    'webp': ('.webp', 'WEBP'),
+    'jpeg': ('.jpg', 'JPEG'),
+    'jpg': ('.jpg', 'JPEG'),
+    'png': ('.png', 'PNG'),
+}
+
+# Dimensão omitida em versao(): sem limite naquele eixo
+SEM_LIMITE = 1 << 30
+
+
+class ImageStore:
+    """
+    Armazenamento de imagens com master sem perdas e versões derivadas.
+    
+    O master é guardado uma única vez por conteúdo; cada versão derivada é
+    gerada na primeira solicitação e reaproveitada (em memória e em disco)
+    nas seguintes.
+    
+    Example:
+        >>> store = ImageStore()
+        >>> webp = store.versao("personagem.png", formato="webp", qualidade=85)
+        >>> capa = store.recorte_video("personagem.png")
+    """
+    
+    def __init__(self, diretorio: Optional[str] = None):
+        """
+        Inicializa o armazenamento.
+        
+        Args:
+            diretorio: Diretório base (padrão: DIRS['cache']/imagens)
+        """
+        if not PILLOW_AVAILABLE:
+            raise RuntimeError("❌ ImageStore requer Pillow")
+        
+        self.diretorio = diretorio or os.path.join(DIRS['cache'], 'imagens')
+        self.dir_masters = os.path.join(self.diretorio, 'masters')
+        self.dir_versoes = os.path.join(self.diretorio, 'versoes')
+        criar_diretorios([self.dir_masters, self.dir_versoes])
+        
+        self.formato_padrao = OPTIMIZATION_CONFIG.get('formato_imagem_comprimida', 'webp')
+        self.qualidade_padrao = OPTIMIZATION_CONFIG.get('compression_quality', 85)
+        
+        # Memoização: caminho -> (mtime, hash) e (hash, transformação) -> versão
+        self._hashes: Dict[str, Tuple[float, str]] = {}
+        self._versoes: Dict[Tuple[str, Tuple], str] = {}
+        self._locks: Dict[Tuple[str, Tuple], threading.Lock] = {}
+        self._lock = threading.Lock()
+    
+    def adicionar(self, caminho_imagem: str) -> str:
+        """
+        Registra uma imagem como master (sem recompressão).
+        
+        Args:
+            caminho_imagem: Caminho da imagem original
+        
+        Returns:
+            Hash SHA-256 do master
+        """
+        chave = os.path.abspath(caminho_imagem)
+        mtime = os.path.getmtime(chave)
+        
+        memorizado = self._hashes.get(chave)
+        if memorizado and memorizado[0] == mtime:
+            return memorizado[1]
+        
+        sha = hash_arquivo(chave)
+        master = self._caminho_master(sha, os.path.splitext(chave)[1])
+        
+        if not os.path.exists(master):
+            shutil.copy2(chave, master)
+        
+        self._hashes[chave] = (mtime, sha)
+        return sha
+    
+    def versao(
+        self,
+        imagem: str,
+        formato: Optional[str] = None,
+        qualidade: Optional[int] = None,
+        largura: Optional[int] = None,
+        altura: Optional[int] = None,
+        modo: str = 'contain'
+    ) -> Optional[str]:
+        """
+        Retorna (gerando se necessário) uma versão derivada da imagem.
+        
+        Args:
+            imagem: Caminho da imagem ou hash de um master já registrado
+            formato: webp, jpeg ou png (padrão: OPTIMIZATION_CONFIG)
+            qualidade: Qualidade de compressão 0-100 (padrão: compression_quality)
+            largura: Largura máxima/alvo (opcional)
+            altura: Altura máxima/alvo (opcional)
+            modo: 'contain' (cabe na caixa) ou 'cover' (recorta para preencher)
+        
+        Returns:
+            Caminho da versão ou None em caso de erro
+        """
+        formato = (formato or self.formato_padrao).lower()
+        if formato not in FORMATOS:
+            print(f"❌ Formato não suportado: {formato}")
+            return None
+        
+        qualidade = qualidade or self.qualidade_padrao
+        transformacao = (formato, qualidade, largura, altura, modo)
+        
+        try:
+            sha = imagem if self._master_existe(imagem) else self.adicionar(imagem)
+            chave = (sha, transformacao)
+            
+            if chave in self._versoes and os.path.exists(self._versoes[chave]):
+                return self._versoes[chave]
+            
+            with self._lock:
+                lock = self._locks.setdefault(chave, threading.Lock())
+            
+            # Um único gerador por versão, mesmo com chamadas concorrentes
+            with lock:
+                destino = self._caminho_versao(sha, transformacao)
+                if not os.path.exists(destino):
+                    self._gerar_versao(self._localizar_master(sha), destino, transformacao)
+                self._versoes[chave] = destino
+            
+            return destino
+            
+        except Exception as e:
+            print(f"❌ Erro ao gerar versão da imagem: {e}")
+            return None
+    
+    def miniatura(self, imagem: str, lado: int = 320) -> Optional[str]:
+        """
+        Miniatura JPEG que cabe em lado x lado.
+        """
+        return self.versao(imagem, formato='jpeg', qualidade=80, largura=lado, altura=lado)
+    
+    def recorte_video(
+        self,
+        imagem: str,
+        resolucao: Optional[Tuple[int, int]] = None,
+        formato: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Recorte que preenche exatamente a resolução do vídeo.
+        
+        Args:
+            imagem: Caminho da imagem ou hash
+            resolucao: (largura, altura) (padrão: VIDEO_CONFIG['resolution'])
+            formato: Formato de saída (padrão: OPTIMIZATION_CONFIG)
+        """
+        largura, altura = resolucao or VIDEO_CONFIG.get('resolution', (1920, 1080))
+        return self.versao(imagem, formato=formato, largura=largura, altura=altura, modo='cover')
+    
+    def para_upload(
+        self,
+        imagem: str,
+        resolucao: Optional[Tuple[int, int]] = None
+    ) -> str:
+        """
+        Versão a enviar para APIs externas.
+        
+        Com compress_temp_images desativado (ou em caso de erro), retorna a
+        própria imagem.
+        
+        A imagem é reduzida para caber em resolucao, sem recorte (um master
+        quadrado não perde cabeça e pés) e sem ampliação (o modelo remoto
+        ajusta o tamanho).
+        
+        Args:
+            imagem: Caminho da imagem
+            resolucao: Caber em (largura, altura) antes de comprimir
+        
+        Returns:
+            Caminho do arquivo a enviar
+        """
+        if not OPTIMIZATION_CONFIG.get('compress_temp_images', True):
+            return imagem
+        
+        if resolucao:
+            largura, altura = resolucao
+            versao = self.versao(imagem, largura=largura, altura=altura, modo='contain')
+        else:
+            versao = self.versao(imagem)
+        
+        if versao:
+            print(f"   🗜️ Upload comprimido: {get_tamanho_arquivo_mb(imagem):.2f}MB -> {get_tamanho_arquivo_mb(versao):.2f}MB")
+            return versao
+        
+        return imagem
+    
+    def converter_lote(
+        self,
+        imagens: List[str],
+        max_workers: Optional[int] = None,
+        **transformacao
+    ) -> Dict[str, Optional[str]]:
+        """
+        Gera a mesma versão para várias imagens em paralelo.
+        
+        As versões que ainda não existem são geradas por
+        utils.transformar_imagens_lote (pool de processos); imagens com o
+        mesmo conteúdo geram uma única versão.
+        
+        Args:
+            imagens: Lista de caminhos de imagem
+            max_workers: Número de processos (padrão: os.cpu_count())
+            **transformacao: Argumentos de versao() (formato, qualidade, ...)
+        
+        Returns:
+            Dict mapeando imagem original -> caminho da versão
+        
+        Example:
+            >>> store.converter_lote(imagens, formato="webp", largura=1280, altura=720, modo="cover")
+        """
+        print(f"🖼️ Convertendo {len(imagens)} imagens...")
+        
+        formato = (transformacao.get('formato') or self.formato_padrao).lower()
+        if formato not in FORMATOS:
+            print(f"❌ Formato não suportado: {formato}")
+            return {imagem: None for imagem in imagens}
+        
+        chave_transformacao = (
+            formato,
+            transformacao.get('qualidade') or self.qualidade_padrao,
+            transformacao.get('largura'),
+            transformacao.get('altura'),
+            transformacao.get('modo', 'contain')
+        )
+        
+        # Imagem -> versão; versões a gerar agrupadas por destino
+        destinos: Dict[str, Optional[str]] = {}
+        pendentes: Dict[str, Dict] = {}
+        for imagem in imagens:
+            try:
+                sha = imagem if self._master_existe(imagem) else self.adicionar(imagem)
+            except Exception as e:
+                print(f"❌ {imagem}: {e}")
+                destinos[imagem] = None
+                continue
+            
+            destino = self._caminho_versao(sha, chave_transformacao)
+            destinos[imagem] = destino
+            self._versoes[(sha, chave_transformacao)] = destino
+            
+            if not os.path.exists(destino) and destino not in pendentes:
+                pendentes[destino] = self._job_versao(self._localizar_master(sha), destino, chave_transformacao)
+        
+        if pendentes:
+            resultados = transformar_imagens_lote(list(pendentes.values()), max_workers=max_workers)
+            for destino, resultado in zip(pendentes, resultados):
+                if resultado['sucesso']:
+                    os.replace(resultado['saida'], destino)
+        
+        convertidas = {
+            imagem: destino if destino and os.path.exists(destino) else None
+            for imagem, destino in destinos.items()
+        }
+        print(f"✅ {sum(1 for v in convertidas.values() if v)}/{len(imagens)} imagens convertidas")
+        return convertidas
+    
+    def _gerar_versao(self, master: str, destino: str, transformacao: Tuple) -> None:
+        """
+        Gera uma versão com as mesmas operações de utils.transformar_imagens_lote.
+        """
+        job = self._job_versao(master, destino, transformacao)
+        resultado = transformar_imagem(job)
+        
+        if not resultado['sucesso']:
+            raise RuntimeError(resultado['erro'])
+        
+        # Escrita atômica: versões parciais nunca são reaproveitadas
+        os.replace(job['saida'], destino)
+    
+    @staticmethod
+    def _job_versao(master: str, destino: str, transformacao: Tuple) -> Dict:
+        """
+        Job de transformar_imagens_lote para uma versão (saída em arquivo temporário).
+        
+        'cover' recorta para preencher a caixa; 'contain' reduz para caber
+        nela, sem ampliar.
+        """
+        formato, qualidade, largura, altura, modo = transformacao
+        _, formato_pil = FORMATOS[formato]
+        
+        operacoes = []
+        if largura and altura and modo == 'cover':
+            operacoes.append({'op': 'recortar', 'largura': largura, 'altura': altura})
+        elif largura or altura:
+            operacoes.append({
+                'op': 'redimensionar',
+                'largura': largura or SEM_LIMITE,
+                'altura': altura or SEM_LIMITE,
+                'manter_aspecto': True
+            })
+        
+        return {
+            'entrada': master,
+            'saida': f"{destino}.tmp",
+            'operacoes': operacoes,
+            'formato': formato_pil,
+            'qualidade': qualidade,
+            'otimizar': formato_pil == 'PNG'
+        }
+    
+    def _caminho_master(self, sha: str, extensao: str) -> str:
+        """
+        Caminho do master de um hash.
+        """
+        return os.path.join(self.dir_masters, f"{sha}{extensao.lower() or '.png'}")
+    
+    def _caminho_versao(self, sha: str, transformacao: Tuple) -> str:
+        """
+        Caminho determinístico de uma versão (hash + transformação).
+        """
+        formato, qualidade, largura, altura, modo = transformacao
+        extensao, _ = FORMATOS[formato]
+        dimensoes = f"{largura or 0}x{altura or 0}_{modo}" if (largura or altura) else 'original'
+        return os.path.join(self.dir_versoes, f"{sha[:16]}_{dimensoes}_q{qualidade}{extensao}")
+    
+    def _master_existe(self, valor: str) -> bool:
+        """
+        Indica se o valor é o hash de um master já registrado.
+        """
+        return len(valor) == 64 and not os.path.exists(valor) and self._localizar_master(valor) is not None
+    
+    def _localizar_master(self, sha: str) -> Optional[str]:
+        """
+        Caminho do master de um hash (qualquer extensão), se existir.
+        """
+        for nome in os.listdir(self.dir_masters):
+            if nome.startswith(sha):
+                return os.path.join(self.dir_masters, nome)
+        return None
+
+
+def exemplo_uso():
+    """
+    Exemplo de uso do armazenamento de imagens.
+    """
+    if len(sys.argv) < 2:
+        print("Uso: python image_store.py imagem1.png [imagem2.png ...]")
+        return
+    
+    store = ImageStore()
+    
+    # Versões comprimidas em paralelo
+    versoes = store.converter_lote(sys.argv[1:], formato='webp')
+    
+    for original, versao in versoes.items():
+        if versao:
+            print(f"   {original}: {get_tamanho_arquivo_mb(original):.2f}MB -> {get_tamanho_arquivo_mb(versao):.2f}MB")
+    
+    # Miniatura e recorte para o vídeo
+    print(f"   Miniatura: {store.miniatura(sys.argv[1])}")
+    print(f"   Recorte 16:9: {store.recorte_video(sys.argv[1])}")
+
+
+if __name__ == '__main__':
+    exemplo_uso()
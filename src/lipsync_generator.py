@@ -7,18 +7,22 @@ Usa Replicate (Wav2Lip) ou D-ID API.
 
 import os
 import time
-import replicate
 from typing import Dict, List, Optional
 
 # Imports locais
 try:
     import sys
-    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-    from config.settings import AI_CONFIG
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import AI_CONFIG, HEDGE_CONFIG
     from src.utils import (
         validar_api_key, download_arquivo, salvar_json,
         criar_diretorios
     )
+    from src.remote_assets import obter_cache_remoto
+    from src.remote_calls import chamar_remoto, executar_em_paralelo
+    from src.hedged_predictions import HedgedPredictor, obter_hedger
 except ImportError:
     print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
 
@@ -59,7 +63,10 @@ class LipsyncGenerator:
         self,
         video_path: str,
         audio_path: str,
-        nome_saida: Optional[str] = None
+        nome_saida: Optional[str] = None,
+        hedge: Optional[bool] = None,
+        hedger: Optional[HedgedPredictor] = None,
+        diretorio: Optional[str] = None
     ) -> Optional[str]:
         """
         Aplica lip-sync a um vídeo usando áudio.
@@ -68,6 +75,11 @@ class LipsyncGenerator:
             video_path: Caminho do vídeo (com rosto)
             audio_path: Caminho do áudio (fala)
             nome_saida: Nome do arquivo de saída (opcional)
+            hedge: Enviar duplicata se a predição demorar além do percentil
+                   de latência (padrão: HEDGE_CONFIG['ativo'])
+            hedger: Executor com o orçamento da execução (padrão: obter_hedger())
+            diretorio: Diretório do vídeo (padrão: output_dir); projetos
+                       simultâneos usam diretórios próprios
         
         Returns:
             Caminho do vídeo com lip-sync ou None
@@ -89,16 +101,30 @@ class LipsyncGenerator:
         print(f"   Áudio: {os.path.basename(audio_path)}")
         
         try:
+            import replicate
+            
             # Processar com Wav2Lip
             print("   Processando (pode levar alguns minutos)...")
             
-            output = replicate.run(
-                self.modelo,
-                input={
-                    "video": open(video_path, "rb"),
-                    "audio": open(audio_path, "rb")
+            # Reaproveitar uploads anteriores (reexecuções, retomadas)
+            cache = obter_cache_remoto()
+            url_video = cache.url_para(video_path)
+            url_audio = cache.url_para(audio_path)
+            
+            def montar_input():
+                return {
+                    "video": url_video or open(video_path, "rb"),
+                    "audio": url_audio or open(audio_path, "rb")
                 }
-            )
+            
+            if HEDGE_CONFIG.get('ativo', False) if hedge is None else hedge:
+                output = (hedger or obter_hedger()).executar(self.modelo, montar_input, tipo='lipsync')
+            else:
+                output = chamar_remoto(
+                    'replicate',
+                    lambda: replicate.run(self.modelo, input=montar_input()),
+                    descricao='lipsync'
+                )
             
             # Output é uma URL de vídeo
             if output:
@@ -109,7 +135,9 @@ class LipsyncGenerator:
                     base_name = os.path.splitext(os.path.basename(video_path))[0]
                     nome_saida = f"{base_name}_lipsync.mp4"
                 
-                caminho_saida = os.path.join(self.output_dir, nome_saida)
+                if diretorio:
+                    os.makedirs(diretorio, exist_ok=True)
+                caminho_saida = os.path.join(diretorio or self.output_dir, nome_saida)
                 
                 if download_arquivo(video_url, caminho_saida):
                     print(f"✅ Lip-sync aplicado: {caminho_saida}")
@@ -127,7 +155,9 @@ class LipsyncGenerator:
         self,
         cenas_videos: Dict[int, str],
         cenas_audios: Dict[int, str],
-        apenas_dialogos: bool = True
+        apenas_dialogos: bool = True,
+        hedger: Optional[HedgedPredictor] = None,
+        diretorio: Optional[str] = None
     ) -> Dict[int, str]:
         """
         Aplica lip-sync em múltiplas cenas.
@@ -136,6 +166,8 @@ class LipsyncGenerator:
             cenas_videos: Dict mapeando número da cena -> caminho do vídeo
             cenas_audios: Dict mapeando número da cena -> caminho do áudio
             apenas_dialogos: Aplicar apenas em cenas com diálogo
+            hedger: Executor de hedge da execução (ver aplicar_lipsync)
+            diretorio: Diretório dos vídeos do projeto (ver aplicar_lipsync)
         
         Returns:
             Dict mapeando número da cena -> caminho do vídeo com lip-sync
@@ -153,30 +185,19 @@ class LipsyncGenerator:
         
         print(f"   Cenas a processar: {len(cenas_comuns)}")
         
-        for i, num_cena in enumerate(sorted(cenas_comuns)):
-            print(f"\n[{i+1}/{len(cenas_comuns)}] Cena {num_cena}")
-            
-            video_path = cenas_videos[num_cena]
-            audio_path = cenas_audios[num_cena]
-            
-            nome_saida = f"cena_{num_cena:03d}_lipsync.mp4"
-            
-            # Aplicar lip-sync
-            video_synced = self.aplicar_lipsync(
-                video_path=video_path,
-                audio_path=audio_path,
-                nome_saida=nome_saida
+        def sincronizar(num_cena):
+            print(f"\n💋 Cena {num_cena}")
+            return self.aplicar_lipsync(
+                video_path=cenas_videos[num_cena],
+                audio_path=cenas_audios[num_cena],
+                nome_saida=f"cena_{num_cena:03d}_lipsync.mp4",
+                hedger=hedger,
+                diretorio=diretorio
             )
-            
-            if video_synced:
-                videos_synced[num_cena] = video_synced
-            else:
-                # Usar vídeo original se falhar
-                videos_synced[num_cena] = video_path
-            
-            # Delay entre requisições
-            if i < len(cenas_comuns) - 1:
-                time.sleep(3)
+        
+        for num_cena, video_synced in executar_em_paralelo('replicate', sincronizar, sorted(cenas_comuns)):
+            # Usar vídeo original se falhar
+            videos_synced[num_cena] = video_synced or cenas_videos[num_cena]
         
         # Adicionar cenas sem lip-sync
         for num_cena, video_path in cenas_videos.items():
@@ -0,0 +1,461 @@
+"""
+🔊 PCM CACHE - ProjetoX
+
+Cache de áudio decodificado.
+
+Cada arquivo de áudio (MP3, WAV, ...) é decodificado uma única vez para um
+.npy float32 (amostras x canais) com um sidecar JSON de metadados (taxa,
+canais, duração). Editor, mixagem e ajustes de volume leem o .npy por
+memory-map, sem copiar nem decodificar de novo.
+
+Os memory-maps abertos são limitados (LRU, AUDIO_CONFIG['pcm_max_abertos'])
+e o diretório tem tamanho máximo (AUDIO_CONFIG['pcm_cache_max_mb']): os .npy
+usados há mais tempo são apagados, para que processos longos (daemon) não
+acumulem descritores nem disco.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import subprocess
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# Imports locais
+try:
+    import sys
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import AUDIO_CONFIG, DIRS
+    from src.utils import criar_diretorios, salvar_json, carregar_json, hash_arquivo, ffmpeg_disponivel
+except ImportError:
+    print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
+
+
+# Bytes lidos por vez ao montar o .npy (o áudio nunca fica inteiro em memória)
+BLOCO_BYTES = 1024 * 1024
+
+# Locks de decodificação (por faixa do hash, em número fixo)
+NUM_LOCKS = 64
+
+# Hashes de arquivo memoizados
+MAX_HASHES = 4096
+
+
+class PCMCache:
+    """
+    Áudio decodificado uma vez e lido por memory-map.
+    
+    Example:
+        >>> cache = obter_cache_pcm()
+        >>> amostras, meta = cache.carregar("cena_001_audio.mp3")
+        >>> amostras.shape, meta['duracao']
+        ((441000, 2), 10.0)
+    """
+    
+    def __init__(
+        self,
+        diretorio: Optional[str] = None,
+        taxa: Optional[int] = None,
+        canais: Optional[int] = None
+    ):
+        """
+        Inicializa o cache.
+        
+        Args:
+            diretorio: Diretório dos .npy (padrão: DIRS['cache']/pcm)
+            taxa: Taxa de amostragem de saída (padrão: AUDIO_CONFIG['sample_rate'])
+            canais: Canais de saída (padrão: AUDIO_CONFIG['channels'])
+        """
+        self.diretorio = diretorio or os.path.join(DIRS['cache'], 'pcm')
+        criar_diretorios([self.diretorio])
+        
+        self.taxa = taxa or AUDIO_CONFIG.get('sample_rate', 44100)
+        self.canais = canais or AUDIO_CONFIG.get('channels', 2)
+        
+        self.max_abertos = AUDIO_CONFIG.get('pcm_max_abertos', 32)
+        self.max_mb = AUDIO_CONFIG.get('pcm_cache_max_mb', 2048)
+        
+        self._lock = threading.Lock()
+        self._locks = [threading.Lock() for _ in range(NUM_LOCKS)]
+        self._hashes: 'OrderedDict[str, Tuple[tuple, str]]' = OrderedDict()
+        self._abertos: 'OrderedDict[str, Tuple]' = OrderedDict()
+        
+        self.decodificacoes = 0
+        self.reaproveitados = 0
+    
+    def carregar(self, caminho: str):
+        """
+        Amostras do áudio (memory-map somente leitura) e metadados.
+        
+        Args:
+            caminho: Caminho do arquivo de áudio
+        
+        Returns:
+            (array float32 [amostras, canais], metadados)
+        """
+        import numpy as np
+        
+        destino = self.caminho_pcm(caminho)
+        
+        with self._lock:
+            aberto = self._abertos.get(destino)
+            if aberto is not None:
+                self._abertos.move_to_end(destino)
+                return aberto
+        
+        aberto = (np.load(destino, mmap_mode='r'), carregar_json(self._sidecar(destino)))
+        
+        # Mapas fora do LRU fecham quando o último array que os usa é liberado
+        with self._lock:
+            self._abertos[destino] = aberto
+            while len(self._abertos) > self.max_abertos:
+                self._abertos.popitem(last=False)
+        
+        return aberto
+    
+    def metadados(self, caminho: str) -> Dict:
+        """
+        Taxa, canais, amostras e duração do áudio (decodificando se necessário).
+        """
+        return carregar_json(self._sidecar(self.caminho_pcm(caminho)))
+    
+    def duracao(self, caminho: str) -> float:
+        """
+        Duração do áudio em segundos.
+        """
+        return self.metadados(caminho)['duracao']
+    
+    def segmento(self, caminho: str):
+        """
+        AudioSegment do pydub montado a partir do PCM, sem nova decodificação.
+        """
+        amostras, meta = self.carregar(caminho)
+        return segmento_de_amostras(amostras, meta['taxa'])
+    
+    def caminho_pcm(self, caminho: str) -> str:
+        """
+        Caminho do .npy de um áudio, decodificando-o na primeira vez.
+        
+        Args:
+            caminho: Caminho do arquivo de áudio
+        
+        Returns:
+            Caminho do .npy
+        """
+        sha = self._hash(caminho)
+        destino = os.path.join(self.diretorio, f"{sha[:24]}_{self.taxa}_{self.canais}.npy")
+        
+        # O sidecar é gravado por último: sua presença indica .npy completo
+        with self._locks[int(sha[:8], 16) % NUM_LOCKS]:
+            if os.path.exists(self._sidecar(destino)):
+                self.reaproveitados += 1
+                os.utime(destino)  # uso recente (ordem de limpeza)
+                return destino
+            
+            self._decodificar(caminho, destino)
+            self.decodificacoes += 1
+        
+        self.limpar(manter=destino)
+        return destino
+    
+    def limpar(self, max_mb: Optional[float] = None, manter: Optional[str] = None) -> int:
+        """
+        Apaga os .npy usados há mais tempo até o diretório caber no limite.
+        
+        Arquivos com memory-map aberto no cache não são apagados.
+        
+        Args:
+            max_mb: Tamanho máximo do diretório em MB (padrão: pcm_cache_max_mb)
+            manter: .npy que não deve ser apagado (ex: o recém-decodificado)
+        
+        Returns:
+            Número de arquivos de áudio removidos
+        """
+        limite = (self.max_mb if max_mb is None else max_mb) * 1024 * 1024
+        
+        arquivos = []
+        total = 0
+        for entrada in os.scandir(self.diretorio):
+            if not entrada.name.endswith(('.npy', '.json')):
+                continue
+            info = entrada.stat()
+            total += info.st_size
+            if entrada.name.endswith('.npy'):
+                arquivos.append((info.st_mtime, entrada.path, info.st_size))
+        
+        if total <= limite:
+            return 0
+        
+        with self._lock:
+            abertos = set(self._abertos)
+        
+        removidos = 0
+        for _, caminho, tamanho in sorted(arquivos):
+            if total <= limite:
+                break
+            if caminho in abertos or caminho == manter:
+                continue
+            
+            sidecar = self._sidecar(caminho)
+            try:
+                # Sidecar primeiro: sem ele o .npy já não é reaproveitado
+                if os.path.exists(sidecar):
+                    total -= os.path.getsize(sidecar)
+                    os.remove(sidecar)
+                os.remove(caminho)
+            except OSError as e:
+                print(f"⚠️ Não foi possível remover {os.path.basename(caminho)}: {e}")
+                continue
+            
+            total -= tamanho
+            removidos += 1
+        
+        if removidos:
+            print(f"🗑️ Cache PCM: {removidos} áudios removidos ({total / (1024 * 1024):.0f} MB restantes)")
+        
+        return removidos
+    
+    def estatisticas(self) -> Dict:
+        """
+        Decodificações e reaproveitamentos nesta sessão.
+        """
+        return {'decodificacoes': self.decodificacoes, 'reaproveitados': self.reaproveitados}
+    
+    def _decodificar(self, origem: str, destino: str) -> None:
+        """
+        Decodifica para float32 intercalado e grava o .npy e o sidecar.
+        """
+        import numpy as np
+        
+        print(f"🔊 Decodificando PCM: {os.path.basename(origem)}")
+        
+        with tempfile.NamedTemporaryFile(dir=self.diretorio, suffix='.raw', delete=False) as bruto:
+            caminho_bruto = bruto.name
+        
+        try:
+            if ffmpeg_disponivel():
+                self._decodificar_ffmpeg(origem, caminho_bruto)
+            elif origem.lower().endswith('.wav'):
+                self._decodificar_wav(origem, caminho_bruto)
+            else:
+                raise RuntimeError("ffmpeg não disponível para decodificar áudio comprimido")
+            
+            bytes_por_quadro = 4 * self.canais
+            quadros = os.path.getsize(caminho_bruto) // bytes_por_quadro
+            
+            # Cabeçalho .npy + dados copiados em blocos
+            temporario = f"{destino}.tmp"
+            with open(temporario, 'wb') as f, open(caminho_bruto, 'rb') as bruto:
+                np.lib.format.write_array_header_1_0(f, {
+                    'descr': '<f4',
+                    'fortran_order': False,
+                    'shape': (quadros, self.canais),
+                })
+                shutil.copyfileobj(bruto, f, BLOCO_BYTES)
+            os.replace(temporario, destino)
+            
+        finally:
+            os.remove(caminho_bruto)
+        
+        salvar_json({
+            'origem': os.path.abspath(origem),
+            'taxa': self.taxa,
+            'canais': self.canais,
+            'amostras': quadros,
+            'duracao': quadros / self.taxa,
+        }, self._sidecar(destino), identado=False)
+    
+    def _decodificar_ffmpeg(self, origem: str, destino: str) -> None:
+        """
+        Decodifica com ffmpeg direto para float32 intercalado.
+        """
+        comando = [
+            'ffmpeg', '-y', '-hide_banner', '-loglevel', 'error',
+            '-i', origem,
+            '-f', 'f32le', '-acodec', 'pcm_f32le',
+            '-ac', str(self.canais), '-ar', str(self.taxa),
+            destino
+        ]
+        resultado = subprocess.run(comando, capture_output=True, text=True)
+        
+        if resultado.returncode != 0:
+            raise RuntimeError(f"ffmpeg: {resultado.stderr.strip()[-500:]}")
+    
+    def _decodificar_wav(self, origem: str, destino: str) -> None:
+        """
+        Decodifica WAV PCM 16 bits sem ffmpeg (com remix e reamostragem simples).
+        """
+        import wave
+        import numpy as np
+        
+        with wave.open(origem, 'rb') as w:
+            if w.getsampwidth() != 2:
+                raise RuntimeError("WAV sem ffmpeg: apenas PCM 16 bits")
+            canais, taxa = w.getnchannels(), w.getframerate()
+            dados = np.frombuffer(w.readframes(w.getnframes()), dtype='<i2')
+        
+        amostras = dados.reshape(-1, canais).astype(np.float32) / 32768.0
+        
+        if canais != self.canais:
+            mono = amostras.mean(axis=1, keepdims=True)
+            amostras = np.repeat(mono, self.canais, axis=1)
+        
+        if taxa != self.taxa:
+            n = int(round(len(amostras) * self.taxa / taxa))
+            posicoes = np.linspace(0, len(amostras) - 1, n)
+            amostras = np.stack(
+                [np.interp(posicoes, np.arange(len(amostras)), amostras[:, c]) for c in range(self.canais)],
+                axis=1
+            ).astype(np.float32)
+        
+        amostras.astype('<f4').tofile(destino)
+    
+    def _hash(self, caminho: str) -> str:
+        """
+        SHA-256 do arquivo, memoizado por (mtime, tamanho).
+        """
+        info = os.stat(caminho)
+        chave = (info.st_mtime, info.st_size)
+        
+        with self._lock:
+            memorizado = self._hashes.get(caminho)
+            if memorizado and memorizado[0] == chave:
+                self._hashes.move_to_end(caminho)
+                return memorizado[1]
+        
+        sha = hash_arquivo(caminho)
+        
+        with self._lock:
+            self._hashes[caminho] = (chave, sha)
+            while len(self._hashes) > MAX_HASHES:
+                self._hashes.popitem(last=False)
+        
+        return sha
+    
+    @staticmethod
+    def _sidecar(destino: str) -> str:
+        """
+        Caminho do JSON de metadados de um .npy.
+        """
+        return f"{os.path.splitext(destino)[0]}.json"
+
+
+def segmento_de_amostras(amostras, taxa: int):
+    """
+    Converte amostras float [n, canais] em AudioSegment (PCM 16 bits).
+    
+    Args:
+        amostras: Array float em [-1, 1]
+        taxa: Taxa de amostragem
+    
+    Returns:
+        AudioSegment do pydub
+    """
+    import numpy as np
+    from pydub import AudioSegment
+    
+    pcm16 = (np.clip(amostras, -1.0, 1.0) * 32767).astype('<i2')
+    
+    return AudioSegment(
+        data=pcm16.tobytes(),
+        sample_width=2,
+        frame_rate=taxa,
+        channels=amostras.shape[1]
+    )
+
+
+def salvar_wav(amostras, taxa: int, caminho: str) -> str:
+    """
+    Grava amostras float [n, canais] como WAV PCM 16 bits.
+    
+    Args:
+        amostras: Array float em [-1, 1]
+        taxa: Taxa de amostragem
+        caminho: Caminho do WAV
+    
+    Returns:
+        Caminho do WAV
+    """
+    import wave
+    import numpy as np
+    
+    pcm16 = (np.clip(amostras, -1.0, 1.0) * 32767).astype('<i2')
+    
+    temporario = f"{caminho}.tmp"
+    with wave.open(temporario, 'wb') as w:
+        w.setnchannels(amostras.shape[1])
+        w.setsampwidth(2)
+        w.setframerate(taxa)
+        w.writeframes(pcm16.tobytes())
+    os.replace(temporario, caminho)
+    
+    return caminho
+
+
+def exportar_audio(amostras, taxa: int, caminho: str) -> str:
+    """
+    Grava amostras float no formato indicado pela extensão do caminho.
+    
+    WAV é gravado direto; FLAC sem perdas e formatos de entrega (MP3, ...)
+    passam pelo pydub, estes com o bitrate de AUDIO_CONFIG.
+    
+    Args:
+        amostras: Array float [amostras, canais] em [-1, 1]
+        taxa: Taxa de amostragem
+        caminho: Caminho de saída (.wav, .flac, .mp3, ...)
+    
+    Returns:
+        Caminho gravado
+    """
+    formato = os.path.splitext(caminho)[1].lstrip('.').lower() or 'wav'
+    
+    if formato == 'wav':
+        return salvar_wav(amostras, taxa, caminho)
+    
+    parametros = {} if formato == 'flac' else {'bitrate': AUDIO_CONFIG.get('bitrate', '192k')}
+    segmento_de_amostras(amostras, taxa).export(caminho, format=formato, **parametros)
+    return caminho
+
+
+_cache_pcm: Optional[PCMCache] = None
+_cache_pcm_lock = threading.Lock()
+
+
+def obter_cache_pcm() -> PCMCache:
+    """
+    Instância compartilhada do cache (arquivos abertos são reaproveitados).
+    """
+    global _cache_pcm
+    
+    with _cache_pcm_lock:
+        if _cache_pcm is None:
+            _cache_pcm = PCMCache()
+        return _cache_pcm
+
+
+def exemplo_uso():
+    """
+    Exemplo de uso do cache PCM.
+    """
+    if len(sys.argv) < 2:
+        print("Uso: python pcm_cache.py audio.mp3 [audio2.mp3 ...]")
+        return
+    
+    cache = obter_cache_pcm()
+    
+    for caminho in sys.argv[1:]:
+        amostras, meta = cache.carregar(caminho)
+        print(f"   {caminho}: {meta['duracao']:.2f}s, {amostras.shape}, pico {abs(amostras).max():.3f}")
+    
+    # Segunda leitura não decodifica de novo
+    for caminho in sys.argv[1:]:
+        cache.carregar(caminho)
+    
+    print(f"📊 {cache.estatisticas()}")
+
+
+if __name__ == '__main__':
+    exemplo_uso()
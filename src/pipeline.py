@@ -8,26 +8,40 @@ Gerencia todo o fluxo desde geração do roteiro até o vídeo final.
 import os
 import time
 import json
+import uuid
+import threading
 from typing import Dict, List, Optional
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # Imports locais
 try:
     import sys
-    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
     
     from src.roteiro_generator import RoteiroGenerator
     from src.character_generator import CharacterGenerator
-    from src.audio_generator import AudioGenerator
+    from src.audio_generator import AudioGenerator, carregar_timing
+    from src.dialogo import MapaVozes
     from src.animation_generator import AnimationGenerator
     from src.lipsync_generator import LipsyncGenerator
     from src.video_editor import VideoEditor
+    from src.timeline import Timeline, chaves_numericas
+    from src.roteiro_schema import parse_duracao, reparar_roteiro
+    from src.post_render import executar_pos_render
+    from src.pcm_cache import obter_cache_pcm
+    from src.hedged_predictions import obter_hedger
+    from src.warmup import WarmupScheduler, ETAPAS_PIPELINE
     from src.utils import (
         criar_diretorios, salvar_checkpoint, carregar_checkpoint,
         limpar_memoria, calcular_custo_estimado, formatar_custo,
         formatar_duracao, validar_configuracao_projeto
     )
-    from config.settings import DIRS, OPTIMIZATION_CONFIG
+    from config.settings import (
+        DIRS, OPTIMIZATION_CONFIG, DEFAULT_PROJECT_CONFIG, get_render_profile
+    )
     
 except ImportError as e:
     print(f"⚠️ Erro nos imports: {e}")
@@ -53,6 +67,8 @@ class VideoAutomationPipeline:
                 - idioma: Código do idioma
                 - api_keys: Dict com API keys
                 - output_dir: Diretório de saída (opcional)
+                - perfil: 'final' ou 'rascunho' (opcional, ver RENDER_PROFILES)
+                - projeto_id: ID de um projeto existente para retomar (opcional)
         
         Example:
             >>> config = {
@@ -81,6 +97,8 @@ class VideoAutomationPipeline:
         self.tema = config['tema']
         self.duracao_minutos = config['duracao_minutos']
         self.idioma = config['idioma']
+        self.perfil = config.get('perfil', DEFAULT_PROJECT_CONFIG['perfil'])
+        self.perfil_cfg = get_render_profile(self.perfil)
         
         # API Keys
         api_keys = config.get('api_keys', {})
@@ -106,10 +124,15 @@ class VideoAutomationPipeline:
         self.videos_animados = {}
         self.videos_lipsync = {}
         self.video_final = None
+        self.timeline = None
+        self.metadados = None
+        self.hedger = None
         
-        # Timestamp
+        # Timestamp (o sufixo aleatório separa projetos iniciados no mesmo segundo)
         self.timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        self.projeto_id = f"{self.nicho}_{self.timestamp}"
+        self.projeto_id = config.get('projeto_id') or f"{self.nicho}_{self.timestamp}_{uuid.uuid4().hex[:8]}"
+        if self.perfil != 'final' and not config.get('projeto_id'):
+            self.projeto_id = f"{self.projeto_id}_{self.perfil}"
         
         print(f"\n📋 CONFIGURAÇÃO:")
         print(f"   Projeto ID: {self.projeto_id}")
@@ -117,11 +140,23 @@ class VideoAutomationPipeline:
         print(f"   Tema: {self.tema}")
         print(f"   Duração: {self.duracao_minutos} minutos")
         print(f"   Idioma: {self.idioma}")
+        print(f"   Perfil: {self.perfil}")
         print(f"   Output: {self.output_dir}")
         
         # Calcular custos estimados
         self._estimar_custos()
     
+    @property
+    def dir_trabalho(self) -> str:
+        """
+        Diretório dos arquivos por cena deste projeto.
+        
+        Os geradores são compartilhados entre projetos (obter_gerador); com
+        um diretório por projeto, execuções simultâneas (lotes, daemon) e
+        retomadas não sobrescrevem os arquivos umas das outras.
+        """
+        return os.path.join(self.temp_dir, self.projeto_id)
+    
     def _estimar_custos(self):
         """
         Calcula e exibe custos estimados do projeto.
@@ -166,9 +201,19 @@ class VideoAutomationPipeline:
         
         pular = pular_etapas or []
         
+        # Aquecer os modelos das próximas etapas enquanto a atual executa
+        etapas_ativas = [e for e in ETAPAS_PIPELINE if e not in pular]
+        if not (self.perfil_cfg.get('aplicar_lipsync', True) and self.config.get('aplicar_lipsync', True)):
+            etapas_ativas = [e for e in etapas_ativas if e != 'lipsync']
+        warmup = WarmupScheduler(etapas_ativas=etapas_ativas)
+        
+        # Orçamento e estatísticas de hedge desta execução
+        self.hedger = obter_hedger().nova_execucao()
+        
         try:
             # Etapa 1: Roteiro
             if 'roteiro' not in pular:
+                warmup.etapa_iniciada('roteiro')
                 print("\n" + "-" * 70)
                 print("[1/6] 📝 GERAÇÃO DE ROTEIRO")
                 print("-" * 70)
@@ -177,6 +222,14 @@ class VideoAutomationPipeline:
             else:
                 print("\n⏭️ Pulando etapa: Roteiro")
                 self.roteiro = self._carregar_checkpoint_etapa('roteiro')
+                
+                # Roteiro do checkpoint pode ter sido editado à mão
+                if self.roteiro:
+                    self.roteiro, quebradas, correcoes = reparar_roteiro(self.roteiro)
+                    for correcao in correcoes:
+                        print(f"   🔧 {correcao}")
+                    if quebradas:
+                        print(f"⚠️ Cenas sem narrativa no roteiro: {quebradas}")
             
             if not self.roteiro:
                 raise Exception("Falha na geração do roteiro")
@@ -185,6 +238,7 @@ class VideoAutomationPipeline:
             
             # Etapa 2: Personagens
             if 'personagens' not in pular:
+                warmup.etapa_iniciada('personagens')
                 print("\n" + "-" * 70)
                 print("[2/6] 👤 CRIAÇÃO DE PERSONAGENS")
                 print("-" * 70)
@@ -198,6 +252,7 @@ class VideoAutomationPipeline:
             
             # Etapa 3: Áudios
             if 'audios' not in pular:
+                warmup.etapa_iniciada('audios')
                 print("\n" + "-" * 70)
                 print("[3/6] 🎵 GERAÇÃO DE ÁUDIOS")
                 print("-" * 70)
@@ -211,6 +266,7 @@ class VideoAutomationPipeline:
             
             # Etapa 4: Animações
             if 'animacoes' not in pular:
+                warmup.etapa_iniciada('animacoes')
                 print("\n" + "-" * 70)
                 print("[4/6] 🎬 ANIMAÇÃO DE CENAS")
                 print("-" * 70)
@@ -224,6 +280,7 @@ class VideoAutomationPipeline:
             
             # Etapa 5: Lip-sync
             if 'lipsync' not in pular:
+                warmup.etapa_iniciada('lipsync')
                 print("\n" + "-" * 70)
                 print("[5/6] 💋 APLICAÇÃO DE LIP-SYNC")
                 print("-" * 70)
@@ -237,6 +294,7 @@ class VideoAutomationPipeline:
             
             # Etapa 6: Edição Final
             if 'edicao' not in pular:
+                warmup.etapa_iniciada('edicao')
                 print("\n" + "-" * 70)
                 print("[6/6] ✂️ EDIÇÃO FINAL DO VÍDEO")
                 print("-" * 70)
@@ -261,6 +319,11 @@ class VideoAutomationPipeline:
                 tamanho = get_tamanho_arquivo_mb(self.video_final)
                 print(f"   Tamanho: {tamanho:.2f} MB")
             
+            hedge = self.hedger.relatorio()
+            if hedge['hedges_disparados']:
+                print(f"   Hedges: {hedge['hedges_disparados']}/{hedge['predicoes']} predições "
+                      f"({hedge['hedges_vencedores']} venceram, +${hedge['custo_extra_usd']:.2f})")
+            
             print("\n🎉 Seu vídeo está pronto para upload no YouTube!")
             
             return self.video_final
@@ -269,12 +332,15 @@ class VideoAutomationPipeline:
             print(f"\n❌ ERRO NO PIPELINE: {e}")
             print("💾 Checkpoint salvo - você pode retomar depois")
             raise
+            
+        finally:
+            warmup.encerrar()
     
     def gerar_roteiro(self) -> Dict:
         """
         Etapa 1: Gera o roteiro do vídeo.
         """
-        generator = RoteiroGenerator(api_key=self.openai_key)
+        generator = obter_gerador(RoteiroGenerator, api_key=self.openai_key)
         
         roteiro = generator.gerar_roteiro(
             tema=self.tema,
@@ -298,9 +364,12 @@ class VideoAutomationPipeline:
         if not self.roteiro:
             raise Exception("Roteiro não disponível")
         
-        generator = CharacterGenerator(api_token=self.replicate_token)
+        generator = obter_gerador(CharacterGenerator, api_token=self.replicate_token, perfil=self.perfil)
         
-        personagens = generator.criar_personagem_de_roteiro(self.roteiro)
+        personagens = generator.criar_personagem_de_roteiro(
+            self.roteiro,
+            diretorio=os.path.join(self.dir_trabalho, 'personagens')
+        )
         
         # Salvar catálogo
         catalogo_path = os.path.join(self.temp_dir, f"{self.projeto_id}_personagens.json")
@@ -317,11 +386,16 @@ class VideoAutomationPipeline:
         if not self.roteiro:
             raise Exception("Roteiro não disponível")
         
-        generator = AudioGenerator(api_key=self.elevenlabs_key)
+        generator = obter_gerador(AudioGenerator, api_key=self.elevenlabs_key, perfil=self.perfil)
+        
+        # Vozes dos personagens estáveis no projeto (ou em toda a série)
+        mapa_vozes = MapaVozes(self.config.get('serie') or self.projeto_id)
         
         audios = generator.gerar_audio_cenas(
             roteiro=self.roteiro,
-            idioma=self.idioma
+            idioma=self.idioma,
+            mapa_vozes=mapa_vozes,
+            diretorio=os.path.join(self.dir_trabalho, 'audios')
         )
         
         # Salvar catálogo
@@ -343,20 +417,20 @@ class VideoAutomationPipeline:
             # Retornar dicionário vazio para permitir continuação do pipeline
             return {}
         
-        generator = AnimationGenerator(api_token=self.replicate_token)
+        generator = obter_gerador(AnimationGenerator, api_token=self.replicate_token, perfil=self.perfil)
         
         # Mapear cenas para personagens
         cenas_imagens = self._mapear_cenas_personagens()
         
-        # Extrair durações do roteiro
-        duracoes = {}
-        for cena in self.roteiro.get('cenas', []):
-            num = cena['numero']
-            dur_str = cena.get('duracao', '10s')
-            duracao = int(dur_str.replace('s', ''))
-            duracoes[num] = duracao
+        # Durações medidas nas narrações (roteiro só para cenas sem áudio)
+        duracoes = self._duracoes_cenas()
         
-        videos = generator.animar_cenas(cenas_imagens, duracoes)
+        videos = generator.animar_cenas(
+            cenas_imagens,
+            duracoes,
+            hedger=self.hedger,
+            diretorio=os.path.join(self.dir_trabalho, 'animacoes')
+        )
         
         # Salvar catálogo
         catalogo_path = os.path.join(self.temp_dir, f"{self.projeto_id}_videos.json")
@@ -374,12 +448,18 @@ class VideoAutomationPipeline:
             print("⚠️ Vídeos ou áudios não disponíveis, pulando lip-sync")
             return self.videos_animados
         
-        generator = LipsyncGenerator(api_token=self.replicate_token)
+        if not (self.perfil_cfg.get('aplicar_lipsync', True) and self.config.get('aplicar_lipsync', True)):
+            print(f"⏭️ Lip-sync desativado (perfil: {self.perfil})")
+            return self.videos_animados
+        
+        generator = obter_gerador(LipsyncGenerator, api_token=self.replicate_token)
         
         videos_synced = generator.aplicar_lipsync_cenas(
             cenas_videos=self.videos_animados,
             cenas_audios=self.audios,
-            apenas_dialogos=True
+            apenas_dialogos=True,
+            hedger=self.hedger,
+            diretorio=os.path.join(self.dir_trabalho, 'lipsync')
         )
         
         # Salvar catálogo
@@ -397,19 +477,138 @@ class VideoAutomationPipeline:
         if not self.videos_lipsync:
             raise Exception("Vídeos não disponíveis")
         
-        editor = VideoEditor(output_dir=self.output_dir)
+        editor = obter_gerador(VideoEditor, output_dir=self.output_dir, perfil=self.perfil)
         
         nome_saida = f"{self.projeto_id}_final.mp4"
         
-        video_final = editor.montar_video_final(
-            cenas_videos=self.videos_lipsync,
-            cenas_audios=self.audios,
-            nome_saida=nome_saida,
-            transicao="fade"
-        )
+        # Legendas automáticas a partir do timing salvo junto dos áudios
+        timings = None
+        if self.config.get('gerar_legendas', DEFAULT_PROJECT_CONFIG['gerar_legendas']):
+            timings = {}
+            for num_cena, audio_path in (self.audios or {}).items():
+                timing = carregar_timing(audio_path)
+                if timing:
+                    timings[int(num_cena)] = timing
+            print(f"📝 Legendas automáticas: {len(timings)} cenas com timing")
+        
+        # Uma linha do tempo para vídeo, áudio, legendas e capítulos
+        self.timeline = self._montar_timeline(editor.fps)
+        
+        # Capítulos, thumbnails e metadados em paralelo com o encode final
+        def gerar_titulos():
+            roteirista = obter_gerador(RoteiroGenerator, api_key=self.openai_key)
+            return roteirista.gerar_titulo_alternativo(self.tema, self.idioma)
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pos_render = executor.submit(
+                executar_pos_render,
+                self.timeline,
+                self.roteiro or {},
+                os.path.join(self.output_dir, nome_saida),
+                gerar_titulos
+            )
+            
+            video_final = editor.montar_video_final(
+                cenas_videos=self.videos_lipsync,
+                cenas_audios=self.audios,
+                nome_saida=nome_saida,
+                transicao="fade",
+                timings_cenas=timings,
+                timeline=self.timeline
+            )
+            
+            self.metadados = pos_render.result()
         
         return video_final
     
+    def promover_para_final(self) -> Optional[str]:
+        """
+        Promove um projeto em rascunho para a renderização final.
+        
+        Reaproveita tudo que não depende de resolução (roteiro, áudios e
+        timings salvos junto dos áudios) e refaz apenas personagens,
+        animações, lip-sync e edição no perfil final.
+        
+        Returns:
+            Caminho do vídeo final ou None
+        
+        Example:
+            >>> pipeline = VideoAutomationPipeline({**config, 'perfil': 'rascunho'})
+            >>> pipeline.executar_completo()  # revisão rápida
+            >>> pipeline.promover_para_final()
+        """
+        if self.perfil == 'final':
+            print("⚠️ Projeto já está no perfil final")
+            return self.video_final
+        
+        if not self.roteiro:
+            checkpoint = carregar_checkpoint(f"pipeline_{self.projeto_id}", self.checkpoint_dir) or {}
+            self.roteiro = checkpoint.get('roteiro')
+            self.audios = chaves_numericas(checkpoint.get('audios'))
+        
+        if not self.roteiro:
+            raise Exception("Roteiro do rascunho não disponível")
+        
+        print(f"\n⬆️ Promovendo {self.projeto_id} para final...")
+        
+        # Novo projeto final semeado com as etapas reaproveitadas
+        sufixo = f"_{self.perfil}"
+        base_id = self.projeto_id[:-len(sufixo)] if self.projeto_id.endswith(sufixo) else self.projeto_id
+        self.projeto_id = f"{base_id}_final"
+        self.perfil = 'final'
+        self.perfil_cfg = get_render_profile('final')
+        self.config = {**self.config, 'perfil': 'final', 'projeto_id': self.projeto_id}
+        
+        self.personagens = {}
+        self.videos_animados = {}
+        self.videos_lipsync = {}
+        self.video_final = None
+        
+        self._salvar_checkpoint('audios')
+        
+        return self.executar_completo(pular_etapas=['roteiro', 'audios'])
+    
+    def _duracoes_cenas(self) -> Dict[int, float]:
+        """
+        Duração de cada cena em segundos.
+        
+        Cenas com narração usam a duração real do áudio (já aparado); as
+        demais, a duração prevista no roteiro.
+        """
+        duracoes = {}
+        for cena in (self.roteiro or {}).get('cenas', []):
+            duracoes[cena['numero']] = parse_duracao(cena.get('duracao')) or 10.0
+        
+        cache = obter_cache_pcm()
+        for num_cena, audio_path in (self.audios or {}).items():
+            try:
+                duracoes[int(num_cena)] = round(cache.duracao(audio_path), 3)
+            except Exception as e:
+                print(f"⚠️ Duração do áudio da cena {num_cena} indisponível: {e}")
+        
+        return duracoes
+    
+    def _montar_timeline(self, fps: float) -> Timeline:
+        """
+        Linha do tempo do vídeo final a partir do roteiro, vídeos e áudios.
+        
+        Entram as cenas com vídeo ou áudio, na duração medida (ver
+        _duracoes_cenas) e com o título do roteiro (capítulos).
+        """
+        videos = {int(num): video for num, video in (self.videos_lipsync or {}).items() if os.path.exists(video)}
+        audios = {int(num): audio for num, audio in (self.audios or {}).items()}
+        
+        duracoes = {
+            num: duracao for num, duracao in self._duracoes_cenas().items()
+            if num in videos or num in audios
+        }
+        titulos = {
+            cena['numero']: cena.get('titulo')
+            for cena in (self.roteiro or {}).get('cenas', [])
+        }
+        
+        return Timeline.montar(duracoes, videos=videos, audios=audios, titulos=titulos, fps=fps)
+    
     def _mapear_cenas_personagens(self) -> Dict[int, str]:
         """
         Mapeia cenas para imagens de personagens.
@@ -456,10 +655,91 @@ class VideoAutomationPipeline:
         """
         checkpoint = carregar_checkpoint(f"pipeline_{self.projeto_id}", self.checkpoint_dir)
         
-        if checkpoint:
-            return checkpoint.get(etapa)
+        if not checkpoint:
+            return None
         
+        # JSON grava as chaves numéricas como str ("1"); as etapas usam int
+        if etapa in ETAPAS_POR_CENA and checkpoint.get(etapa) is not None:
+            return chaves_numericas(checkpoint[etapa])
+        
+        return checkpoint.get(etapa)
+
+
+# Etapa do pipeline correspondente a cada chave salva em checkpoint
+ETAPAS_CHECKPOINT = {
+    'roteiro': 'roteiro',
+    'personagens': 'personagens',
+    'audios': 'audios',
+    'videos_animados': 'animacoes',
+    'videos_lipsync': 'lipsync',
+    'video_final': 'edicao',
+}
+
+# Etapas salvas como dict número da cena -> caminho
+ETAPAS_POR_CENA = ('audios', 'videos_animados', 'videos_lipsync')
+
+# Geradores residentes: (classe, argumentos) -> instância
+_geradores: Dict[tuple, object] = {}
+_geradores_lock = threading.Lock()
+
+
+def obter_gerador(classe, **kwargs):
+    """
+    Instância compartilhada de um gerador por (classe, argumentos).
+    
+    Mantém clientes de SDK e seus pools de conexão entre projetos do mesmo
+    processo (lotes e modo daemon) em vez de recriá-los a cada etapa.
+    
+    Args:
+        classe: Classe do gerador (RoteiroGenerator, AudioGenerator, ...)
+        **kwargs: Argumentos do construtor
+    
+    Returns:
+        Instância do gerador
+    """
+    chave = (classe, tuple(sorted(kwargs.items())))
+    
+    with _geradores_lock:
+        if chave not in _geradores:
+            _geradores[chave] = classe(**kwargs)
+        return _geradores[chave]
+
+
+def retomar_projeto(projeto_id: str, api_keys: Optional[Dict] = None) -> Optional[str]:
+    """
+    Retoma um projeto a partir do último checkpoint salvo.
+    
+    As etapas já concluídas são carregadas do checkpoint e as restantes
+    executadas normalmente.
+    
+    Args:
+        projeto_id: ID do projeto (ver VideoAutomationPipeline.projeto_id)
+        api_keys: API keys (padrão: as do checkpoint ou variáveis de ambiente)
+    
+    Returns:
+        Caminho do vídeo final ou None
+    
+    Example:
+        >>> retomar_projeto('historias_infantis_20240101_120000')
+    """
+    checkpoint = carregar_checkpoint(f"pipeline_{projeto_id}", DIRS['checkpoints'])
+    if not checkpoint:
+        print(f"❌ Checkpoint não encontrado: {projeto_id}")
         return None
+    
+    config = {**checkpoint['config'], 'projeto_id': projeto_id}
+    if api_keys:
+        config['api_keys'] = api_keys
+    
+    # Pular tudo até a última etapa salva (inclusive)
+    etapas = list(ETAPAS_PIPELINE)
+    ultima = ETAPAS_CHECKPOINT.get(checkpoint.get('etapa'))
+    pular = etapas[:etapas.index(ultima) + 1] if ultima else []
+    
+    print(f"🔁 Retomando {projeto_id} após a etapa: {ultima or '-'}")
+    
+    pipeline = VideoAutomationPipeline(config)
+    return pipeline.executar_completo(pular_etapas=pular)
 
 
 def exemplo_uso():
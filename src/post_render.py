@@ -0,0 +1,365 @@
+"""
+📦 POST RENDER - ProjetoX
+
+Etapa de pós-renderização executada em paralelo com o encode final.
+
+A partir da linha do tempo (src/timeline.py), do roteiro e dos vídeos das
+cenas gera os capítulos do YouTube, as thumbnails candidatas (quadros
+pontuados por nitidez e cor com NumPy) e o JSON de metadados para upload,
+sem decodificar o vídeo final.
+"""
+
+import os
+import time
+from typing import Callable, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+# Imports locais
+try:
+    import sys
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import POST_RENDER_CONFIG
+    from src.utils import salvar_json
+    from src.timeline import Timeline
+except ImportError:
+    print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
+
+
+def formatar_timestamp(segundos: float) -> str:
+    """
+    Timestamp no formato dos capítulos do YouTube.
+    
+    Args:
+        segundos: Posição no vídeo
+    
+    Returns:
+        'M:SS' ou 'H:MM:SS'
+    
+    Example:
+        >>> formatar_timestamp(754.2)
+        '12:34'
+    """
+    total = int(segundos)
+    horas, resto = divmod(total, 3600)
+    minutos, segs = divmod(resto, 60)
+    
+    if horas:
+        return f"{horas}:{minutos:02d}:{segs:02d}"
+    return f"{minutos}:{segs:02d}"
+
+
+def gerar_capitulos(
+    timeline: Timeline,
+    duracao_minima: Optional[float] = None,
+    minimo_capitulos: Optional[int] = None
+) -> List[Dict]:
+    """
+    Capítulos do YouTube a partir dos títulos das cenas.
+    
+    O primeiro capítulo começa em 0:00 e cenas que formariam um capítulo
+    menor que duracao_minima são incorporadas ao anterior.
+    
+    Args:
+        timeline: Linha do tempo do vídeo
+        duracao_minima: Duração mínima de cada capítulo (segundos)
+        minimo_capitulos: Abaixo disso retorna lista vazia (o YouTube não exibe)
+    
+    Returns:
+        Lista de dicts com 'inicio', 'timestamp' e 'titulo'
+    """
+    duracao_minima = POST_RENDER_CONFIG.get('duracao_minima_capitulo', 10) if duracao_minima is None else duracao_minima
+    minimo_capitulos = POST_RENDER_CONFIG.get('minimo_capitulos', 3) if minimo_capitulos is None else minimo_capitulos
+    
+    entradas = timeline.capitulos()
+    fins = [entrada['inicio'] for entrada in entradas[1:]] + [timeline.duracao]
+    
+    capitulos = []
+    for entrada, fim in zip(entradas, fins):
+        if not capitulos:
+            capitulos.append({'inicio': 0.0, 'titulo': entrada['titulo']})
+        elif entrada['inicio'] - capitulos[-1]['inicio'] < duracao_minima:
+            continue  # o capítulo anterior ainda é curto: absorve esta cena
+        elif fim - entrada['inicio'] < duracao_minima:
+            continue  # cena curta: fica no capítulo anterior
+        else:
+            capitulos.append(dict(entrada))
+    
+    if len(capitulos) < minimo_capitulos:
+        return []
+    
+    for capitulo in capitulos:
+        capitulo['timestamp'] = formatar_timestamp(capitulo['inicio'])
+    
+    return capitulos
+
+
+def pontuar_quadro(quadro) -> Dict:
+    """
+    Nitidez, colorido e brilho de um quadro RGB.
+    
+    Nitidez é a variância do laplaciano em tons de cinza; colorido é a
+    métrica de Hasler e Süsstrunk sobre os eixos oponentes rg e yb.
+    
+    Args:
+        quadro: Array uint8 [altura, largura, 3]
+    
+    Returns:
+        Dict com 'nitidez', 'colorido' e 'brilho' (0 a 1)
+    """
+    import numpy as np
+    
+    rgb = quadro[..., :3].astype(np.float32)
+    cinza = rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    
+    laplaciano = (
+        cinza[:-2, 1:-1] + cinza[2:, 1:-1] + cinza[1:-1, :-2] + cinza[1:-1, 2:]
+        - 4 * cinza[1:-1, 1:-1]
+    )
+    
+    rg = rgb[..., 0] - rgb[..., 1]
+    yb = 0.5 * (rgb[..., 0] + rgb[..., 1]) - rgb[..., 2]
+    colorido = np.hypot(rg.std(), yb.std()) + 0.3 * np.hypot(rg.mean(), yb.mean())
+    
+    return {
+        'nitidez': float(laplaciano.var()),
+        'colorido': float(colorido),
+        'brilho': float(cinza.mean() / 255),
+    }
+
+
+def escolher_thumbnails(
+    timeline: Timeline,
+    diretorio_saida: str,
+    prefixo: str,
+    quantidade: Optional[int] = None,
+    quadros_por_cena: Optional[int] = None
+) -> List[Dict]:
+    """
+    Amostra quadros dos vídeos das cenas e salva os melhores como thumbnails.
+    
+    Os quadros vêm dos arquivos das cenas (já decodificáveis antes do fim do
+    encode) e são analisados em resolução reduzida; só as escolhidas são
+    gravadas em resolução de thumbnail.
+    
+    Args:
+        timeline: Linha do tempo do vídeo
+        diretorio_saida: Diretório das thumbnails
+        prefixo: Prefixo dos arquivos (ex: id do projeto)
+        quantidade: Thumbnails a salvar (no máximo uma por cena)
+        quadros_por_cena: Quadros amostrados por cena
+    
+    Returns:
+        Lista de dicts com 'caminho', 'cena', 'tempo' (no vídeo final) e as
+        métricas, da melhor para a pior
+    """
+    import numpy as np
+    from PIL import Image
+    from moviepy.editor import VideoFileClip
+    
+    quantidade = quantidade or POST_RENDER_CONFIG.get('num_thumbnails', 3)
+    quadros_por_cena = quadros_por_cena or POST_RENDER_CONFIG.get('quadros_por_cena', 3)
+    largura_analise = POST_RENDER_CONFIG.get('largura_analise', 320)
+    
+    candidatos = []
+    
+    for cena in timeline.cenas:
+        if not cena.video or not os.path.exists(cena.video):
+            continue
+        
+        duracao_cena = timeline.segundos(cena.quadros)
+        
+        try:
+            with VideoFileClip(cena.video, audio=False) as clip:
+                for i in range(quadros_por_cena):
+                    # Posições internas da cena, longe das transições
+                    tempo_cena = duracao_cena * (i + 1) / (quadros_por_cena + 1)
+                    tempo_clip = tempo_cena % clip.duration if clip.duration else 0.0
+                    
+                    quadro = clip.get_frame(tempo_clip)
+                    passo = max(1, quadro.shape[1] // largura_analise)
+                    
+                    candidatos.append({
+                        'cena': cena.numero,
+                        'video': cena.video,
+                        'tempo_clip': tempo_clip,
+                        'tempo': round(timeline.segundos(cena.inicio) + tempo_cena, 3),
+                        **pontuar_quadro(quadro[::passo, ::passo]),
+                    })
+        except Exception as e:
+            print(f"   ⚠️ Não foi possível amostrar a cena {cena.numero}: {e}")
+    
+    if not candidatos:
+        return []
+    
+    # Métricas normalizadas pelo máximo; quadros escuros ou estourados perdem pontos
+    max_nitidez = max(c['nitidez'] for c in candidatos) or 1.0
+    max_colorido = max(c['colorido'] for c in candidatos) or 1.0
+    for c in candidatos:
+        exposicao = 1.0 - min(1.0, abs(c['brilho'] - 0.5) * 2)
+        c['pontuacao'] = round(
+            0.5 * c['nitidez'] / max_nitidez + 0.35 * c['colorido'] / max_colorido + 0.15 * exposicao, 4
+        )
+    
+    escolhidos = []
+    cenas_usadas = set()
+    for c in sorted(candidatos, key=lambda c: c['pontuacao'], reverse=True):
+        if c['cena'] in cenas_usadas:
+            continue
+        cenas_usadas.add(c['cena'])
+        escolhidos.append(c)
+        if len(escolhidos) >= quantidade:
+            break
+    
+    resolucao = tuple(POST_RENDER_CONFIG.get('resolucao_thumbnail', (1280, 720)))
+    
+    for posicao, c in enumerate(escolhidos, start=1):
+        with VideoFileClip(c['video'], audio=False) as clip:
+            quadro = clip.get_frame(c['tempo_clip'])
+        
+        caminho = os.path.join(diretorio_saida, f"{prefixo}_thumb_{posicao}.jpg")
+        imagem = Image.fromarray(np.asarray(quadro, dtype=np.uint8)).resize(resolucao, Image.Resampling.LANCZOS)
+        imagem.save(caminho, quality=92)
+        
+        c['caminho'] = caminho
+        del c['video'], c['tempo_clip']
+    
+    return escolhidos
+
+
+def gerar_metadados(
+    roteiro: Dict,
+    capitulos: List[Dict],
+    thumbnails: List[Dict],
+    titulos_alternativos: Optional[List[str]] = None,
+    duracao: float = 0.0
+) -> Dict:
+    """
+    Metadados de upload: títulos, descrição com capítulos e tags.
+    
+    Args:
+        roteiro: Roteiro do vídeo
+        capitulos: Capítulos (ver gerar_capitulos)
+        thumbnails: Thumbnails (ver escolher_thumbnails)
+        titulos_alternativos: Títulos extras (ver RoteiroGenerator.gerar_titulo_alternativo)
+        duracao: Duração do vídeo (segundos)
+    
+    Returns:
+        Dict pronto para salvar em JSON
+    """
+    seo = roteiro.get('seo') or {}
+    
+    titulos = [roteiro.get('titulo'), seo.get('titulo_alternativo')] + list(titulos_alternativos or [])
+    titulos = [t for i, t in enumerate(titulos) if t and t not in titulos[:i]]
+    
+    tags = []
+    for tag in list(roteiro.get('tags') or []) + list(seo.get('palavras_chave') or []):
+        if tag.lower() not in (t.lower() for t in tags):
+            tags.append(tag)
+    
+    descricao = roteiro.get('descricao', '')
+    if capitulos:
+        descricao += '\n\n' + '\n'.join(f"{c['timestamp']} {c['titulo']}" for c in capitulos)
+    
+    return {
+        'titulo': titulos[0] if titulos else '',
+        'titulos_alternativos': titulos[1:],
+        'descricao': descricao.strip(),
+        'tags': tags,
+        'categoria': seo.get('categoria'),
+        'idioma': roteiro.get('idioma'),
+        'duracao': round(duracao, 3),
+        'capitulos': capitulos,
+        'thumbnails': thumbnails,
+        'thumbnail_sugestao': roteiro.get('thumbnail_sugestao'),
+        'gerado_em': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+
+def executar_pos_render(
+    timeline: Timeline,
+    roteiro: Dict,
+    caminho_video: str,
+    gerar_titulos: Optional[Callable[[], List[str]]] = None
+) -> Optional[Dict]:
+    """
+    Capítulos, thumbnails e metadados de um vídeo.
+    
+    Pensado para rodar em paralelo com o encode do vídeo final: só usa a
+    linha do tempo, o roteiro e os vídeos das cenas. Os títulos alternativos
+    (chamada remota) são pedidos enquanto os quadros são analisados.
+    
+    Args:
+        timeline: Linha do tempo do vídeo
+        roteiro: Roteiro do vídeo
+        caminho_video: Caminho do vídeo final (define nomes e diretório)
+        gerar_titulos: Função que retorna títulos alternativos (opcional)
+    
+    Returns:
+        Metadados (também salvos em <video>.metadados.json) ou None
+    
+    Example:
+        >>> with ThreadPoolExecutor(max_workers=1) as executor:
+        ...     pos = executor.submit(executar_pos_render, timeline, roteiro, caminho)
+        ...     editor.montar_video_final(..., timeline=timeline)
+        ...     metadados = pos.result()
+    """
+    print(f"📦 Pós-renderização: capítulos, thumbnails e metadados...")
+    
+    try:
+        base = os.path.splitext(caminho_video)[0]
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            titulos = executor.submit(gerar_titulos) if gerar_titulos else None
+            
+            capitulos = gerar_capitulos(timeline)
+            thumbnails = escolher_thumbnails(
+                timeline,
+                diretorio_saida=os.path.dirname(caminho_video) or '.',
+                prefixo=os.path.basename(base)
+            )
+            
+            try:
+                titulos_alternativos = titulos.result() if titulos else []
+            except Exception as e:
+                print(f"   ⚠️ Títulos alternativos indisponíveis: {e}")
+                titulos_alternativos = []
+        
+        metadados = gerar_metadados(roteiro, capitulos, thumbnails, titulos_alternativos, timeline.duracao)
+        
+        caminho_metadados = f"{base}.metadados.json"
+        salvar_json(metadados, caminho_metadados)
+        
+        print(f"✅ Pós-renderização concluída: {caminho_metadados}")
+        print(f"   {len(capitulos)} capítulos, {len(thumbnails)} thumbnails, {len(metadados['tags'])} tags")
+        
+        return metadados
+        
+    except Exception as e:
+        print(f"❌ Erro na pós-renderização: {e}")
+        return None
+
+
+def exemplo_uso():
+    """
+    Exemplo de uso: capítulos e metadados de uma linha do tempo salva.
+    """
+    if len(sys.argv) < 2:
+        print("Uso: python post_render.py video.timeline.json [roteiro.json]")
+        return
+    
+    from src.utils import carregar_json
+    
+    timeline = Timeline.carregar(sys.argv[1])
+    roteiro = carregar_json(sys.argv[2]) if len(sys.argv) > 2 else {}
+    
+    for capitulo in gerar_capitulos(timeline):
+        print(f"   {capitulo['timestamp']} {capitulo['titulo']}")
+    
+    caminho_video = sys.argv[1].replace('.timeline.json', '.mp4')
+    executar_pos_render(timeline, roteiro, caminho_video)
+
+
+if __name__ == '__main__':
+    exemplo_uso()
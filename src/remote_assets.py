@@ -0,0 +1,232 @@
+"""
+☁️ REMOTE ASSETS - ProjetoX
+
+Cache persistente de uploads para a Replicate.
+
+Cada arquivo local é enviado uma única vez (chave: SHA-256 do conteúdo);
+a URL retornada fica registrada com sua expiração e é reaproveitada por
+todas as predições seguintes. Um personagem presente em 20 cenas gera
+1 upload em vez de 20.
+"""
+
+import os
+import time
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+# Imports locais
+try:
+    import sys
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import DIRS, AI_CONFIG
+    from src.utils import criar_diretorios, salvar_json, carregar_json, hash_arquivo
+except ImportError:
+    print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
+
+
+# Endpoint de arquivos da API Replicate
+REPLICATE_FILES_URL = 'https://api.replicate.com/v1/files'
+
+# Validade assumida quando a API não informa a expiração (horas)
+VALIDADE_PADRAO_HORAS = 24
+
+# Margem de segurança antes da expiração (segundos): uma predição longa
+# não pode receber uma URL prestes a expirar
+MARGEM_EXPIRACAO = 3600
+
+
+class RemoteAssetCache:
+    """
+    Cache de arquivos enviados à Replicate, indexado pelo conteúdo.
+    
+    Example:
+        >>> cache = RemoteAssetCache()
+        >>> url = cache.url_para("personagem.webp")
+        >>> replicate.run(modelo, input={"image": url or open("personagem.webp", "rb")})
+    """
+    
+    def __init__(self, api_token: Optional[str] = None, caminho_indice: Optional[str] = None):
+        """
+        Inicializa o cache.
+        
+        Args:
+            api_token: Token Replicate (padrão: REPLICATE_API_TOKEN)
+            caminho_indice: Arquivo JSON do índice (padrão: DIRS['cache']/uploads_replicate.json)
+        """
+        self.api_token = api_token or os.environ.get('REPLICATE_API_TOKEN', '')
+        self.caminho_indice = caminho_indice or os.path.join(DIRS['cache'], 'uploads_replicate.json')
+        criar_diretorios([os.path.dirname(self.caminho_indice)])
+        
+        self._lock = threading.Lock()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._hashes: Dict[str, tuple] = {}
+        
+        self.entradas: Dict[str, Dict] = {}
+        if os.path.exists(self.caminho_indice):
+            self.entradas = (carregar_json(self.caminho_indice) or {}).get('arquivos', {})
+        
+        self.uploads = 0
+        self.reaproveitados = 0
+    
+    def url_para(self, caminho: str) -> Optional[str]:
+        """
+        URL remota de um arquivo local, enviando-o apenas se necessário.
+        
+        Args:
+            caminho: Caminho do arquivo local
+        
+        Returns:
+            URL utilizável como input de predição, ou None se o upload falhar
+        """
+        try:
+            sha = self._hash(caminho)
+        except OSError as e:
+            print(f"❌ Arquivo indisponível para upload: {e}")
+            return None
+        
+        with self._lock:
+            lock = self._locks.setdefault(sha, threading.Lock())
+        
+        # Uploads simultâneos do mesmo conteúdo esperam o primeiro terminar
+        with lock:
+            entrada = self.entradas.get(sha)
+            if entrada and entrada['expira_em'] - MARGEM_EXPIRACAO > time.time():
+                self.reaproveitados += 1
+                return entrada['url']
+            
+            entrada = self._enviar(caminho)
+            if not entrada:
+                return None
+            
+            with self._lock:
+                self.entradas[sha] = entrada
+                self._remover_expirados()
+                salvar_json({'arquivos': self.entradas}, self.caminho_indice, identado=False)
+            
+            self.uploads += 1
+            return entrada['url']
+    
+    def estatisticas(self) -> Dict:
+        """
+        Uploads realizados e reaproveitados nesta sessão.
+        """
+        return {
+            'uploads': self.uploads,
+            'reaproveitados': self.reaproveitados,
+            'em_cache': len(self.entradas),
+        }
+    
+    def _enviar(self, caminho: str) -> Optional[Dict]:
+        """
+        Envia o arquivo para a Replicate e retorna a entrada do índice.
+        """
+        import requests
+        
+        nome = os.path.basename(caminho)
+        print(f"☁️ Enviando {nome}...")
+        
+        try:
+            with open(caminho, 'rb') as f:
+                response = requests.post(
+                    REPLICATE_FILES_URL,
+                    headers={'Authorization': f"Bearer {self.api_token}"},
+                    files={'content': (nome, f, 'application/octet-stream')},
+                    timeout=AI_CONFIG.get('timeout', 300)
+                )
+            
+            if response.status_code not in (200, 201):
+                print(f"❌ Erro no upload: {response.status_code} - {response.text[:200]}")
+                return None
+            
+            dados = response.json()
+            url = dados.get('urls', {}).get('get')
+            if not url:
+                print("❌ Resposta de upload sem URL")
+                return None
+            
+            return {
+                'url': url,
+                'id': dados.get('id'),
+                'nome': nome,
+                'expira_em': self._expiracao(dados.get('expires_at')),
+            }
+            
+        except Exception as e:
+            print(f"❌ Erro no upload de {nome}: {e}")
+            return None
+    
+    def _hash(self, caminho: str) -> str:
+        """
+        SHA-256 do arquivo, memoizado por (caminho, mtime, tamanho).
+        """
+        info = os.stat(caminho)
+        chave = (info.st_mtime, info.st_size)
+        
+        memorizado = self._hashes.get(caminho)
+        if memorizado and memorizado[0] == chave:
+            return memorizado[1]
+        
+        sha = hash_arquivo(caminho)
+        self._hashes[caminho] = (chave, sha)
+        return sha
+    
+    @staticmethod
+    def _expiracao(expires_at: Optional[str]) -> float:
+        """
+        Converte a expiração ISO 8601 da API em timestamp.
+        """
+        if expires_at:
+            try:
+                return datetime.fromisoformat(expires_at.replace('Z', '+00:00')).timestamp()
+            except ValueError:
+                pass
+        return time.time() + VALIDADE_PADRAO_HORAS * 3600
+    
+    def _remover_expirados(self) -> None:
+        """
+        Remove do índice as URLs já expiradas.
+        """
+        agora = time.time()
+        self.entradas = {sha: e for sha, e in self.entradas.items() if e['expira_em'] > agora}
+
+
+_cache_global: Optional[RemoteAssetCache] = None
+_cache_global_lock = threading.Lock()
+
+
+def obter_cache_remoto() -> RemoteAssetCache:
+    """
+    Instância compartilhada do cache (um índice por processo).
+    
+    Returns:
+        RemoteAssetCache compartilhado entre os geradores
+    """
+    global _cache_global
+    
+    with _cache_global_lock:
+        if _cache_global is None:
+            _cache_global = RemoteAssetCache()
+        return _cache_global
+
+
+def exemplo_uso():
+    """
+    Exemplo de uso do cache de uploads.
+    """
+    if len(sys.argv) < 2:
+        print("Uso: python remote_assets.py arquivo [arquivo ...]")
+        return
+    
+    cache = obter_cache_remoto()
+    
+    for caminho in sys.argv[1:]:
+        print(f"   {caminho}: {cache.url_para(caminho)}")
+    
+    print(f"📊 {cache.estatisticas()}")
+
+
+if __name__ == '__main__':
+    exemplo_uso()
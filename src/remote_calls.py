@@ -0,0 +1,445 @@
+"""
+🔁 REMOTE CALLS - ProjetoX
+
+Camada compartilhada de chamadas remotas (Replicate, ElevenLabs, OpenAI).
+
+- Tentativas com backoff exponencial e jitter (AI_CONFIG['max_retries'],
+  AI_CONFIG['retry_delay']), respeitando o cabeçalho Retry-After
+- Circuit breaker por provedor: após falhas seguidas, as chamadas falham
+  imediatamente até o provedor voltar a responder
+- Controle de concorrência adaptativo (AIMD): o paralelismo sobe a cada
+  sucesso e cai pela metade a cada 429, acompanhando o limite real do
+  provedor em vez de um delay fixo
+"""
+
+import os
+import time
+import random
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+
+# Imports locais
+try:
+    import sys
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import AI_CONFIG, REMOTE_CALLS_CONFIG
+except ImportError:
+    print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
+
+
+# Status HTTP que justificam nova tentativa
+STATUS_TRANSITORIOS = {408, 409, 425, 429, 500, 502, 503, 504}
+
+# Trechos de mensagem que indicam limite de requisições
+SINAIS_THROTTLE = ('throttled', 'rate limit', 'too many requests', '429')
+
+
+class CircuitoAbertoError(Exception):
+    """
+    Chamada recusada porque o circuito do provedor está aberto.
+    """
+
+
+def status_do_erro(erro: Exception) -> Optional[int]:
+    """
+    Extrai o status HTTP de exceções das bibliotecas dos provedores.
+    
+    Args:
+        erro: Exceção levantada pela chamada
+    
+    Returns:
+        Status HTTP ou None
+    """
+    for atributo in ('status', 'status_code', 'http_status'):
+        valor = getattr(erro, atributo, None)
+        if isinstance(valor, int):
+            return valor
+    
+    response = getattr(erro, 'response', None)
+    valor = getattr(response, 'status_code', None)
+    if isinstance(valor, int):
+        return valor
+    
+    if any(sinal in str(erro).lower() for sinal in SINAIS_THROTTLE):
+        return 429
+    
+    return None
+
+
+def retry_after_do_erro(erro: Exception) -> Optional[float]:
+    """
+    Lê o Retry-After (em segundos) da resposta associada ao erro, se houver.
+    """
+    response = getattr(erro, 'response', None)
+    headers = getattr(response, 'headers', None) or getattr(erro, 'headers', None) or {}
+    
+    try:
+        valor = headers.get('Retry-After') or headers.get('retry-after')
+        return max(0.0, float(valor)) if valor is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def erro_transitorio(erro: Exception) -> bool:
+    """
+    Indica se vale a pena tentar novamente após o erro.
+    """
+    status = status_do_erro(erro)
+    if status is not None:
+        return status in STATUS_TRANSITORIOS
+    
+    if isinstance(erro, (ConnectionError, TimeoutError)):
+        return True
+    
+    # requests.ConnectionError/Timeout não herdam dos builtins
+    return type(erro).__name__ in ('ConnectionError', 'Timeout', 'ReadTimeout', 'ConnectTimeout')
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker simples: fechado -> aberto -> meio-aberto -> fechado.
+    """
+    
+    def __init__(self, nome: str, limite_falhas: int = 5, tempo_aberto: float = 60.0):
+        """
+        Args:
+            nome: Nome do provedor
+            limite_falhas: Falhas consecutivas para abrir o circuito
+            tempo_aberto: Segundos aberto antes de liberar uma chamada de teste
+        """
+        self.nome = nome
+        self.limite_falhas = limite_falhas
+        self.tempo_aberto = tempo_aberto
+        
+        self.estado = 'fechado'
+        self.falhas = 0
+        self.aberto_em = 0.0
+        self._lock = threading.Lock()
+    
+    def permitir(self) -> bool:
+        """
+        Indica se uma chamada pode ser feita agora.
+        """
+        with self._lock:
+            if self.estado == 'fechado':
+                return True
+            
+            if self.estado == 'aberto' and time.time() - self.aberto_em >= self.tempo_aberto:
+                # Uma única chamada de teste
+                self.estado = 'meio_aberto'
+                return True
+            
+            return False
+    
+    def registrar_sucesso(self) -> None:
+        """
+        Fecha o circuito e zera o contador de falhas.
+        """
+        with self._lock:
+            if self.estado != 'fechado':
+                print(f"✅ Circuito {self.nome} fechado")
+            self.estado = 'fechado'
+            self.falhas = 0
+    
+    def registrar_falha(self) -> None:
+        """
+        Conta uma falha transitória; abre o circuito no limite.
+        """
+        with self._lock:
+            self.falhas += 1
+            if self.estado == 'meio_aberto' or self.falhas >= self.limite_falhas:
+                if self.estado != 'aberto':
+                    print(f"⚠️ Circuito {self.nome} aberto por {self.tempo_aberto:.0f}s "
+                          f"({self.falhas} falhas seguidas)")
+                self.estado = 'aberto'
+                self.aberto_em = time.time()
+    
+    def registrar_throttle(self) -> None:
+        """
+        Um 429 não conta como falha, exceto na chamada de teste: reabre o circuito.
+        """
+        if self.estado == 'meio_aberto':
+            self.registrar_falha()
+
+
+class ControladorConcorrencia:
+    """
+    Limite de chamadas simultâneas ajustado por AIMD.
+    
+    Cada sucesso soma 1/limite (≈ +1 por "rodada" de chamadas); cada
+    throttle divide o limite por 2, no máximo uma vez por período de
+    recuperação para que uma rajada de 429 não derrube o limite a zero.
+    """
+    
+    def __init__(self, nome: str, inicial: int = 2, minimo: int = 1, maximo: int = 8):
+        """
+        Args:
+            nome: Nome do provedor
+            inicial: Limite inicial de chamadas simultâneas
+            minimo: Limite mínimo
+            maximo: Limite máximo
+        """
+        self.nome = nome
+        self.minimo = minimo
+        self.maximo = maximo
+        self.limite = float(max(minimo, min(inicial, maximo)))
+        
+        self.em_uso = 0
+        self.ultimo_corte = 0.0
+        self._cond = threading.Condition()
+    
+    def adquirir(self) -> None:
+        """
+        Bloqueia até haver vaga dentro do limite atual.
+        """
+        with self._cond:
+            while self.em_uso >= int(self.limite):
+                self._cond.wait()
+            self.em_uso += 1
+    
+    def liberar(self) -> None:
+        """
+        Devolve a vaga ocupada por adquirir().
+        """
+        with self._cond:
+            self.em_uso -= 1
+            self._cond.notify_all()
+    
+    def sucesso(self) -> None:
+        """
+        Aumento aditivo do limite.
+        """
+        with self._cond:
+            anterior = int(self.limite)
+            self.limite = min(self.maximo, self.limite + 1.0 / self.limite)
+            if int(self.limite) > anterior:
+                self._cond.notify_all()
+    
+    def throttle(self, recuperacao: float = 5.0) -> None:
+        """
+        Redução multiplicativa do limite após um 429.
+        """
+        with self._cond:
+            agora = time.time()
+            if agora - self.ultimo_corte < recuperacao:
+                return
+            self.ultimo_corte = agora
+            self.limite = max(float(self.minimo), self.limite / 2)
+            print(f"⚠️ {self.nome}: limite de requisições, concorrência -> {int(self.limite)}")
+
+
+class Provedor:
+    """
+    Política de chamadas de um provedor (tentativas, circuito, concorrência).
+    """
+    
+    def __init__(self, nome: str):
+        """
+        Args:
+            nome: Nome do provedor (chave em REMOTE_CALLS_CONFIG['concorrencia'])
+        """
+        self.nome = nome
+        self.max_tentativas = AI_CONFIG.get('max_retries', 3)
+        self.atraso_base = AI_CONFIG.get('retry_delay', 5)
+        self.atraso_maximo = REMOTE_CALLS_CONFIG.get('backoff_maximo', 60)
+        
+        self.circuito = CircuitBreaker(
+            nome,
+            REMOTE_CALLS_CONFIG.get('falhas_para_abrir_circuito', 5),
+            REMOTE_CALLS_CONFIG.get('tempo_circuito_aberto', 60)
+        )
+        
+        limites = REMOTE_CALLS_CONFIG.get('concorrencia', {}).get(nome, {})
+        self.concorrencia = ControladorConcorrencia(
+            nome,
+            limites.get('inicial', 2),
+            limites.get('minima', 1),
+            limites.get('maxima', 8)
+        )
+        
+        self.estatisticas = {'chamadas': 0, 'tentativas_extras': 0, 'throttles': 0, 'falhas': 0}
+    
+    def espera(self, tentativa: int, erro: Exception) -> float:
+        """
+        Tempo até a próxima tentativa: Retry-After, se houver, senão
+        backoff exponencial com jitter completo.
+        """
+        retry_after = retry_after_do_erro(erro)
+        if retry_after is not None:
+            return min(retry_after, self.atraso_maximo)
+        
+        teto = min(self.atraso_maximo, self.atraso_base * (2 ** tentativa))
+        return random.uniform(self.atraso_base / 2, teto)
+
+
+_provedores: Dict[str, Provedor] = {}
+_provedores_lock = threading.Lock()
+
+
+def obter_provedor(nome: str) -> Provedor:
+    """
+    Política compartilhada do provedor (criada no primeiro uso).
+    
+    Args:
+        nome: 'replicate', 'elevenlabs', 'openai', ...
+    """
+    with _provedores_lock:
+        if nome not in _provedores:
+            _provedores[nome] = Provedor(nome)
+        return _provedores[nome]
+
+
+def chamar_remoto(provedor: str, funcao: Callable, *args, descricao: str = '', **kwargs) -> Any:
+    """
+    Executa uma chamada remota com tentativas, circuito e concorrência.
+    
+    Erros não transitórios (autenticação, créditos, entrada inválida) são
+    relançados na primeira ocorrência; os transitórios são repetidos até
+    AI_CONFIG['max_retries'] vezes.
+    
+    Args:
+        provedor: Nome do provedor
+        funcao: Função que faz a chamada
+        *args, **kwargs: Argumentos da função
+        descricao: Texto para as mensagens de nova tentativa
+    
+    Returns:
+        Retorno da função
+    
+    Raises:
+        CircuitoAbertoError: Se o circuito do provedor estiver aberto
+        Exception: O último erro, se todas as tentativas falharem
+    
+    Example:
+        >>> output = chamar_remoto('replicate', replicate.run, modelo, input=parametros)
+    """
+    politica = obter_provedor(provedor)
+    politica.estatisticas['chamadas'] += 1
+    descricao = descricao or getattr(funcao, '__name__', 'chamada')
+    
+    for tentativa in range(politica.max_tentativas + 1):
+        if not politica.circuito.permitir():
+            raise CircuitoAbertoError(f"Circuito {provedor} aberto, chamada '{descricao}' recusada")
+        
+        politica.concorrencia.adquirir()
+        try:
+            resultado = funcao(*args, **kwargs)
+        except Exception as e:
+            erro = e
+        else:
+            politica.circuito.registrar_sucesso()
+            politica.concorrencia.sucesso()
+            return resultado
+        finally:
+            politica.concorrencia.liberar()
+        
+        # Todo desfecho define o estado do circuito (inclusive o da chamada de teste)
+        transitorio = erro_transitorio(erro)
+        if status_do_erro(erro) == 429:
+            politica.estatisticas['throttles'] += 1
+            politica.concorrencia.throttle()
+            politica.circuito.registrar_throttle()
+        elif transitorio:
+            politica.circuito.registrar_falha()
+        else:
+            # O provedor respondeu: o erro é da chamada, não da disponibilidade
+            politica.circuito.registrar_sucesso()
+        
+        if not transitorio or tentativa == politica.max_tentativas:
+            politica.estatisticas['falhas'] += 1
+            raise erro
+        
+        espera = politica.espera(tentativa, erro)
+        politica.estatisticas['tentativas_extras'] += 1
+        print(f"   🔁 {provedor}/{descricao}: {erro} - nova tentativa em {espera:.1f}s "
+              f"({tentativa + 1}/{politica.max_tentativas})")
+        time.sleep(espera)
+
+
+def executar_em_paralelo(
+    provedor: str,
+    funcao: Callable,
+    itens: Iterable,
+) -> List[Tuple[Any, Any]]:
+    """
+    Aplica a função a cada item em paralelo.
+    
+    O número de threads é o máximo do provedor; o paralelismo efetivo é
+    regulado pelo controlador AIMD dentro de chamar_remoto.
+    
+    Args:
+        provedor: Nome do provedor
+        funcao: Função chamada com cada item (deve usar chamar_remoto)
+        itens: Itens a processar
+    
+    Returns:
+        Lista de (item, resultado) na ordem original; resultado é None se
+        a função levantar exceção
+    """
+    itens = list(itens)
+    if not itens:
+        return []
+    
+    def seguro(item):
+        try:
+            return funcao(item)
+        except Exception as e:
+            print(f"❌ Erro ao processar {item}: {e}")
+            return None
+    
+    max_workers = min(len(itens), obter_provedor(provedor).concorrencia.maximo)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(zip(itens, executor.map(seguro, itens)))
+
+
+def resumo_provedores() -> Dict[str, Dict]:
+    """
+    Estatísticas de chamadas e concorrência atual de cada provedor.
+    """
+    return {
+        nome: {
+            **p.estatisticas,
+            'concorrencia': int(p.concorrencia.limite),
+            'circuito': p.circuito.estado,
+        }
+        for nome, p in _provedores.items()
+    }
+
+
+def exemplo_uso():
+    """
+    Exemplo de uso da camada de chamadas remotas.
+    """
+    falhas = {'restantes': 2}
+    
+    def chamada_instavel(x):
+        if falhas['restantes'] > 0:
+            falhas['restantes'] -= 1
+            raise ConnectionError("conexão recusada")
+        return x * 2
+    
+    print(chamar_remoto('teste', chamada_instavel, 21, descricao='dobrar'))
+    print(resumo_provedores())
+    
+    # Erro não transitório: propagado sem novas tentativas
+    class ErroHTTP(Exception):
+        def __init__(self, status):
+            super().__init__(f"HTTP {status}")
+            self.status = status
+    
+    def rejeitar(status):
+        raise ErroHTTP(status)
+    
+    try:
+        chamar_remoto('teste', rejeitar, 422, descricao='rejeitar')
+    except ErroHTTP as e:
+        print(f"   Erro propagado: {e}")
+    
+    print(f"   Circuito: {obter_provedor('teste').circuito.estado}")
+
+
+if __name__ == '__main__':
+    exemplo_uso()
@@ -6,16 +6,20 @@ Módulo responsável por gerar roteiros completos para vídeos usando ChatGPT.
 
 import os
 import json
+import math
 import time
-from typing import Dict, List, Optional
-from openai import OpenAI
+from typing import Dict, List, Optional, Tuple
 
 # Imports locais
 try:
     import sys
-    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-    from config.settings import AI_CONFIG, LANGUAGE_CONFIG
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import AI_CONFIG, LANGUAGE_CONFIG, ROTEIRO_CONFIG
     from src.utils import validar_api_key, salvar_json, configurar_logging
+    from src.remote_calls import chamar_remoto, executar_em_paralelo
+    from src.roteiro_schema import reparar_roteiro, carregar_json_parcial
 except ImportError:
     print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
 
@@ -39,6 +43,8 @@ class RoteiroGenerator:
         if not validar_api_key(api_key, 'openai'):
             raise ValueError("❌ API key OpenAI inválida")
         
+        # SDK carregado só quando um gerador é criado
+        from openai import OpenAI
         self.client = OpenAI(api_key=api_key)
         self.modelo = modelo or AI_CONFIG.get('openai_model', 'gpt-4-turbo-preview')
         self.temperature = AI_CONFIG.get('openai_temperature', 0.7)
@@ -57,6 +63,10 @@ class RoteiroGenerator:
         """
         Gera um roteiro completo para vídeo.
         
+        Quando a resposta estimada não cabe em max_tokens (vídeos longos), o
+        roteiro é gerado em blocos: um esboço e depois os blocos de cenas em
+        paralelo (ver _gerar_em_blocos).
+        
         Args:
             tema: Tema do vídeo (ex: "A História do Rei Salomão")
             nicho: Nicho/categoria do vídeo
@@ -76,45 +86,47 @@ class RoteiroGenerator:
         
         # Calcular número de cenas se não fornecido
         if num_cenas is None:
-            num_cenas = (duracao_minutos * 60) // 12  # ~12 segundos por cena
-            num_cenas = max(10, min(40, num_cenas))  # Entre 10 e 40 cenas
+            num_cenas = self.calcular_num_cenas(duracao_minutos)
+        
+        duracao_por_cena = max(1, (duracao_minutos * 60) // num_cenas)
+        tokens_estimados = self._tokens_resposta(num_cenas)
+        em_blocos = ROTEIRO_CONFIG.get('sempre_em_blocos', False) or tokens_estimados > self.max_tokens
         
         print(f"📝 Gerando roteiro: {tema}")
         print(f"   Nicho: {nicho} | Duração: {duracao_minutos}min | Cenas: {num_cenas}")
         
-        # Construir prompt
-        prompt = self._construir_prompt(tema, nicho, duracao_minutos, num_cenas, idioma)
-        
         try:
-            # Chamar API OpenAI
-            print("🤖 Consultando ChatGPT...")
+            if em_blocos:
+                roteiro, tokens_usados = self._gerar_em_blocos(tema, nicho, duracao_minutos, num_cenas, idioma)
+            else:
+                # Chamar API OpenAI
+                print("🤖 Consultando ChatGPT...")
+                
+                prompt = self._construir_prompt(tema, nicho, duracao_minutos, num_cenas, idioma)
+                roteiro, tokens_usados = self._pedir_json(self._get_system_prompt(idioma, nicho), prompt)
             
-            response = self.client.chat.completions.create(
-                model=self.modelo,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self._get_system_prompt(idioma, nicho)
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                response_format={"type": "json_object"}
-            )
+            # Reparo local (inclui JSON truncado pelo limite de tokens)
+            roteiro, quebradas, correcoes = reparar_roteiro(roteiro, duracao_por_cena, tema, num_cenas)
+            for correcao in correcoes:
+                print(f"   🔧 {correcao}")
             
-            # Extrair resposta
-            conteudo = response.choices[0].message.content
-            roteiro = json.loads(conteudo)
+            # Só as cenas que o reparo não resolve voltam ao modelo
+            if quebradas:
+                tokens_usados += self._regerar_cenas(roteiro, quebradas, tema, nicho, idioma)
+                roteiro, quebradas, _ = reparar_roteiro(roteiro, duracao_por_cena, tema)
+            
+            if quebradas:
+                print(f"⚠️ Cenas descartadas por falta de narrativa: {quebradas}")
+                roteiro['cenas'] = [c for c in roteiro['cenas'] if c['numero'] not in quebradas]
+                roteiro, _, _ = reparar_roteiro(roteiro, duracao_por_cena, tema)
             
             # Adicionar metadados
             roteiro['metadata'] = {
                 'gerado_em': time.strftime('%Y-%m-%d %H:%M:%S'),
                 'modelo_usado': self.modelo,
-                'tokens_usados': response.usage.total_tokens,
+                'tokens_usados': tokens_usados,
+                'tokens_estimados': tokens_estimados,
+                'blocos': len(roteiro.get('partes') or []) or 1,
                 'idioma': idioma,
                 'nicho': nicho
             }
@@ -122,7 +134,7 @@ class RoteiroGenerator:
             print(f"✅ Roteiro gerado com sucesso!")
             print(f"   Título: {roteiro.get('titulo', 'N/A')}")
             print(f"   Cenas: {len(roteiro.get('cenas', []))}")
-            print(f"   Tokens: {response.usage.total_tokens}")
+            print(f"   Tokens: {tokens_usados}")
             
             return roteiro
             
@@ -130,6 +142,224 @@ class RoteiroGenerator:
             print(f"❌ Erro ao gerar roteiro: {e}")
             raise
     
+    @staticmethod
+    def calcular_num_cenas(duracao_minutos: float) -> int:
+        """
+        Número de cenas para a duração (~ROTEIRO_CONFIG['segundos_por_cena'] cada).
+        
+        Sem teto: um vídeo de 60 minutos tem 300 cenas de 12 segundos.
+        """
+        segundos_por_cena = ROTEIRO_CONFIG.get('segundos_por_cena', 12)
+        return max(ROTEIRO_CONFIG.get('minimo_cenas', 10), int(duracao_minutos * 60) // segundos_por_cena)
+    
+    def _tokens_resposta(self, num_cenas: int) -> int:
+        """
+        Tokens de saída estimados para um roteiro com num_cenas em uma resposta.
+        """
+        return ROTEIRO_CONFIG.get('tokens_cabecalho', 900) + num_cenas * ROTEIRO_CONFIG.get('tokens_por_cena', 220)
+    
+    def _cenas_por_bloco(self) -> int:
+        """
+        Cenas que cabem em uma resposta de max_tokens (com folga para o envelope JSON).
+        """
+        return max(1, (self.max_tokens - 200) // ROTEIRO_CONFIG.get('tokens_por_cena', 220))
+    
+    def _pedir_json(self, sistema: str, prompt: str) -> Tuple[Dict, int]:
+        """
+        Uma chamada ao ChatGPT em modo JSON.
+        
+        O tamanho do prompt é estimado localmente antes do envio e a resposta
+        é limitada ao que ainda cabe na janela de contexto do modelo.
+        
+        Args:
+            sistema: Prompt de sistema
+            prompt: Prompt do usuário
+        
+        Returns:
+            (JSON decodificado, tokens usados)
+        
+        Raises:
+            ValueError: Se o prompt não deixar espaço para a resposta
+        """
+        tokens_prompt = estimar_tokens(sistema) + estimar_tokens(prompt)
+        max_tokens = min(self.max_tokens, ROTEIRO_CONFIG.get('contexto_tokens', 128000) - tokens_prompt)
+        
+        if max_tokens < ROTEIRO_CONFIG.get('tokens_por_cena', 220):
+            raise ValueError(f"Prompt de ~{tokens_prompt} tokens não deixa espaço para a resposta")
+        
+        response = chamar_remoto(
+            'openai', self.client.chat.completions.create,
+            model=self.modelo,
+            messages=[
+                {
+                    "role": "system",
+                    "content": sistema
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=self.temperature,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"}
+        )
+        
+        # Tolerante a JSON truncado pelo limite de tokens
+        conteudo = carregar_json_parcial(response.choices[0].message.content)
+        return conteudo, response.usage.total_tokens
+    
+    def _gerar_em_blocos(
+        self,
+        tema: str,
+        nicho: str,
+        duracao_minutos: int,
+        num_cenas: int,
+        idioma: str
+    ) -> Tuple[Dict, int]:
+        """
+        Gera um roteiro longo em duas fases.
+        
+        Primeiro um esboço (título, SEO, personagens e um resumo por bloco de
+        cenas); depois todos os blocos de cenas em paralelo, cada um com o
+        esboço como contexto. A latência fica perto da de um esboço mais um
+        bloco, em vez de uma resposta truncada ou blocos em série.
+        
+        Args:
+            tema: Tema do vídeo
+            nicho: Nicho do vídeo
+            duracao_minutos: Duração em minutos
+            num_cenas: Número de cenas
+            idioma: Código do idioma
+        
+        Returns:
+            (roteiro com as cenas de todos os blocos, tokens usados). Cenas
+            de blocos que falharam ficam vazias, para o reparo pedir de novo.
+        """
+        tamanho = self._cenas_por_bloco()
+        blocos = [(inicio, min(inicio + tamanho - 1, num_cenas)) for inicio in range(1, num_cenas + 1, tamanho)]
+        duracao_por_cena = max(1, (duracao_minutos * 60) // num_cenas)
+        sistema = self._get_system_prompt(idioma, nicho)
+        
+        print(f"🧱 Roteiro longo: {len(blocos)} blocos de até {tamanho} cenas")
+        print("🤖 Gerando esboço...")
+        
+        prompt = self._construir_prompt_esboco(tema, nicho, duracao_minutos, num_cenas, idioma, blocos)
+        roteiro, tokens_usados = self._pedir_json(sistema, prompt)
+        
+        resumos = [
+            parte.get('resumo', '') if isinstance(parte, dict) else str(parte)
+            for parte in roteiro.pop('partes', None) or []
+        ]
+        roteiro['partes'] = [
+            {'cenas': f"{inicio}-{fim}", 'resumo': resumos[i] if i < len(resumos) else ''}
+            for i, (inicio, fim) in enumerate(blocos)
+        ]
+        
+        print(f"🤖 Gerando {len(blocos)} blocos de cenas em paralelo...")
+        
+        def gerar_bloco(indice):
+            prompt_bloco = self._construir_prompt_bloco(tema, roteiro, blocos, indice, duracao_por_cena, idioma)
+            return self._pedir_json(sistema, prompt_bloco)
+        
+        cenas = {}
+        for indice, resultado in executar_em_paralelo('openai', gerar_bloco, range(len(blocos))):
+            inicio, fim = blocos[indice]
+            if resultado is None:
+                print(f"⚠️ Bloco {indice + 1} (cenas {inicio}-{fim}) falhou")
+                continue
+            
+            dados, tokens_bloco = resultado
+            tokens_usados += tokens_bloco
+            
+            # Numeração do bloco, mesmo que o modelo recomece do 1
+            novas = [c for c in dados.get('cenas') or [] if isinstance(c, dict)]
+            for numero, cena in zip(range(inicio, fim + 1), novas):
+                cena['numero'] = numero
+                cenas[numero] = cena
+        
+        # Lacunas mantêm a posição (o reparo as marca para novo pedido)
+        roteiro['cenas'] = [cenas.get(numero, {'numero': numero}) for numero in range(1, num_cenas + 1)]
+        
+        return roteiro, tokens_usados
+    
+    def _regerar_cenas(
+        self,
+        roteiro: Dict,
+        numeros: List[int],
+        tema: str,
+        nicho: str,
+        idioma: str
+    ) -> int:
+        """
+        Pede ao modelo apenas as cenas indicadas e as substitui no roteiro.
+        
+        As cenas vizinhas (e o esboço, em roteiros longos) vão como contexto
+        para manter a continuidade. Muitas cenas são pedidas em grupos de
+        até um bloco, em paralelo. Grupos com erro ficam como estão (as cenas
+        seguem quebradas).
+        
+        Args:
+            roteiro: Roteiro já reparado (alterado no lugar)
+            numeros: Números das cenas a gerar de novo
+            tema: Tema do vídeo
+            nicho: Nicho do vídeo
+            idioma: Código do idioma
+        
+        Returns:
+            Tokens usados
+        """
+        print(f"🔁 Gerando novamente as cenas {numeros}...")
+        
+        cenas = {cena['numero']: cena for cena in roteiro['cenas']}
+        tamanho = self._cenas_por_bloco()
+        grupos = [numeros[i:i + tamanho] for i in range(0, len(numeros), tamanho)]
+        sistema = self._get_system_prompt(idioma, nicho)
+        
+        esboco = '\n'.join(
+            f"- Cenas {parte['cenas']}: {parte['resumo']}" for parte in roteiro.get('partes') or []
+        )
+        secao_esboco = f"Esboço da história:\n{esboco}\n\n" if esboco else ""
+        
+        def pedir(grupo):
+            vizinhas = sorted({
+                vizinho for numero in grupo for vizinho in (numero - 1, numero + 1)
+                if vizinho in cenas and vizinho not in numeros
+            })
+            contexto = [cenas[n] for n in vizinhas]
+            
+            prompt = f"""Roteiro de vídeo sobre: "{tema}" (título: "{roteiro.get('titulo', tema)}")
+
+Total de cenas: {len(cenas)}
+
+{secao_esboco}Cenas vizinhas (contexto, NÃO as repita):
+{json.dumps(contexto, ensure_ascii=False, indent=2)}
+
+Escreva APENAS as cenas de número {grupo}, com os mesmos campos das cenas acima
+(numero, titulo, duracao, tipo_cena, narrativa, descricao_visual, personagens,
+tipo_audio, emocao, transicao, notas_producao), mantendo a continuidade.
+
+Retorne um JSON no formato: {{"cenas": [...]}}"""
+            
+            return self._pedir_json(sistema, prompt)
+        
+        tokens_usados = 0
+        for grupo, resultado in executar_em_paralelo('openai', pedir, grupos):
+            if resultado is None:
+                continue
+            
+            dados, tokens_grupo = resultado
+            tokens_usados += tokens_grupo
+            
+            # Na ordem pedida, caso o modelo renumere as cenas
+            novas = [c for c in dados.get('cenas') or [] if isinstance(c, dict)]
+            for numero, cena in zip(grupo, novas):
+                cena['numero'] = numero
+                cenas[numero] = cena
+        
+        roteiro['cenas'] = [cenas[n] for n in sorted(cenas)]
+        return tokens_usados
+    
     def _get_system_prompt(self, idioma: str, nicho: str) -> str:
         """
         Retorna o prompt de sistema adequado.
@@ -259,6 +489,176 @@ Gere o roteiro completo agora em JSON:"""
         
         return prompt
     
+    def _construir_prompt_esboco(
+        self,
+        tema: str,
+        nicho: str,
+        duracao_minutos: int,
+        num_cenas: int,
+        idioma: str,
+        blocos: List[Tuple[int, int]]
+    ) -> str:
+        """
+        Constrói o prompt do esboço de um roteiro longo.
+        
+        Args:
+            tema: Tema do vídeo
+            nicho: Nicho do vídeo
+            duracao_minutos: Duração em minutos
+            num_cenas: Número de cenas
+            idioma: Código do idioma
+            blocos: (primeira, última) cena de cada bloco
+        
+        Returns:
+            Prompt completo
+        """
+        partes = '\n'.join(
+            f"- Parte {i + 1}: cenas {inicio} a {fim}" for i, (inicio, fim) in enumerate(blocos)
+        )
+        
+        prompt = f"""Planeje um vídeo LONGO de YouTube sobre: "{tema}"
+
+ESPECIFICAÇÕES:
+- Nicho: {nicho}
+- Duração total: {duracao_minutos} minutos
+- Número de cenas: {num_cenas}, divididas em {len(blocos)} partes
+- Idioma: {idioma}
+- Estilo visual: Cartoon 3D (estilo Pixar)
+
+As cenas serão escritas depois, parte por parte, a partir deste esboço:
+{partes}
+
+Retorne um JSON com esta estrutura EXATA:
+
+{{
+  "titulo": "Título otimizado para YouTube (50-60 caracteres)",
+  "descricao": "Descrição atrativa do vídeo (2-3 frases)",
+  "duracao_estimada": "{duracao_minutos}min",
+  "idioma": "{idioma}",
+  "tags": ["tag1", "tag2", "tag3", "tag4", "tag5"],
+  "thumbnail_sugestao": "Descrição da thumbnail ideal",
+  "partes": [
+    {{
+      "parte": 1,
+      "resumo": "O que acontece nesta parte (2-4 frases), terminando no gancho da parte seguinte"
+    }},
+    ...
+  ],
+  "personagens_necessarios": [
+    {{
+      "nome": "Nome do Personagem",
+      "descricao": "Descrição física detalhada para geração de imagem",
+      "tipo": "protagonista",
+      "caracteristicas": ["característica1", "característica2"]
+    }}
+  ],
+  "musica_sugerida": {{
+    "mood": "inspirador",
+    "estilo": "orquestral",
+    "intensidade": "média"
+  }},
+  "seo": {{
+    "titulo_alternativo": "Título SEO otimizado",
+    "palavras_chave": ["keyword1", "keyword2", "keyword3"],
+    "categoria": "Education"
+  }}
+}}
+
+DIRETRIZES IMPORTANTES:
+1. Exatamente uma entrada em "partes" para cada parte listada, na ordem
+2. A primeira parte abre com um gancho; a última fecha a história
+3. Mantenha o ritmo adequado (início cativante, meio envolvente, final impactante)
+4. Todos os personagens da história devem estar em "personagens_necessarios"
+
+Gere o esboço agora em JSON:"""
+        
+        return prompt
+    
+    def _construir_prompt_bloco(
+        self,
+        tema: str,
+        esboco: Dict,
+        blocos: List[Tuple[int, int]],
+        indice: int,
+        duracao_por_cena: int,
+        idioma: str
+    ) -> str:
+        """
+        Constrói o prompt de um bloco de cenas de um roteiro longo.
+        
+        Args:
+            tema: Tema do vídeo
+            esboco: Esboço gerado (título, partes e personagens)
+            blocos: (primeira, última) cena de cada bloco
+            indice: Índice do bloco
+            duracao_por_cena: Duração de cada cena (segundos)
+            idioma: Código do idioma
+        
+        Returns:
+            Prompt completo
+        """
+        inicio, fim = blocos[indice]
+        
+        partes = '\n'.join(
+            f"{'>>' if i == indice else '-'} Parte {i + 1} (cenas {parte['cenas']}): {parte['resumo']}"
+            for i, parte in enumerate(esboco.get('partes') or [])
+        )
+        personagens = ', '.join(
+            p.get('nome', '') if isinstance(p, dict) else str(p)
+            for p in esboco.get('personagens_necessarios') or []
+        )
+        
+        if indice == 0:
+            posicao = f"Esta parte abre o vídeo: a cena {inicio} é do tipo abertura e prende a atenção."
+        elif indice == len(blocos) - 1:
+            posicao = f"Esta parte fecha o vídeo: continue da parte anterior; a cena {fim} é do tipo encerramento."
+        else:
+            posicao = "Continue exatamente de onde a parte anterior termina e prepare a parte seguinte."
+        
+        prompt = f"""Escreva a parte {indice + 1} de {len(blocos)} do roteiro do vídeo "{esboco.get('titulo', tema)}" sobre: "{tema}"
+
+ESBOÇO DA HISTÓRIA (>> = esta parte):
+{partes}
+
+Personagens: {personagens or 'livres'}
+
+ESPECIFICAÇÕES:
+- Cenas desta parte: {inicio} a {fim} ({fim - inicio + 1} cenas)
+- Duração por cena: aproximadamente {duracao_por_cena} segundos
+- Idioma: {idioma}
+- Estilo visual: Cartoon 3D (estilo Pixar)
+- {posicao}
+
+Retorne um JSON com esta estrutura EXATA:
+
+{{
+  "cenas": [
+    {{
+      "numero": {inicio},
+      "titulo": "Título da cena",
+      "duracao": "{duracao_por_cena}s",
+      "tipo_cena": "desenvolvimento",
+      "narrativa": "Texto completo que será narrado nesta cena",
+      "descricao_visual": "Descrição detalhada do que aparece visualmente",
+      "personagens": ["personagem1", "personagem2"],
+      "tipo_audio": "narracao",
+      "emocao": "confiante",
+      "transicao": "fade",
+      "notas_producao": "Notas importantes para produção"
+    }},
+    ...
+  ]
+}}
+
+Tipos de cena possíveis: abertura, apresentacao, desenvolvimento, conflito, climax, resolucao, encerramento
+Tipos de áudio: dialogo, narracao, musica_apenas, silencio
+Emoções: confiante, feliz, triste, pensativo, animado, sério, misterioso, tenso
+Transições: fade, corte, dissolve, slide
+
+Gere as {fim - inicio + 1} cenas agora em JSON:"""
+        
+        return prompt
+    
     def refinar_roteiro(
         self,
         roteiro_original: Dict,
@@ -286,7 +686,8 @@ ROTEIRO ORIGINAL:
 Retorne o roteiro refinado mantendo a MESMA ESTRUTURA JSON, mas aplicando as melhorias solicitadas."""
         
         try:
-            response = self.client.chat.completions.create(
+            response = chamar_remoto(
+                'openai', self.client.chat.completions.create,
                 model=self.modelo,
                 messages=[
                     {
@@ -303,7 +704,12 @@ Retorne o roteiro refinado mantendo a MESMA ESTRUTURA JSON, mas aplicando as mel
                 response_format={"type": "json_object"}
             )
             
-            roteiro_refinado = json.loads(response.choices[0].message.content)
+            roteiro_refinado, quebradas, _ = reparar_roteiro(
+                carregar_json_parcial(response.choices[0].message.content),
+                tema=roteiro_original.get('titulo')
+            )
+            if quebradas:
+                print(f"⚠️ Cenas sem narrativa no roteiro refinado: {quebradas}")
             
             # Atualizar metadados
             roteiro_refinado['metadata'] = roteiro_original.get('metadata', {})
@@ -342,7 +748,8 @@ Retorne apenas um JSON com array de títulos:
 {{"titulos": ["titulo1", "titulo2", "titulo3", "titulo4", "titulo5"]}}"""
         
         try:
-            response = self.client.chat.completions.create(
+            response = chamar_remoto(
+                'openai', self.client.chat.completions.create,
                 model=self.modelo,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.9,
@@ -408,7 +815,8 @@ Retorne JSON estruturado:
 }}"""
         
         try:
-            response = self.client.chat.completions.create(
+            response = chamar_remoto(
+                'openai', self.client.chat.completions.create,
                 model=self.modelo,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.8,
@@ -426,6 +834,26 @@ Retorne JSON estruturado:
             return {}
 
 
+def estimar_tokens(texto: str) -> int:
+    """
+    Estimativa local de tokens de um texto, sem chamar a API.
+    
+    Usa ROTEIRO_CONFIG['caracteres_por_token'] (conservador para português
+    e espanhol com JSON), mais alguns tokens de envelope da mensagem.
+    
+    Args:
+        texto: Texto do prompt ou da resposta
+    
+    Returns:
+        Número estimado de tokens
+    
+    Example:
+        >>> estimar_tokens("Era uma vez um rei muito sábio.")
+        13
+    """
+    return math.ceil(len(texto) / ROTEIRO_CONFIG.get('caracteres_por_token', 3.5)) + 4
+
+
 def exemplo_uso():
     """
     Exemplo de uso do RoteiroGenerator.
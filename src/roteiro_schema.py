@@ -0,0 +1,439 @@
+"""
+📐 ROTEIRO SCHEMA - ProjetoX
+
+Validação e reparo determinístico dos roteiros gerados pelo ChatGPT.
+
+O esquema é compilado uma vez em funções de verificação por campo. O reparo
+corrige o que tem resposta certa sem consultar o modelo (numeração,
+durações como "10 s" ou 10, tipos, valores padrão, JSON truncado) e aponta
+apenas as cenas que precisam ser pedidas de novo.
+"""
+
+import os
+import re
+import json
+import unicodedata
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Imports locais
+try:
+    import sys
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+except ImportError:
+    print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
+
+
+# Sentinela de campo obrigatório (sem valor padrão)
+OBRIGATORIO = object()
+
+TIPOS_CENA = ['abertura', 'apresentacao', 'desenvolvimento', 'conflito', 'climax', 'resolucao', 'encerramento']
+TIPOS_AUDIO = ['narracao', 'dialogo', 'musica_apenas', 'silencio']
+TRANSICOES = ['fade', 'corte', 'dissolve', 'slide']
+
+# Campo: (tipo, padrão, valores permitidos, nomes alternativos usados pelo modelo)
+ESQUEMA_CENA = {
+    'numero': (int, None, None, ['cena', 'id']),
+    'titulo': (str, '', None, ['title']),
+    'duracao': (str, None, None, ['duracao_segundos', 'duration']),
+    'tipo_cena': (str, 'desenvolvimento', TIPOS_CENA, ['tipo']),
+    'narrativa': (str, OBRIGATORIO, None, ['narracao', 'texto', 'fala', 'narration']),
+    'descricao_visual': (str, OBRIGATORIO, None, ['visual', 'descricao', 'prompt_visual']),
+    'personagens': (list, [], None, ['characters']),
+    'tipo_audio': (str, 'narracao', TIPOS_AUDIO, ['audio']),
+    'emocao': (str, 'neutral', None, ['emotion']),
+    'transicao': (str, 'fade', TRANSICOES, ['transition']),
+    'notas_producao': (str, '', None, ['notas']),
+}
+
+ESQUEMA_ROTEIRO = {
+    'titulo': (str, OBRIGATORIO, None, ['title']),
+    'descricao': (str, '', None, ['description']),
+    'duracao_estimada': (str, '', None, []),
+    'idioma': (str, '', None, []),
+    'tags': (list, [], None, []),
+    'thumbnail_sugestao': (str, '', None, []),
+    'cenas': (list, OBRIGATORIO, None, ['scenes']),
+    'personagens_necessarios': (list, [], None, ['personagens']),
+    'musica_sugerida': (dict, {}, None, []),
+    'seo': (dict, {}, None, []),
+}
+
+# Cenas em que a narrativa pode ficar vazia
+AUDIOS_SEM_NARRATIVA = ('musica_apenas', 'silencio')
+
+
+def normalizar_termo(valor: str) -> str:
+    """
+    Minúsculas, sem acentos e com '_' no lugar de espaços ("Clímax" -> "climax").
+    """
+    texto = unicodedata.normalize('NFKD', str(valor).strip().lower())
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return re.sub(r'[\s-]+', '_', texto)
+
+
+def parse_duracao(valor: Any) -> Optional[float]:
+    """
+    Duração em segundos a partir dos formatos que o modelo costuma devolver.
+    
+    Args:
+        valor: 10, 10.5, "10", "10s", "10 s", "10 seg", "10 segundos", "0:10"
+    
+    Returns:
+        Segundos ou None se não for possível interpretar
+    
+    Example:
+        >>> parse_duracao("12 s"), parse_duracao("1:05"), parse_duracao("abc")
+        (12.0, 65.0, None)
+    """
+    if isinstance(valor, bool):
+        return None
+    if isinstance(valor, (int, float)):
+        return float(valor) if valor > 0 else None
+    if not isinstance(valor, str):
+        return None
+    
+    texto = valor.strip().lower().replace(',', '.')
+    
+    minutos = re.fullmatch(r'(\d+):(\d{1,2}(?:\.\d+)?)', texto)
+    if minutos:
+        return int(minutos.group(1)) * 60 + float(minutos.group(2))
+    
+    numero = re.fullmatch(r'(\d+(?:\.\d+)?)\s*(s|seg|segs|segundos?|sec|secs|seconds?|min|minutos?|minutes?)?', texto)
+    if not numero:
+        return None
+    
+    segundos = float(numero.group(1))
+    if numero.group(2) and numero.group(2).startswith('min'):
+        segundos *= 60
+    
+    return segundos if segundos > 0 else None
+
+
+def formatar_duracao_cena(segundos: float) -> str:
+    """
+    Duração no formato do roteiro ("12s", "7.5s").
+    """
+    segundos = round(segundos, 1)
+    return f"{int(segundos)}s" if segundos == int(segundos) else f"{segundos}s"
+
+
+def compilar_esquema(esquema: Dict[str, tuple]) -> List[Callable[[Dict], Optional[str]]]:
+    """
+    Compila um esquema em uma lista de verificações (uma por campo).
+    
+    Args:
+        esquema: Dict campo -> (tipo, padrão, valores permitidos, alternativos)
+    
+    Returns:
+        Funções que recebem o objeto e retornam a mensagem de erro ou None
+    """
+    verificacoes = []
+    
+    for campo, (tipo, padrao, valores, _) in esquema.items():
+        def verificar(obj, campo=campo, tipo=tipo, padrao=padrao, valores=valores):
+            if campo not in obj:
+                return f"'{campo}' ausente" if padrao is OBRIGATORIO else None
+            valor = obj[campo]
+            if not isinstance(valor, tipo) or isinstance(valor, bool):
+                return f"'{campo}' deveria ser {tipo.__name__}"
+            if padrao is OBRIGATORIO and not valor:
+                return f"'{campo}' vazio"
+            if valores and valor not in valores:
+                return f"'{campo}' inválido: {valor!r}"
+            return None
+        
+        verificacoes.append(verificar)
+    
+    return verificacoes
+
+
+_VERIFICAR_CENA = compilar_esquema(ESQUEMA_CENA)
+_VERIFICAR_ROTEIRO = compilar_esquema(ESQUEMA_ROTEIRO)
+
+
+def validar_cena(cena: Any) -> List[str]:
+    """
+    Erros de uma cena (lista vazia = válida).
+    """
+    if not isinstance(cena, dict):
+        return ['cena não é um objeto']
+    
+    erros = [verificar(cena) for verificar in _VERIFICAR_CENA]
+    erros = [erro for erro in erros if erro]
+    
+    # Narrativa vazia é aceitável em cenas só com música ou silêncio
+    if cena.get('tipo_audio') in AUDIOS_SEM_NARRATIVA:
+        erros = [e for e in erros if not e.startswith("'narrativa'")]
+    
+    if 'duracao' in cena and parse_duracao(cena['duracao']) is None:
+        erros.append(f"'duracao' inválida: {cena['duracao']!r}")
+    
+    return erros
+
+
+def validar_roteiro(roteiro: Any) -> List[str]:
+    """
+    Erros do roteiro e de cada cena (lista vazia = válido).
+    
+    Args:
+        roteiro: Roteiro (dict) retornado pelo modelo
+    
+    Returns:
+        Mensagens de erro ("cena 3: 'narrativa' ausente", ...)
+    """
+    if not isinstance(roteiro, dict):
+        return ['roteiro não é um objeto']
+    
+    erros = [verificar(roteiro) for verificar in _VERIFICAR_ROTEIRO]
+    erros = [erro for erro in erros if erro]
+    
+    cenas = roteiro.get('cenas') if isinstance(roteiro.get('cenas'), list) else []
+    for i, cena in enumerate(cenas):
+        erros += [f"cena {i + 1}: {erro}" for erro in validar_cena(cena)]
+    
+    numeros = [c.get('numero') for c in cenas if isinstance(c, dict)]
+    if numeros and numeros != list(range(1, len(numeros) + 1)):
+        erros.append("cenas fora de sequência")
+    
+    return erros
+
+
+def _aplicar_esquema(obj: Dict, esquema: Dict[str, tuple]) -> List[str]:
+    """
+    Renomeia campos alternativos, converte tipos e preenche padrões.
+    
+    Returns:
+        Campos obrigatórios que continuam ausentes ou vazios
+    """
+    faltando = []
+    
+    for campo, (tipo, padrao, valores, alternativos) in esquema.items():
+        if campo not in obj or obj[campo] in (None, ''):
+            for alternativo in alternativos:
+                if obj.get(alternativo) not in (None, ''):
+                    obj[campo] = obj.pop(alternativo)
+                    break
+        
+        valor = obj.get(campo)
+        
+        if valor is not None and not isinstance(valor, tipo):
+            if tipo is list:
+                valor = [v.strip() for v in valor.split(',') if v.strip()] if isinstance(valor, str) else [valor]
+            elif tipo is str and isinstance(valor, (int, float)):
+                valor = str(valor)
+            elif tipo is str and isinstance(valor, list):
+                valor = '\n'.join(str(v) for v in valor)
+            elif tipo is int:
+                try:
+                    valor = int(float(str(valor).strip()))
+                except ValueError:
+                    valor = None
+            else:
+                valor = None
+        
+        if isinstance(valor, str):
+            valor = valor.strip()
+            if valores:
+                valor = normalizar_termo(valor)
+                if valor not in valores:
+                    valor = None
+        
+        if valor in (None, '') or (valores and valor not in valores):
+            if padrao is OBRIGATORIO:
+                faltando.append(campo)
+                obj.pop(campo, None)
+                continue
+            if padrao is not None:
+                valor = padrao.copy() if isinstance(padrao, (list, dict)) else padrao
+        
+        if valor is None:
+            obj.pop(campo, None)
+        else:
+            obj[campo] = valor
+    
+    return faltando
+
+
+def reparar_cena(cena: Any, duracao_padrao: float) -> Tuple[Optional[Dict], List[str]]:
+    """
+    Repara uma cena sem consultar o modelo.
+    
+    Args:
+        cena: Cena retornada pelo modelo
+        duracao_padrao: Duração usada quando a da cena é ilegível (segundos)
+    
+    Returns:
+        (cena reparada ou None se não é um objeto, campos que só o modelo
+        pode preencher)
+    """
+    if not isinstance(cena, dict):
+        return None, ['cena']
+    
+    cena = dict(cena)
+    faltando = _aplicar_esquema(cena, ESQUEMA_CENA)
+    
+    segundos = parse_duracao(cena.get('duracao'))
+    cena['duracao'] = formatar_duracao_cena(segundos or duracao_padrao)
+    
+    if 'narrativa' in faltando and cena.get('tipo_audio') in AUDIOS_SEM_NARRATIVA:
+        cena['narrativa'] = ''
+        faltando.remove('narrativa')
+    
+    # Sem descrição visual, a narrativa (ou o título) descreve a cena
+    if 'descricao_visual' in faltando and (cena.get('narrativa') or cena.get('titulo')):
+        cena['descricao_visual'] = cena.get('narrativa') or cena['titulo']
+        faltando.remove('descricao_visual')
+    
+    return cena, faltando
+
+
+def reparar_roteiro(
+    roteiro: Dict,
+    duracao_padrao: float = 12.0,
+    tema: Optional[str] = None,
+    num_cenas: Optional[int] = None
+) -> Tuple[Dict, List[int], List[str]]:
+    """
+    Repara o roteiro deterministicamente.
+    
+    Cenas são ordenadas pelo número original e renumeradas 1..n; durações
+    são normalizadas ("10 s", 10, "0:10" -> "10s"); tipos e valores
+    inválidos voltam ao padrão. Cenas que precisam de texto do modelo
+    (narrativa ausente) são mantidas na posição e listadas para novo pedido,
+    assim como as que faltam para completar num_cenas (JSON truncado).
+    
+    Args:
+        roteiro: Roteiro retornado pelo modelo
+        duracao_padrao: Duração das cenas com duração ilegível (segundos)
+        tema: Usado como título se o roteiro vier sem título
+        num_cenas: Número de cenas pedido (opcional)
+    
+    Returns:
+        (roteiro reparado, números das cenas a pedir de novo, correções aplicadas)
+    """
+    correcoes = []
+    roteiro = dict(roteiro) if isinstance(roteiro, dict) else {}
+    
+    faltando = _aplicar_esquema(roteiro, ESQUEMA_ROTEIRO)
+    if 'titulo' in faltando and tema:
+        roteiro['titulo'] = tema
+        correcoes.append("título ausente: usado o tema")
+    
+    cenas_originais = roteiro.get('cenas') or []
+    
+    # Ordem do modelo, desempatada pelo número que ele atribuiu
+    indexadas = []
+    for posicao, cena in enumerate(cenas_originais):
+        reparada, faltando_cena = reparar_cena(cena, duracao_padrao)
+        if reparada is None:
+            correcoes.append(f"cena na posição {posicao + 1} descartada (não é um objeto)")
+            continue
+        numero = reparada.get('numero')
+        indexadas.append((numero if isinstance(numero, int) else posicao + 1, posicao, reparada, faltando_cena))
+    
+    indexadas.sort(key=lambda item: (item[0], item[1]))
+    
+    cenas = []
+    quebradas = []
+    for novo_numero, (numero_original, _, cena, faltando_cena) in enumerate(indexadas, start=1):
+        if cena.get('numero') != novo_numero:
+            correcoes.append(f"cena {numero_original} renumerada para {novo_numero}")
+        cena['numero'] = novo_numero
+        cenas.append(cena)
+        if faltando_cena:
+            quebradas.append(novo_numero)
+    
+    # Cenas que não chegaram (resposta truncada)
+    if num_cenas and len(cenas) < num_cenas:
+        correcoes.append(f"{num_cenas - len(cenas)} cenas ausentes")
+        for numero in range(len(cenas) + 1, num_cenas + 1):
+            cenas.append({'numero': numero, 'duracao': formatar_duracao_cena(duracao_padrao)})
+            quebradas.append(numero)
+    
+    roteiro['cenas'] = cenas
+    return roteiro, quebradas, correcoes
+
+
+def carregar_json_parcial(texto: str) -> Dict:
+    """
+    json.loads tolerante a resposta truncada.
+    
+    Se o texto for cortado (limite de tokens), descarta o elemento
+    incompleto no fim e fecha as chaves/colchetes abertos, preservando
+    todas as cenas completas.
+    
+    Args:
+        texto: Conteúdo retornado pelo modelo
+    
+    Returns:
+        Objeto decodificado
+    
+    Raises:
+        ValueError: Se nada puder ser recuperado
+    """
+    try:
+        return json.loads(texto)
+    except json.JSONDecodeError:
+        pass
+    
+    pilha = []
+    ultimo_fechamento = None
+    em_string = False
+    escape = False
+    
+    for posicao, caractere in enumerate(texto):
+        if em_string:
+            if escape:
+                escape = False
+            elif caractere == '\\':
+                escape = True
+            elif caractere == '"':
+                em_string = False
+            continue
+        
+        if caractere == '"':
+            em_string = True
+        elif caractere in '{[':
+            pilha.append('}' if caractere == '{' else ']')
+        elif caractere in '}]' and pilha:
+            pilha.pop()
+            ultimo_fechamento = (posicao, list(pilha))
+    
+    if ultimo_fechamento is None:
+        raise ValueError("JSON sem nenhum objeto completo")
+    
+    posicao, abertos = ultimo_fechamento
+    recortado = texto[:posicao + 1].rstrip().rstrip(',') + ''.join(reversed(abertos))
+    
+    return json.loads(recortado)
+
+
+def exemplo_uso():
+    """
+    Exemplo de uso: reparo de um roteiro malformado.
+    """
+    resposta = (
+        '{"titulo": "O Rei Sábio", "cenas": ['
+        '{"numero": 2, "duracao": "10 s", "narrativa": "O rei ouviu as duas mães.", "tipo_cena": "Clímax"},'
+        '{"numero": 1, "duracao": 8, "texto": "Era uma vez um rei.", "descricao_visual": "Trono dourado"},'
+        '{"numero": 3, "duracao": "0:12", "descricao_visual": "Povo em festa"},'
+        '{"numero": 4, "duracao": "10s", "narrativa": "E todos'
+    )
+    
+    roteiro = carregar_json_parcial(resposta)
+    print(f"   Erros antes: {validar_roteiro(roteiro)}")
+    
+    roteiro, quebradas, correcoes = reparar_roteiro(roteiro, num_cenas=4)
+    for correcao in correcoes:
+        print(f"   🔧 {correcao}")
+    
+    for cena in roteiro['cenas']:
+        print(f"   Cena {cena['numero']}: {cena['duracao']} {cena.get('tipo_cena')} {cena.get('narrativa', '')!r}")
+    
+    print(f"   Pedir de novo: {quebradas}")
+
+
+if __name__ == '__main__':
+    exemplo_uso()
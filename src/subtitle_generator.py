@@ -0,0 +1,348 @@
+"""
+💬 SUBTITLE GENERATOR - ProjetoX
+
+Módulo responsável por gerar faixas de legenda (ASS/SRT) a partir da lista
+de legendas do projeto. As faixas são queimadas pelo filtro libass do ffmpeg
+durante o encode ou anexadas como faixa de legenda separada.
+"""
+
+import os
+from typing import Dict, List, Optional, Tuple
+
+# Imports locais
+try:
+    import sys
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import SUBTITLE_CONFIG, VIDEO_CONFIG
+    from src.utils import criar_diretorios
+except ImportError:
+    print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
+
+
+# Cores nomeadas aceitas na configuração
+CORES_NOMEADAS = {
+    'white': 'FFFFFF',
+    'black': '000000',
+    'yellow': 'FFFF00',
+    'red': 'FF0000',
+    'green': '00FF00',
+    'blue': '0000FF',
+}
+
+
+def legendas_de_timings(
+    timings_por_cena: Dict[int, Dict],
+    offsets: Dict[int, float],
+    max_caracteres: Optional[int] = None,
+    max_duracao: Optional[float] = None
+) -> List[Dict]:
+    """
+    Converte o timing das narrações em legendas na linha do tempo do vídeo.
+    
+    Cada frase é quebrada em blocos de até max_caracteres/max_duracao,
+    respeitando os limites de palavra.
+    
+    Args:
+        timings_por_cena: Dict mapeando número da cena -> timing
+                          (ver audio_generator.carregar_timing)
+        offsets: Dict mapeando número da cena -> início do áudio no vídeo (s)
+        max_caracteres: Máximo de caracteres por legenda
+        max_duracao: Duração máxima por legenda em segundos
+    
+    Returns:
+        Lista de legendas com 'texto', 'inicio', 'fim'
+    
+    Example:
+        >>> legendas = legendas_de_timings({1: timing}, {1: 0.0})
+    """
+    max_caracteres = max_caracteres or SUBTITLE_CONFIG.get('max_caracteres', 42)
+    max_duracao = max_duracao or SUBTITLE_CONFIG.get('max_duracao', 6.0)
+    
+    legendas = []
+    
+    for num_cena in sorted(timings_por_cena.keys()):
+        timing = timings_por_cena[num_cena]
+        if not timing or num_cena not in offsets:
+            continue
+        
+        offset = offsets[num_cena]
+        bloco = []
+        
+        for palavra in timing.get('palavras', []):
+            if bloco:
+                texto_bloco = ' '.join(p['texto'] for p in bloco + [palavra])
+                duracao_bloco = palavra['fim'] - bloco[0]['inicio']
+                fim_de_frase = bloco[-1]['texto'][-1:] in '.!?…'
+                
+                if fim_de_frase or len(texto_bloco) > max_caracteres or duracao_bloco > max_duracao:
+                    legendas.append(_legenda_de_bloco(bloco, offset))
+                    bloco = []
+            
+            bloco.append(palavra)
+        
+        if bloco:
+            legendas.append(_legenda_de_bloco(bloco, offset))
+    
+    return legendas
+
+
+def _legenda_de_bloco(bloco: List[Dict], offset: float) -> Dict:
+    """
+    Monta uma legenda a partir de um bloco de palavras.
+    """
+    return {
+        'texto': ' '.join(p['texto'] for p in bloco),
+        'inicio': round(offset + bloco[0]['inicio'], 3),
+        'fim': round(offset + bloco[-1]['fim'], 3)
+    }
+
+
+class SubtitleGenerator:
+    """
+    Gerador de faixas de legenda nos formatos ASS e SRT.
+    
+    Estilos idênticos são registrados uma única vez e legendas consecutivas
+    com o mesmo texto e estilo são fundidas em um único evento, para que o
+    renderizador não desenhe a mesma legenda duas vezes.
+    """
+    
+    def __init__(
+        self,
+        resolucao: Optional[Tuple[int, int]] = None,
+        estilo_padrao: Optional[Dict] = None
+    ):
+        """
+        Inicializa o gerador de legendas.
+        
+        Args:
+            resolucao: Resolução do vídeo (padrão: VIDEO_CONFIG['resolution'])
+            estilo_padrao: Sobrescreve campos de SUBTITLE_CONFIG
+        """
+        self.resolucao = resolucao or VIDEO_CONFIG.get('resolution', (1920, 1080))
+        self.estilo_padrao = dict(SUBTITLE_CONFIG)
+        if estilo_padrao:
+            self.estilo_padrao.update(estilo_padrao)
+        
+        # Cache de estilos: chave do estilo -> nome ASS
+        self._estilos: Dict[Tuple, str] = {}
+    
+    def preparar_eventos(self, legendas: List[Dict]) -> List[Dict]:
+        """
+        Ordena, valida e deduplica a lista de legendas.
+        
+        Args:
+            legendas: Lista de dicts com 'texto', 'inicio', 'fim' e
+                      opcionalmente 'estilo' (dict com campos de SUBTITLE_CONFIG)
+        
+        Returns:
+            Lista de eventos com 'texto', 'inicio', 'fim' e 'estilo' (nome ASS)
+        """
+        eventos = []
+        
+        for leg in sorted(legendas, key=lambda l: float(l.get('inicio', 0))):
+            texto = str(leg.get('texto', '')).strip()
+            inicio = float(leg.get('inicio', 0))
+            fim = float(leg.get('fim', inicio))
+            
+            if not texto or fim <= inicio:
+                continue
+            
+            nome_estilo = self._registrar_estilo(leg.get('estilo'))
+            
+            # Fundir com o evento anterior se for a mesma legenda contígua
+            if eventos:
+                anterior = eventos[-1]
+                if (
+                    anterior['texto'] == texto
+                    and anterior['estilo'] == nome_estilo
+                    and inicio <= anterior['fim'] + 0.05
+                ):
+                    anterior['fim'] = max(anterior['fim'], fim)
+                    continue
+            
+            eventos.append({
+                'texto': texto,
+                'inicio': inicio,
+                'fim': fim,
+                'estilo': nome_estilo
+            })
+        
+        return eventos
+    
+    def gerar_ass(self, legendas: List[Dict], caminho_saida: str) -> Optional[str]:
+        """
+        Gera um arquivo ASS (Advanced SubStation Alpha).
+        
+        Args:
+            legendas: Lista de dicts com 'texto', 'inicio', 'fim'
+            caminho_saida: Caminho do arquivo .ass
+        
+        Returns:
+            Caminho do arquivo gerado ou None
+        
+        Example:
+            >>> gen = SubtitleGenerator()
+            >>> gen.gerar_ass([{"texto": "Era uma vez...", "inicio": 0, "fim": 3}], "/tmp/v.ass")
+        """
+        eventos = self.preparar_eventos(legendas)
+        
+        if not eventos:
+            print("⚠️ Nenhuma legenda válida para gerar")
+            return None
+        
+        largura, altura = self.resolucao
+        
+        linhas = [
+            "[Script Info]",
+            "ScriptType: v4.00+",
+            f"PlayResX: {largura}",
+            f"PlayResY: {altura}",
+            "WrapStyle: 0",
+            "ScaledBorderAndShadow: yes",
+            "",
+            "[V4+ Styles]",
+            "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, "
+            "OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, "
+            "ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, "
+            "Alignment, MarginL, MarginR, MarginV, Encoding",
+        ]
+        
+        for chave, nome in self._estilos.items():
+            linhas.append(self._linha_estilo(nome, dict(chave)))
+        
+        linhas += [
+            "",
+            "[Events]",
+            "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+        ]
+        
+        for evento in eventos:
+            texto = evento['texto'].replace('\n', r'\N')
+            linhas.append(
+                f"Dialogue: 0,{self._tempo_ass(evento['inicio'])},"
+                f"{self._tempo_ass(evento['fim'])},{evento['estilo']},,0,0,0,,{texto}"
+            )
+        
+        return self._escrever(caminho_saida, linhas, len(eventos), 'ASS')
+    
+    def gerar_srt(self, legendas: List[Dict], caminho_saida: str) -> Optional[str]:
+        """
+        Gera um arquivo SRT (SubRip).
+        
+        Args:
+            legendas: Lista de dicts com 'texto', 'inicio', 'fim'
+            caminho_saida: Caminho do arquivo .srt
+        
+        Returns:
+            Caminho do arquivo gerado ou None
+        """
+        eventos = self.preparar_eventos(legendas)
+        
+        if not eventos:
+            print("⚠️ Nenhuma legenda válida para gerar")
+            return None
+        
+        linhas = []
+        for i, evento in enumerate(eventos, start=1):
+            linhas += [
+                str(i),
+                f"{self._tempo_srt(evento['inicio'])} --> {self._tempo_srt(evento['fim'])}",
+                evento['texto'],
+                "",
+            ]
+        
+        return self._escrever(caminho_saida, linhas, len(eventos), 'SRT')
+    
+    def _registrar_estilo(self, estilo: Optional[Dict]) -> str:
+        """
+        Registra um estilo (se ainda não existir) e retorna seu nome ASS.
+        
+        Args:
+            estilo: Campos que sobrescrevem o estilo padrão
+        
+        Returns:
+            Nome do estilo no arquivo ASS
+        """
+        campos = dict(self.estilo_padrao)
+        if estilo:
+            campos.update(estilo)
+        
+        chave = tuple(sorted(
+            (k, v) for k, v in campos.items()
+            if k in ('fonte', 'tamanho_fonte', 'cor_texto', 'cor_fundo',
+                     'caixa_fundo', 'contorno', 'margem_vertical')
+        ))
+        
+        if chave not in self._estilos:
+            self._estilos[chave] = 'Default' if not self._estilos else f"Estilo{len(self._estilos)}"
+        
+        return self._estilos[chave]
+    
+    def _linha_estilo(self, nome: str, estilo: Dict) -> str:
+        """
+        Monta a linha 'Style:' de um estilo ASS.
+        """
+        cor_texto = self._cor_ass(estilo.get('cor_texto', 'white'))
+        cor_fundo = self._cor_ass(estilo.get('cor_fundo', 'black'))
+        border_style = 3 if estilo.get('caixa_fundo', True) else 1
+        
+        return (
+            f"Style: {nome},{estilo.get('fonte', 'Arial')},{estilo.get('tamanho_fonte', 40)},"
+            f"{cor_texto},{cor_texto},{cor_fundo},{cor_fundo},0,0,0,0,100,100,0,0,"
+            f"{border_style},{estilo.get('contorno', 2)},0,2,20,20,"
+            f"{estilo.get('margem_vertical', 40)},1"
+        )
+    
+    @staticmethod
+    def _cor_ass(cor: str) -> str:
+        """
+        Converte uma cor (nome ou #RRGGBB) para o formato ASS (&H00BBGGRR).
+        """
+        hexa = CORES_NOMEADAS.get(str(cor).lower(), str(cor).lstrip('#')).upper()
+        if len(hexa) != 6:
+            hexa = 'FFFFFF'
+        return f"&H00{hexa[4:6]}{hexa[2:4]}{hexa[0:2]}"
+    
+    @staticmethod
+    def _tempo_ass(segundos: float) -> str:
+        """
+        Formata segundos como H:MM:SS.cc (centésimos).
+        """
+        centesimos = int(round(segundos * 100))
+        horas, resto = divmod(centesimos, 360000)
+        minutos, resto = divmod(resto, 6000)
+        segs, cs = divmod(resto, 100)
+        return f"{horas}:{minutos:02d}:{segs:02d}.{cs:02d}"
+    
+    @staticmethod
+    def _tempo_srt(segundos: float) -> str:
+        """
+        Formata segundos como HH:MM:SS,mmm.
+        """
+        millis = int(round(segundos * 1000))
+        horas, resto = divmod(millis, 3600000)
+        minutos, resto = divmod(resto, 60000)
+        segs, ms = divmod(resto, 1000)
+        return f"{horas:02d}:{minutos:02d}:{segs:02d},{ms:03d}"
+    
+    @staticmethod
+    def _escrever(caminho_saida: str, linhas: List[str], total: int, formato: str) -> Optional[str]:
+        """
+        Escreve as linhas do arquivo de legenda.
+        """
+        try:
+            diretorio = os.path.dirname(caminho_saida)
+            if diretorio:
+                criar_diretorios([diretorio])
+            
+            with open(caminho_saida, 'w', encoding='utf-8') as f:
+                f.write("\n".join(linhas) + "\n")
+            
+            print(f"✅ Legendas {formato} geradas: {total} eventos - {caminho_saida}")
+            return caminho_saida
+            
+        except Exception as e:
+            print(f"❌ Erro ao gerar legendas {formato}: {e}")
+            return None
@@ -0,0 +1,378 @@
+"""
+🎞️ TIMELINE - ProjetoX
+
+Linha do tempo única do vídeo final.
+
+Início, duração e transição de cada cena são calculados uma vez, em quadros
+inteiros, e usados para posicionar vídeo, áudio (em amostras), legendas e
+capítulos. Mudar a duração de uma cena recalcula apenas as cenas seguintes.
+"""
+
+import os
+from typing import Dict, List, Optional
+
+# Imports locais
+try:
+    import sys
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import VIDEO_CONFIG, AUDIO_CONFIG
+    from src.utils import salvar_json, carregar_json
+except ImportError:
+    print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
+
+
+class CenaTimeline:
+    """
+    Uma cena na linha do tempo (tempos em quadros).
+    
+    O espaço da cena vai de inicio a fim; o clipe de vídeo dura mais
+    'sobreposicao' quadros, cobertos pelo crossfade da cena seguinte.
+    """
+    
+    def __init__(
+        self,
+        numero: int,
+        quadros: int,
+        video: Optional[str] = None,
+        audio: Optional[str] = None,
+        titulo: Optional[str] = None,
+        atraso_audio: int = 0
+    ):
+        """
+        Args:
+            numero: Número da cena no roteiro
+            quadros: Duração do espaço da cena (quadros)
+            video: Caminho do vídeo da cena (None = quadro preto)
+            audio: Caminho do áudio da cena (None = silêncio, mantendo o espaço)
+            titulo: Título da cena (capítulos)
+            atraso_audio: Início do áudio em relação ao início da cena (quadros)
+        """
+        self.numero = numero
+        self.quadros = quadros
+        self.video = video
+        self.audio = audio
+        self.titulo = titulo
+        self.atraso_audio = atraso_audio
+        
+        # Preenchidos por Timeline.recalcular
+        self.inicio = 0
+        self.sobreposicao = 0
+    
+    @property
+    def fim(self) -> int:
+        """
+        Quadro em que a próxima cena começa.
+        """
+        return self.inicio + self.quadros
+    
+    @property
+    def quadros_clipe(self) -> int:
+        """
+        Duração do clipe de vídeo, incluindo a transição para a cena seguinte.
+        """
+        return self.quadros + self.sobreposicao
+    
+    def para_dict(self, fps: float) -> Dict:
+        """
+        Representação em segundos (JSON).
+        """
+        return {
+            'numero': self.numero,
+            'titulo': self.titulo,
+            'inicio': self.inicio / fps,
+            'fim': self.fim / fps,
+            'duracao': self.quadros / fps,
+            'sobreposicao': self.sobreposicao / fps,
+            'inicio_audio': (self.inicio + self.atraso_audio) / fps if self.audio else None,
+            'video': self.video,
+            'audio': self.audio,
+        }
+
+
+class Timeline:
+    """
+    Linha do tempo do vídeo: cenas em sequência com crossfade entre elas.
+    
+    Example:
+        >>> timeline = Timeline.montar(
+        ...     duracoes={1: 9.8, 2: 12.4},
+        ...     videos={1: "cena1.mp4", 2: "cena2.mp4"},
+        ...     audios={1: "cena1.wav"}
+        ... )
+        >>> timeline.inicio(2), timeline.amostra_audio(1)
+        (9.8, 0)
+    """
+    
+    def __init__(
+        self,
+        fps: Optional[float] = None,
+        taxa: Optional[int] = None,
+        transicao: Optional[float] = None
+    ):
+        """
+        Args:
+            fps: Quadros por segundo (padrão: VIDEO_CONFIG['fps'])
+            taxa: Taxa de amostragem do áudio (padrão: AUDIO_CONFIG['sample_rate'])
+            transicao: Duração do crossfade entre cenas em segundos
+                       (padrão: VIDEO_CONFIG['transicao_segundos'])
+        """
+        self.fps = fps or VIDEO_CONFIG.get('fps', 30)
+        self.taxa = taxa or AUDIO_CONFIG.get('sample_rate', 44100)
+        if transicao is None:
+            transicao = VIDEO_CONFIG.get('transicao_segundos', 0.5)
+        self.quadros_transicao = self.quadros(transicao)
+        
+        self.cenas: List[CenaTimeline] = []
+        self._indices: Dict[int, int] = {}
+    
+    @classmethod
+    def montar(
+        cls,
+        duracoes: Dict[int, float],
+        videos: Optional[Dict[int, str]] = None,
+        audios: Optional[Dict[int, str]] = None,
+        titulos: Optional[Dict[int, str]] = None,
+        fps: Optional[float] = None,
+        taxa: Optional[int] = None,
+        transicao: Optional[float] = None
+    ) -> 'Timeline':
+        """
+        Monta a linha do tempo a partir dos dicts por cena do pipeline.
+        
+        Todas as cenas com duração entram, tenham ou não vídeo e áudio: uma
+        cena sem narração mantém seu espaço em vez de adiantar as seguintes.
+        
+        Args:
+            duracoes: Número da cena -> duração em segundos
+            videos: Número da cena -> vídeo
+            audios: Número da cena -> áudio
+            titulos: Número da cena -> título
+            fps: Quadros por segundo
+            taxa: Taxa de amostragem do áudio
+            transicao: Duração do crossfade (segundos)
+        
+        Returns:
+            Timeline calculada
+        """
+        timeline = cls(fps=fps, taxa=taxa, transicao=transicao)
+        
+        videos = chaves_numericas(videos)
+        audios = chaves_numericas(audios)
+        titulos = chaves_numericas(titulos)
+        
+        for numero, duracao in sorted(chaves_numericas(duracoes).items()):
+            timeline.cenas.append(CenaTimeline(
+                numero=numero,
+                quadros=max(1, timeline.quadros(duracao)),
+                video=videos.get(numero),
+                audio=audios.get(numero),
+                titulo=titulos.get(numero)
+            ))
+        
+        timeline.recalcular()
+        return timeline
+    
+    def quadros(self, segundos: float) -> int:
+        """
+        Segundos arredondados para quadros inteiros.
+        """
+        return int(round(segundos * self.fps))
+    
+    def recalcular(self, a_partir: int = 0) -> None:
+        """
+        Recalcula inícios e transições a partir de um índice (O(n) no pior caso).
+        
+        Args:
+            a_partir: Índice da primeira cena alterada
+        """
+        self._indices = {cena.numero: i for i, cena in enumerate(self.cenas)}
+        
+        inicio = self.cenas[a_partir - 1].fim if a_partir > 0 else 0
+        ultima = len(self.cenas) - 1
+        
+        for i in range(a_partir, len(self.cenas)):
+            cena = self.cenas[i]
+            cena.inicio = inicio
+            
+            # Crossfade só entre cenas, limitado à duração da seguinte
+            if i < ultima:
+                cena.sobreposicao = min(self.quadros_transicao, self.cenas[i + 1].quadros)
+            else:
+                cena.sobreposicao = 0
+            
+            inicio = cena.fim
+        
+        # A cena anterior à primeira alterada pode ter outra transição
+        if a_partir > 0:
+            anterior = self.cenas[a_partir - 1]
+            anterior.sobreposicao = min(self.quadros_transicao, self.cenas[a_partir].quadros)
+    
+    def definir_duracao(self, numero: int, segundos: float) -> None:
+        """
+        Altera a duração de uma cena e desloca as seguintes.
+        
+        Args:
+            numero: Número da cena
+            segundos: Nova duração
+        """
+        indice = self._indices[numero]
+        self.cenas[indice].quadros = max(1, self.quadros(segundos))
+        self.recalcular(indice)
+    
+    def cena(self, numero: int) -> CenaTimeline:
+        """
+        Cena pelo número do roteiro.
+        """
+        return self.cenas[self._indices[numero]]
+    
+    def segundos(self, quadros: int) -> float:
+        """
+        Quadros convertidos para segundos.
+        """
+        return quadros / self.fps
+    
+    def inicio(self, numero: int) -> float:
+        """
+        Início da cena no vídeo (segundos).
+        """
+        return self.segundos(self.cena(numero).inicio)
+    
+    def amostra_audio(self, numero: int) -> int:
+        """
+        Amostra em que o áudio da cena começa (exata para taxa múltipla do fps).
+        """
+        cena = self.cena(numero)
+        return int(round((cena.inicio + cena.atraso_audio) * self.taxa / self.fps))
+    
+    @property
+    def duracao(self) -> float:
+        """
+        Duração total do vídeo (segundos).
+        """
+        return self.segundos(self.cenas[-1].fim) if self.cenas else 0.0
+    
+    def offsets_audio(self) -> Dict[int, float]:
+        """
+        Início do áudio de cada cena com áudio (segundos, alinhado à amostra).
+        """
+        return {
+            cena.numero: self.amostra_audio(cena.numero) / self.taxa
+            for cena in self.cenas if cena.audio
+        }
+    
+    def capitulos(self) -> List[Dict]:
+        """
+        Capítulos do vídeo: uma entrada por cena com título.
+        
+        Returns:
+            Lista de dicts com 'inicio' (segundos) e 'titulo'
+        """
+        return [
+            {'inicio': self.segundos(cena.inicio), 'titulo': cena.titulo}
+            for cena in self.cenas if cena.titulo
+        ]
+    
+    def para_dict(self) -> Dict:
+        """
+        Representação em segundos (JSON).
+        """
+        return {
+            'fps': self.fps,
+            'taxa': self.taxa,
+            'transicao': self.segundos(self.quadros_transicao),
+            'duracao': self.duracao,
+            'cenas': [cena.para_dict(self.fps) for cena in self.cenas],
+        }
+    
+    def salvar(self, caminho: str) -> bool:
+        """
+        Salva a linha do tempo em JSON.
+        """
+        return salvar_json(self.para_dict(), caminho)
+    
+    @classmethod
+    def carregar(cls, caminho: str) -> Optional['Timeline']:
+        """
+        Carrega uma linha do tempo salva com salvar().
+        
+        Returns:
+            Timeline ou None se o arquivo não existir
+        """
+        dados = carregar_json(caminho) if os.path.exists(caminho) else None
+        if not dados:
+            return None
+        
+        timeline = cls(fps=dados['fps'], taxa=dados['taxa'], transicao=dados['transicao'])
+        for item in dados['cenas']:
+            cena = CenaTimeline(
+                numero=item['numero'],
+                quadros=timeline.quadros(item['duracao']),
+                video=item.get('video'),
+                audio=item.get('audio'),
+                titulo=item.get('titulo')
+            )
+            if item.get('inicio_audio') is not None:
+                cena.atraso_audio = timeline.quadros(item['inicio_audio'] - item['inicio'])
+            timeline.cenas.append(cena)
+        
+        timeline.recalcular()
+        return timeline
+
+
+def caminho_timeline(caminho_video: str) -> str:
+    """
+    Caminho do JSON da linha do tempo salvo ao lado de um vídeo.
+    
+    Args:
+        caminho_video: Caminho do vídeo (ex: projeto_final.mp4)
+    
+    Returns:
+        Caminho do JSON (ex: projeto_final.timeline.json)
+    """
+    return os.path.splitext(caminho_video)[0] + '.timeline.json'
+
+
+def chaves_numericas(dados: Optional[Dict]) -> Dict[int, object]:
+    """
+    Converte as chaves de um dict por cena para int.
+    
+    Checkpoints salvos em JSON trazem as chaves como str ("1", "2"...).
+    
+    Args:
+        dados: Dict número da cena -> valor (ou None)
+    
+    Returns:
+        Dict com chaves int
+    """
+    return {int(chave): valor for chave, valor in (dados or {}).items()}
+
+
+def exemplo_uso():
+    """
+    Exemplo de uso da Timeline.
+    """
+    timeline = Timeline.montar(
+        duracoes={1: 9.83, 2: 4.0, 3: 12.41},
+        videos={1: "cena1.mp4", 2: "cena2.mp4", 3: "cena3.mp4"},
+        audios={1: "cena1.wav", 3: "cena3.wav"},
+        titulos={1: "Abertura", 3: "O julgamento"}
+    )
+    
+    for cena in timeline.cenas:
+        print(
+            f"   Cena {cena.numero}: {timeline.segundos(cena.inicio):7.3f}s → "
+            f"{timeline.segundos(cena.fim):7.3f}s (clipe {timeline.segundos(cena.quadros_clipe):.3f}s)"
+        )
+    
+    print(f"   Áudio: {timeline.offsets_audio()}")
+    
+    # Editar uma cena desloca apenas as seguintes
+    timeline.definir_duracao(2, 6.0)
+    print(f"   Após editar a cena 2: {timeline.offsets_audio()} ({timeline.duracao:.3f}s)")
+    print(f"   Capítulos: {timeline.capitulos()}")
+
+
+if __name__ == '__main__':
+    exemplo_uso()
@@ -8,36 +8,24 @@ import os
 import sys
 import json
 import time
+import shutil
 import logging
 import hashlib
-import requests
+import subprocess
+import importlib.util
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 import base64
 from io import BytesIO
 
-# Imports condicionais (podem não estar disponíveis em todos ambientes)
-try:
-    from PIL import Image
-    PILLOW_AVAILABLE = True
-except ImportError:
-    PILLOW_AVAILABLE = False
-
-try:
-    import numpy as np
-    NUMPY_AVAILABLE = True
-except ImportError:
-    NUMPY_AVAILABLE = False
-
-try:
-    from rich.console import Console
-    from rich.progress import Progress, SpinnerColumn, TextColumn
-    RICH_AVAILABLE = True
-    console = Console()
-except ImportError:
-    RICH_AVAILABLE = False
-    console = None
+# Dependências opcionais: a disponibilidade é verificada sem importar; os
+# módulos (requests, Pillow, rich) são carregados só nas funções que os usam
+PILLOW_AVAILABLE = importlib.util.find_spec('PIL') is not None
+NUMPY_AVAILABLE = importlib.util.find_spec('numpy') is not None
+RICH_AVAILABLE = importlib.util.find_spec('rich') is not None
+console = None
 
 
 # ============================================================================
@@ -112,6 +100,24 @@ def get_tamanho_arquivo_mb(caminho: str) -> float:
     return tamanho_bytes / (1024 * 1024)
 
 
+def hash_arquivo(caminho: str, tamanho_bloco: int = 1 << 20) -> str:
+    """
+    Calcula o SHA-256 do conteúdo de um arquivo.
+    
+    Args:
+        caminho: Caminho do arquivo
+        tamanho_bloco: Tamanho do bloco de leitura em bytes
+    
+    Returns:
+        Hash em hexadecimal
+    """
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
 def gerar_nome_arquivo_unico(prefixo: str, extensao: str, diretorio: str = '/tmp') -> str:
     """
     Gera um nome de arquivo único com timestamp.
@@ -157,6 +163,8 @@ def download_arquivo(url: str, destino: str, timeout: int = 300) -> bool:
     Example:
         >>> download_arquivo('https://example.com/video.mp4', '/tmp/video.mp4')
     """
+    import requests
+    
     try:
         print(f"⬇️ Baixando: {url}")
         
@@ -209,6 +217,8 @@ def upload_para_imgur(caminho_imagem: str, client_id: Optional[str] = None) -> O
         print(f"❌ Arquivo não encontrado: {caminho_imagem}")
         return None
     
+    import requests
+    
     try:
         with open(caminho_imagem, 'rb') as f:
             image_data = base64.b64encode(f.read()).decode()
@@ -267,22 +277,18 @@ def redimensionar_imagem(
         print("❌ Pillow não disponível")
         return False
     
-    try:
-        img = Image.open(caminho_entrada)
-        
-        if manter_aspecto:
-            img.thumbnail((largura, altura), Image.Resampling.LANCZOS)
-        else:
-            img = img.resize((largura, altura), Image.Resampling.LANCZOS)
-        
-        img.save(caminho_saida, quality=95, optimize=True)
-        
+    resultado = _processar_origem(caminho_entrada, [{
+        'saida': caminho_saida,
+        'operacoes': [{'op': 'redimensionar', 'largura': largura, 'altura': altura,
+                       'manter_aspecto': manter_aspecto}],
+    }])[0]
+    
+    if resultado['sucesso']:
         print(f"✅ Imagem redimensionada: {largura}x{altura}")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Erro ao redimensionar: {e}")
-        return False
+    else:
+        print(f"❌ Erro ao redimensionar: {resultado['erro']}")
+    
+    return resultado['sucesso']
 
 
 def converter_formato_imagem(caminho_entrada: str, caminho_saida: str, formato: str = 'PNG') -> bool:
@@ -301,21 +307,236 @@ def converter_formato_imagem(caminho_entrada: str, caminho_saida: str, formato:
         print("❌ Pillow não disponível")
         return False
     
+    resultado = _processar_origem(caminho_entrada, [{
+        'saida': caminho_saida,
+        'formato': formato,
+    }])[0]
+    
+    if resultado['sucesso']:
+        print(f"✅ Imagem convertida para {formato}")
+    else:
+        print(f"❌ Erro na conversão: {resultado['erro']}")
+    
+    return resultado['sucesso']
+
+
+def transformar_imagens_lote(
+    jobs: List[Dict],
+    max_workers: Optional[int] = None
+) -> List[Dict]:
+    """
+    Aplica transformações a muitas imagens em paralelo (pool de processos).
+    
+    Jobs com a mesma imagem de entrada são processados juntos: a imagem é
+    aberta e decodificada uma única vez, já reduzida (draft/reduce) para o
+    maior tamanho pedido entre as saídas.
+    
+    Args:
+        jobs: Lista de dicts com:
+              - 'entrada': caminho da imagem original
+              - 'saida': caminho da imagem gerada
+              - 'operacoes': lista de operações (opcional), cada uma um dict:
+                  {'op': 'redimensionar', 'largura', 'altura', 'manter_aspecto'}
+                  {'op': 'recortar', 'largura', 'altura'}  (preenche e corta o excesso)
+                  {'op': 'modo', 'modo': 'RGB'}
+              - 'formato': formato de saída (opcional, padrão pela extensão)
+              - 'qualidade': qualidade 0-100 (opcional, padrão 95)
+              - 'otimizar': passada extra de otimização (opcional, padrão False)
+        max_workers: Número de processos (padrão: os.cpu_count())
+    
+    Returns:
+        Lista de resultados na ordem dos jobs, com 'saida', 'sucesso',
+        'tempo_ms' e 'erro'
+    
+    Example:
+        >>> jobs = [{'entrada': f"cena_{i}.png", 'saida': f"cena_{i}.webp",
+        ...          'operacoes': [{'op': 'recortar', 'largura': 1024, 'altura': 576}]}
+        ...         for i in range(50)]
+        >>> resultados = transformar_imagens_lote(jobs)
+    """
+    if not PILLOW_AVAILABLE:
+        print("❌ Pillow não disponível")
+        return [{'saida': j.get('saida'), 'sucesso': False, 'tempo_ms': 0.0,
+                 'erro': 'Pillow não disponível'} for j in jobs]
+    
+    inicio = time.time()
+    
+    # Agrupar por imagem de entrada, guardando a posição original
+    grupos: Dict[str, List[int]] = {}
+    for indice, job in enumerate(jobs):
+        grupos.setdefault(job['entrada'], []).append(indice)
+    
+    resultados: List[Optional[Dict]] = [None] * len(jobs)
+    
+    def registrar(indices, saidas):
+        for indice, resultado in zip(indices, saidas):
+            resultados[indice] = resultado
+    
+    if len(grupos) == 1:
+        # Um único arquivo de origem: não compensa subir processos
+        entrada, indices = next(iter(grupos.items()))
+        registrar(indices, _processar_origem(entrada, [jobs[i] for i in indices]))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futuros = {
+                executor.submit(_processar_origem, entrada, [jobs[i] for i in indices]): indices
+                for entrada, indices in grupos.items()
+            }
+            for futuro in as_completed(futuros):
+                indices = futuros[futuro]
+                try:
+                    registrar(indices, futuro.result())
+                except Exception as e:
+                    registrar(indices, [{'saida': jobs[i].get('saida'), 'sucesso': False,
+                                         'tempo_ms': 0.0, 'erro': str(e)} for i in indices])
+    
+    sucesso = sum(1 for r in resultados if r and r['sucesso'])
+    print(f"✅ {sucesso}/{len(jobs)} imagens transformadas em {time.time() - inicio:.2f}s "
+          f"({len(grupos)} originais)")
+    
+    for r in resultados:
+        if r and not r['sucesso']:
+            print(f"   ❌ {r['saida']}: {r['erro']}")
+    
+    return resultados
+
+
+def transformar_imagem(job: Dict) -> Dict:
+    """
+    Aplica um job de transformar_imagens_lote no processo atual.
+    
+    Para uma única saída não compensa subir o pool de processos; as
+    operações e o resultado são os mesmos do lote, sem impressão.
+    
+    Args:
+        job: Dict no formato dos jobs de transformar_imagens_lote
+    
+    Returns:
+        Dict com 'saida', 'sucesso', 'tempo_ms' e 'erro'
+    """
+    if not PILLOW_AVAILABLE:
+        return {'saida': job.get('saida'), 'sucesso': False, 'tempo_ms': 0.0,
+                'erro': 'Pillow não disponível'}
+    
+    return _processar_origem(job['entrada'], [job])[0]
+
+
+def _processar_origem(caminho_entrada: str, jobs: List[Dict]) -> List[Dict]:
+    """
+    Abre uma imagem uma vez e gera todas as saídas pedidas a partir dela.
+    
+    Executada nos processos do pool, por isso não imprime nada.
+    """
+    from PIL import Image
+    
+    resultados = []
+    
     try:
-        img = Image.open(caminho_entrada)
+        img_origem = Image.open(caminho_entrada)
         
-        # Converter RGBA para RGB se salvando em JPEG
-        if formato.upper() == 'JPEG' and img.mode == 'RGBA':
-            img = img.convert('RGB')
+        # Decodificação reduzida (JPEG) para o maior tamanho pedido; só é
+        # possível quando todas as saídas são reduções
+        alvos = []
+        for job in jobs:
+            reducoes = [op for op in job.get('operacoes', []) if op.get('op') in ('redimensionar', 'recortar')]
+            alvos.append((reducoes[0]['largura'], reducoes[0]['altura']) if reducoes else None)
         
-        img.save(caminho_saida, format=formato, quality=95)
+        if all(alvos):
+            img_origem.draft(img_origem.mode, (max(a[0] for a in alvos), max(a[1] for a in alvos)))
         
-        print(f"✅ Imagem convertida para {formato}")
-        return True
+        img_origem.load()
+        
+        # Orientação EXIF (fotos de celular) aplicada antes das operações
+        if img_origem.getexif().get(0x0112, 1) != 1:
+            from PIL import ImageOps
+            transposta = ImageOps.exif_transpose(img_origem)
+            img_origem.close()
+            img_origem = transposta
         
     except Exception as e:
-        print(f"❌ Erro na conversão: {e}")
-        return False
+        return [{'saida': j.get('saida'), 'sucesso': False, 'tempo_ms': 0.0, 'erro': str(e)} for j in jobs]
+    
+    with img_origem:
+        for job in jobs:
+            inicio = time.perf_counter()
+            try:
+                img = img_origem
+                for operacao in job.get('operacoes', []):
+                    img = _aplicar_operacao_imagem(img, operacao)
+                
+                _salvar_imagem(img, job['saida'], job.get('formato'),
+                               job.get('qualidade', 95), job.get('otimizar', False))
+                resultados.append({'saida': job['saida'], 'sucesso': True, 'erro': None,
+                                   'tempo_ms': round((time.perf_counter() - inicio) * 1000, 1)})
+            except Exception as e:
+                resultados.append({'saida': job.get('saida'), 'sucesso': False, 'erro': str(e),
+                                   'tempo_ms': round((time.perf_counter() - inicio) * 1000, 1)})
+    
+    return resultados
+
+
+def _aplicar_operacao_imagem(img: 'Image.Image', operacao: Dict) -> 'Image.Image':
+    """
+    Aplica uma operação e retorna uma nova imagem (a original não é alterada).
+    
+    Reduções grandes usam reducing_gap: o Pillow reduz por fator inteiro
+    (reduce) antes do LANCZOS final, que então trabalha em poucos pixels.
+    """
+    from PIL import Image
+    
+    tipo = operacao.get('op')
+    
+    if tipo == 'modo':
+        return img.convert(operacao['modo'])
+    
+    largura, altura = operacao['largura'], operacao['altura']
+    
+    if tipo == 'redimensionar':
+        if operacao.get('manter_aspecto', True):
+            escala = min(largura / img.width, altura / img.height, 1.0)
+            largura = max(1, round(img.width * escala))
+            altura = max(1, round(img.height * escala))
+        return img.resize((largura, altura), Image.Resampling.LANCZOS, reducing_gap=2.0)
+    
+    if tipo == 'recortar':
+        # Maior caixa central com a proporção do destino
+        escala = max(largura / img.width, altura / img.height)
+        largura_caixa, altura_caixa = largura / escala, altura / escala
+        esquerda = (img.width - largura_caixa) / 2
+        topo = (img.height - altura_caixa) / 2
+        caixa = (esquerda, topo, esquerda + largura_caixa, topo + altura_caixa)
+        return img.resize((largura, altura), Image.Resampling.LANCZOS, box=caixa, reducing_gap=2.0)
+    
+    raise ValueError(f"Operação de imagem desconhecida: {tipo}")
+
+
+def _salvar_imagem(
+    img: 'Image.Image',
+    caminho_saida: str,
+    formato: Optional[str] = None,
+    qualidade: int = 95,
+    otimizar: bool = False
+) -> None:
+    """
+    Salva uma imagem, convertendo o modo quando o formato exigir.
+    """
+    from PIL import Image
+    
+    formato = (formato or Image.registered_extensions().get(
+        os.path.splitext(caminho_saida)[1].lower(), 'PNG'
+    )).upper()
+    
+    if formato == 'JPG':
+        formato = 'JPEG'
+    
+    if formato == 'JPEG' and img.mode not in ('RGB', 'L'):
+        img = img.convert('RGB')
+    
+    diretorio = os.path.dirname(caminho_saida)
+    if diretorio:
+        os.makedirs(diretorio, exist_ok=True)
+    
+    img.save(caminho_saida, format=formato, quality=qualidade, optimize=otimizar)
 
 
 # ============================================================================
@@ -550,7 +771,12 @@ def print_colorido(texto: str, cor: str = 'green', negrito: bool = False) -> Non
         cor: Cor (green, red, yellow, blue, magenta, cyan)
         negrito: Texto em negrito
     """
-    if RICH_AVAILABLE and console:
+    global console
+    
+    if RICH_AVAILABLE:
+        if console is None:
+            from rich.console import Console
+            console = Console()
         estilo = f"bold {cor}" if negrito else cor
         console.print(texto, style=estilo)
     else:
@@ -617,6 +843,78 @@ def carregar_checkpoint(nome: str, diretorio: str = '/tmp/checkpoints') -> Optio
         return None
 
 
+# ============================================================================
+# ⏱️ FUNÇÕES DE TEMPO DE IMPORTAÇÃO
+# ============================================================================
+
+# Módulos pesados que não devem ser carregados só por importar o pacote
+MODULOS_PESADOS = (
+    'openai', 'elevenlabs', 'replicate', 'moviepy', 'pydub',
+    'requests', 'PIL', 'numpy', 'rich',
+)
+
+
+def medir_importacao(modulo: str = 'src.pipeline', orcamento_ms: Optional[float] = None) -> Dict:
+    """
+    Mede o tempo de importação de um módulo em um processo limpo.
+    
+    Usa 'python -X importtime' e lista quais MODULOS_PESADOS foram
+    carregados como efeito colateral da importação.
+    
+    Args:
+        modulo: Módulo a importar
+        orcamento_ms: Tempo máximo aceito (padrão: PERFORMANCE_CONFIG)
+    
+    Returns:
+        Dict com 'tempo_ms', 'pesados_carregados' e 'dentro_orcamento'
+    
+    Example:
+        >>> resultado = medir_importacao('src.pipeline')
+        >>> assert resultado['dentro_orcamento'], resultado
+    """
+    if orcamento_ms is None:
+        from config.settings import PERFORMANCE_CONFIG
+        orcamento_ms = PERFORMANCE_CONFIG.get('orcamento_importacao_ms', 150)
+    
+    codigo = (
+        f"import sys, {modulo}; "
+        f"print(','.join(m for m in {MODULOS_PESADOS!r} if m in sys.modules))"
+    )
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    
+    processo = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', codigo],
+        cwd=raiz, capture_output=True, text=True
+    )
+    
+    if processo.returncode != 0:
+        print(f"❌ Erro ao importar {modulo}:\n{processo.stderr[-2000:]}")
+        return {'tempo_ms': None, 'pesados_carregados': [], 'dentro_orcamento': False}
+    
+    # Linhas: "import time: self [us] | cumulative | imported package"
+    tempo_us = 0
+    for linha in processo.stderr.splitlines():
+        partes = [p.strip() for p in linha.split('|')]
+        if len(partes) == 3 and partes[2] == modulo:
+            tempo_us = int(partes[1])
+    
+    carregados = [m for m in processo.stdout.strip().split(',') if m]
+    tempo_ms = tempo_us / 1000
+    
+    resultado = {
+        'tempo_ms': round(tempo_ms, 1),
+        'pesados_carregados': carregados,
+        'dentro_orcamento': tempo_ms <= orcamento_ms and not carregados,
+    }
+    
+    status = "✅" if resultado['dentro_orcamento'] else "⚠️"
+    print(f"{status} import {modulo}: {tempo_ms:.1f} ms (orçamento {orcamento_ms:.0f} ms)")
+    if carregados:
+        print(f"   Módulos pesados carregados: {', '.join(carregados)}")
+    
+    return resultado
+
+
 # ============================================================================
 # 🧹 FUNÇÕES DE LIMPEZA
 # ============================================================================
@@ -663,8 +961,8 @@ def validar_configuracao_projeto(config: Dict) -> bool:
             return False
     
     # Validações específicas
-    if config['duracao_minutos'] < 1 or config['duracao_minutos'] > 30:
-        print("❌ Duração deve estar entre 1 e 30 minutos")
+    if config['duracao_minutos'] < 1 or config['duracao_minutos'] > 60:
+        print("❌ Duração deve estar entre 1 e 60 minutos")
         return False
     
     if config['idioma'] not in ['pt-br', 'en', 'es']:
@@ -746,6 +1044,91 @@ def calcular_numero_cenas(duracao_minutos: int, duracao_cena_segundos: int = 10)
     return max(5, min(50, num_cenas))  # Entre 5 e 50 cenas
 
 
+# ============================================================================
+# 🎞️ FUNÇÕES DE FFMPEG
+# ============================================================================
+
+def ffmpeg_disponivel() -> bool:
+    """
+    Verifica se os binários ffmpeg e ffprobe estão no PATH.
+    
+    Returns:
+        True se ambos estiverem disponíveis
+    """
+    return shutil.which('ffmpeg') is not None and shutil.which('ffprobe') is not None
+
+
+def executar_ffmpeg(argumentos: List[str], descricao: str = "ffmpeg") -> bool:
+    """
+    Executa o ffmpeg com saída silenciosa, sobrescrevendo arquivos existentes.
+    
+    Args:
+        argumentos: Argumentos do ffmpeg (sem o executável)
+        descricao: Descrição usada nas mensagens de erro
+    
+    Returns:
+        True se o comando terminou com sucesso
+    
+    Example:
+        >>> executar_ffmpeg(['-i', 'entrada.mp4', '-c', 'copy', 'saida.mkv'])
+    """
+    comando = ['ffmpeg', '-y', '-hide_banner', '-loglevel', 'error'] + list(argumentos)
+    
+    try:
+        resultado = subprocess.run(comando, capture_output=True, text=True)
+    except FileNotFoundError:
+        print("❌ ffmpeg não encontrado no PATH")
+        return False
+    
+    if resultado.returncode != 0:
+        print(f"❌ Erro no {descricao}: {resultado.stderr.strip()[-500:]}")
+        return False
+    
+    return True
+
+
+def obter_duracao_midia(caminho: str) -> Optional[float]:
+    """
+    Retorna a duração de um arquivo de áudio/vídeo usando ffprobe.
+    
+    Args:
+        caminho: Caminho do arquivo
+    
+    Returns:
+        Duração em segundos ou None se não for possível medir
+    """
+    comando = [
+        'ffprobe', '-v', 'error',
+        '-show_entries', 'format=duration',
+        '-of', 'default=noprint_wrappers=1:nokey=1',
+        caminho
+    ]
+    
+    try:
+        resultado = subprocess.run(comando, capture_output=True, text=True)
+        return float(resultado.stdout.strip())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def escapar_caminho_filtro(caminho: str) -> str:
+    """
+    Escapa um caminho para uso dentro de um filtro do ffmpeg (ex: ass=...).
+    
+    Args:
+        caminho: Caminho do arquivo
+    
+    Returns:
+        Caminho escapado
+    """
+    return (
+        caminho.replace('\\', '/')
+        .replace(':', r'\:')
+        .replace("'", r"\'")
+        .replace(',', r'\,')
+    )
+
+
 if __name__ == '__main__':
     print("🔧 ProjetoX Utils - Teste de Funções")
     print(f"Pillow disponível: {PILLOW_AVAILABLE}")
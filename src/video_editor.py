@@ -7,21 +7,24 @@ Módulo responsável por editar e montar o vídeo final usando MoviePy.
 import os
 import time
 from typing import Dict, List, Optional, Tuple
-from moviepy.editor import (
-    VideoFileClip, AudioFileClip, CompositeVideoClip,
-    concatenate_videoclips, CompositeAudioClip, TextClip,
-    concatenate_audioclips
-)
 
 # Imports locais
 try:
     import sys
-    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-    from config.settings import VIDEO_CONFIG, AUDIO_CONFIG
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import VIDEO_CONFIG, AUDIO_CONFIG, SUBTITLE_CONFIG, get_render_profile
     from src.utils import (
         criar_diretorios, get_tamanho_arquivo_mb,
-        formatar_duracao
+        formatar_duracao, ffmpeg_disponivel, executar_ffmpeg,
+        escapar_caminho_filtro
     )
+    from src.subtitle_generator import SubtitleGenerator, legendas_de_timings
+    from src.encoder_benchmark import carregar_perfil_encoder, argumentos_encoder
+    from src.pcm_cache import obter_cache_pcm
+    from src.audio_processing import mixar
+    from src.timeline import Timeline, caminho_timeline
 except ImportError:
     print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
 
@@ -33,26 +36,51 @@ class VideoEditor:
     Monta o vídeo final combinando cenas, áudio e efeitos.
     """
     
-    def __init__(self, output_dir: str = '/tmp/videos_finais'):
+    def __init__(self, output_dir: str = '/tmp/videos_finais', perfil: str = 'final'):
         """
         Inicializa o editor de vídeo.
         
         Args:
             output_dir: Diretório para vídeos finais
+            perfil: Perfil de renderização ('final' ou 'rascunho')
         """
         self.output_dir = output_dir
         criar_diretorios([self.output_dir])
         
         # Configurações
-        self.resolution = VIDEO_CONFIG.get('resolution', (1920, 1080))
+        perfil_cfg = get_render_profile(perfil)
+        self.perfil = perfil
+        self.resolution = perfil_cfg.get('resolucao_video', VIDEO_CONFIG.get('resolution', (1920, 1080)))
         self.fps = VIDEO_CONFIG.get('fps', 30)
         self.codec = VIDEO_CONFIG.get('codec', 'libx264')
-        self.bitrate = VIDEO_CONFIG.get('bitrate', '5000k')
+        self.bitrate = perfil_cfg.get('bitrate_video', VIDEO_CONFIG.get('bitrate', '5000k'))
+        self.preset = perfil_cfg.get('preset', VIDEO_CONFIG.get('preset', 'medium'))
+        self.threads = VIDEO_CONFIG.get('threads', 4)
         self.audio_codec = VIDEO_CONFIG.get('audio_codec', 'aac')
         
+        # Perfil medido pelo benchmark nesta máquina (apenas no perfil final)
+        self.perfil_encoder = None
+        if perfil == 'final' and VIDEO_CONFIG.get('usar_perfil_encoder', True):
+            self.perfil_encoder = carregar_perfil_encoder()
+        
+        if self.perfil_encoder:
+            self.preset = self.perfil_encoder['preset']
+            self.threads = self.perfil_encoder.get('threads', self.threads)
+            if self.perfil_encoder['modo'] == 'crf':
+                self.bitrate = None
+            else:
+                self.bitrate = self.perfil_encoder['valor']
+        
+        # Início do áudio de cada cena e linha do tempo (preenchidos na montagem)
+        self.offsets_audio: Dict[int, float] = {}
+        self.timeline: Optional[Timeline] = None
+        
         print(f"✅ VideoEditor inicializado")
         print(f"   Resolução: {self.resolution[0]}x{self.resolution[1]}")
         print(f"   FPS: {self.fps}")
+        print(f"   Perfil: {perfil} ({self.preset}, {self.bitrate or 'crf'})")
+        if self.perfil_encoder:
+            print(f"   Encoder: perfil medido no benchmark")
     
     def montar_video_final(
         self,
@@ -60,17 +88,35 @@ class VideoEditor:
         cenas_audios: Optional[Dict[int, str]] = None,
         musica_fundo: Optional[str] = None,
         nome_saida: str = "video_final.mp4",
-        transicao: str = "fade"
+        transicao: str = "fade",
+        legendas: Optional[List[Dict]] = None,
+        timings_cenas: Optional[Dict[int, Dict]] = None,
+        duracoes_cenas: Optional[Dict[int, float]] = None,
+        timeline: Optional[Timeline] = None
     ) -> Optional[str]:
         """
         Monta o vídeo final combinando todas as cenas.
         
+        Vídeo, áudio e legendas são posicionados pela mesma Timeline; uma
+        cena sem áudio mantém seu espaço e uma cena sem vídeo vira quadro
+        preto, sem deslocar as seguintes.
+        
         Args:
             cenas_videos: Dict mapeando número da cena -> caminho do vídeo
             cenas_audios: Dict opcional com áudios por cena
             musica_fundo: Caminho da música de fundo (opcional)
             nome_saida: Nome do arquivo de saída
-            transicao: Tipo de transição entre cenas
+            transicao: Tipo de transição entre cenas ('fade' = crossfade de
+                       VIDEO_CONFIG['transicao_segundos'])
+            legendas: Lista opcional de legendas ('texto', 'inicio', 'fim'),
+                      aplicadas conforme SUBTITLE_CONFIG['modo'] ('burn'
+                      queima via libass no mesmo encode)
+            timings_cenas: Dict opcional com o timing da narração por cena;
+                           gera legendas automáticas usando os offsets do áudio
+            duracoes_cenas: Dict opcional com a duração medida de cada cena;
+                            o vídeo da cena é repetido ou cortado para caber
+            timeline: Linha do tempo pronta (substitui cenas_videos,
+                      cenas_audios e duracoes_cenas)
         
         Returns:
             Caminho do vídeo final ou None
@@ -82,14 +128,20 @@ class VideoEditor:
             ...     nome_saida="meu_video.mp4"
             ... )
         """
+        from moviepy.editor import VideoFileClip, CompositeVideoClip, ColorClip, vfx
+        
+        if timeline is not None:
+            cenas_videos = {cena.numero: cena.video for cena in timeline.cenas if cena.video}
+            cenas_audios = {cena.numero: cena.audio for cena in timeline.cenas if cena.audio}
+        
         print(f"🎬 Montando vídeo final...")
         print(f"   Cenas: {len(cenas_videos)}")
         
         try:
             # Carregar e ordenar cenas
-            clips_video = []
+            clips_video = {}
             
-            for num_cena in sorted(cenas_videos.keys()):
+            for num_cena in sorted(cenas_videos.keys(), key=int):
                 video_path = cenas_videos[num_cena]
                 
                 if not os.path.exists(video_path):
@@ -105,7 +157,7 @@ class VideoEditor:
                     if clip.size != self.resolution:
                         clip = clip.resize(self.resolution)
                     
-                    clips_video.append(clip)
+                    clips_video[int(num_cena)] = clip
                     
                 except Exception as e:
                     print(f"   ⚠️ Erro ao carregar cena {num_cena}: {e}")
@@ -116,26 +168,48 @@ class VideoEditor:
             
             print(f"   ✅ {len(clips_video)} cenas carregadas")
             
-            # Concatenar cenas
-            print("   Concatenando cenas...")
-            
-            if transicao == "fade":
-                # Adicionar crossfade entre cenas
-                video_final = concatenate_videoclips(
-                    clips_video,
-                    method="compose",
-                    padding=-0.5  # 0.5s de crossfade
+            if timeline is None:
+                timeline = self._montar_timeline(
+                    clips_video, cenas_videos, cenas_audios or {}, duracoes_cenas or {}, transicao
                 )
-            else:
-                video_final = concatenate_videoclips(clips_video, method="compose")
+            self.timeline = timeline
             
-            # Processar áudio
+            # Cada clipe é ajustado ao espaço da cena (mais a transição para a
+            # seguinte) e posicionado no quadro exato de início
+            print("   Posicionando cenas na linha do tempo...")
+            
+            camadas = []
+            anterior = None
+            
+            for cena in timeline.cenas:
+                duracao = timeline.segundos(cena.quadros_clipe)
+                clip = clips_video.get(cena.numero)
+                
+                if clip is None:
+                    clip = ColorClip(self.resolution, color=(0, 0, 0), duration=duracao)
+                elif clip.duration < duracao - 0.01:
+                    clip = clip.fx(vfx.loop, duration=duracao)
+                elif clip.duration > duracao + 0.01:
+                    clip = clip.subclip(0, duracao)
+                
+                clip = clip.set_start(timeline.segundos(cena.inicio))
+                if anterior is not None and anterior.sobreposicao:
+                    clip = clip.crossfadein(timeline.segundos(anterior.sobreposicao))
+                
+                camadas.append(clip)
+                anterior = cena
+            
+            video_final = CompositeVideoClip(camadas, size=self.resolution).set_duration(timeline.duracao)
+            
+            # Processar áudio (cada narração começa junto com o vídeo da sua cena)
+            cenas_audios = {cena.numero: cena.audio for cena in timeline.cenas if cena.audio}
             if cenas_audios:
                 print("   Processando áudio...")
                 audio_final = self._processar_audio(
                     cenas_audios,
-                    video_final.duration,
-                    musica_fundo
+                    timeline.duracao,
+                    musica_fundo,
+                    inicios=timeline.offsets_audio()
                 )
                 
                 if audio_final:
@@ -143,6 +217,28 @@ class VideoEditor:
             
             # Caminho de saída
             caminho_saida = os.path.join(self.output_dir, nome_saida)
+            timeline.salvar(caminho_timeline(caminho_saida))
+            
+            # Legendas automáticas a partir do timing da narração
+            legendas = list(legendas or [])
+            if timings_cenas:
+                timings_cenas = {int(num): timing for num, timing in timings_cenas.items()}
+                legendas += legendas_de_timings(timings_cenas, timeline.offsets_audio())
+            
+            # 'burn': legendas queimadas pelo libass durante o próprio encode;
+            # 'soft' e 'moviepy' são aplicadas depois (adicionar_legendas)
+            ffmpeg_params = self._parametros_extras_encoder()
+            modo_legendas = SUBTITLE_CONFIG.get('modo', 'burn')
+            if legendas and modo_legendas == 'burn':
+                caminho_ass = os.path.splitext(caminho_saida)[0] + '.ass'
+                if not ffmpeg_disponivel():
+                    print("   ⚠️ ffmpeg não disponível para o libass, legendas via MoviePy")
+                    modo_legendas = 'moviepy'
+                elif SubtitleGenerator(self.resolution).gerar_ass(legendas, caminho_ass):
+                    ffmpeg_params += ['-vf', f"ass={escapar_caminho_filtro(caminho_ass)}"]
+                else:
+                    print("   ⚠️ Falha ao gerar o ASS, legendas via MoviePy")
+                    modo_legendas = 'moviepy'
             
             # Exportar vídeo final
             print(f"   Exportando vídeo final...")
@@ -154,16 +250,24 @@ class VideoEditor:
                 codec=self.codec,
                 bitrate=self.bitrate,
                 audio_codec=self.audio_codec,
-                preset='medium',
-                threads=4,
+                preset=self.preset,
+                threads=self.threads,
+                ffmpeg_params=ffmpeg_params or None,
                 logger=None  # Desabilitar verbose logging
             )
             
             # Limpar recursos
             video_final.close()
-            for clip in clips_video:
+            for clip in clips_video.values():
                 clip.close()
             
+            if legendas and modo_legendas != 'burn':
+                com_legendas = self.adicionar_legendas(caminho_saida, legendas, modo=modo_legendas)
+                if com_legendas != caminho_saida:
+                    os.replace(com_legendas, caminho_saida)
+                else:
+                    print("   ⚠️ Vídeo final exportado sem legendas")
+            
             # Informações do vídeo final
             tamanho_mb = get_tamanho_arquivo_mb(caminho_saida)
             
@@ -178,12 +282,81 @@ class VideoEditor:
             print(f"❌ Erro ao montar vídeo: {e}")
             return None
     
+    def _montar_timeline(
+        self,
+        clips_video: Dict[int, object],
+        cenas_videos: Dict[int, str],
+        cenas_audios: Dict[int, str],
+        duracoes_cenas: Dict[int, float],
+        transicao: str
+    ) -> Timeline:
+        """
+        Linha do tempo para chamadas sem Timeline pronta.
+        
+        A duração de cada cena vem de duracoes_cenas, senão do áudio e, por
+        último, do próprio vídeo.
+        """
+        duracoes = {numero: clip.duration for numero, clip in clips_video.items()}
+        
+        for numero, audio_path in cenas_audios.items():
+            try:
+                duracoes[int(numero)] = obter_cache_pcm().duracao(audio_path)
+            except Exception as e:
+                print(f"   ⚠️ Duração do áudio da cena {numero} indisponível: {e}")
+        
+        for numero, duracao in duracoes_cenas.items():
+            if int(numero) in duracoes and duracao:
+                duracoes[int(numero)] = duracao
+        
+        return Timeline.montar(
+            duracoes=duracoes,
+            videos={numero: cenas_videos.get(numero, cenas_videos.get(str(numero))) for numero in clips_video},
+            audios=cenas_audios,
+            fps=self.fps,
+            transicao=None if transicao == "fade" else 0.0
+        )
+    
+    def _parametros_extras_encoder(self) -> List[str]:
+        """
+        Parâmetros do perfil medido que o MoviePy não expõe (CRF e tune).
+        
+        Returns:
+            Lista de argumentos extras do ffmpeg
+        """
+        if not self.perfil_encoder:
+            return []
+        
+        extras = []
+        if self.perfil_encoder['modo'] == 'crf':
+            extras += ['-crf', str(self.perfil_encoder['valor'])]
+        if self.perfil_encoder.get('tune'):
+            extras += ['-tune', self.perfil_encoder['tune']]
+        return extras
+    
+    def _argumentos_encoder(self) -> List[str]:
+        """
+        Argumentos de encoding para chamadas diretas ao ffmpeg.
+        
+        Returns:
+            Lista de argumentos (codec, preset, taxa, threads)
+        """
+        if self.perfil_encoder:
+            return ['-c:v', self.codec] + argumentos_encoder(self.perfil_encoder)
+        
+        return [
+            '-c:v', self.codec,
+            '-preset', self.preset,
+            '-b:v', self.bitrate,
+            '-threads', str(self.threads)
+        ]
+    
     def _processar_audio(
         self,
         cenas_audios: Dict[int, str],
         duracao_total: float,
-        musica_fundo: Optional[str] = None
-    ) -> Optional[AudioFileClip]:
+        musica_fundo: Optional[str] = None,
+        inicios: Optional[Dict[int, float]] = None
+    ) -> Optional['AudioFileClip']:
         """
         Processa e combina áudios das cenas.
         
@@ -191,32 +364,49 @@ class VideoEditor:
             cenas_audios: Dict com áudios por cena
             duracao_total: Duração total do vídeo
             musica_fundo: Caminho da música de fundo
+            inicios: Início do vídeo de cada cena; cenas sem entrada seguem
+                     logo após o áudio anterior
         
         Returns:
             AudioFileClip combinado ou None
         """
+        from moviepy.editor import CompositeAudioClip, concatenate_audioclips
+        
+        inicios = inicios or {}
+        
+        # Mixagem normalizada por loudness, com ducking, em uma passada
+        try:
+            return self._mixar_pcm(cenas_audios, duracao_total, musica_fundo, inicios)
+        except Exception as e:
+            print(f"   ⚠️ Mixagem PCM indisponível ({e}), usando MoviePy")
+        
         try:
             # Carregar áudios das cenas
             clips_audio = []
+            self.offsets_audio = {}
+            inicio = 0.0
             
             for num_cena in sorted(cenas_audios.keys()):
                 audio_path = cenas_audios[num_cena]
                 
                 if os.path.exists(audio_path):
-                    audio = AudioFileClip(audio_path)
-                    clips_audio.append(audio)
+                    inicio = inicios.get(num_cena, inicio)
+                    audio = self._clip_audio(audio_path)
+                    clips_audio.append(audio.set_start(inicio))
+                    self.offsets_audio[num_cena] = inicio
+                    inicio += audio.duration
             
             if not clips_audio:
                 return None
             
-            # Concatenar áudios
-            audio_principal = concatenate_audioclips(clips_audio)
+            # Posicionar áudios na linha do tempo
+            audio_principal = CompositeAudioClip(clips_audio).set_duration(max(duracao_total, inicio))
             
             # Adicionar música de fundo se fornecida
             if musica_fundo and os.path.exists(musica_fundo):
                 print("   Adicionando música de fundo...")
                 
-                musica = AudioFileClip(musica_fundo)
+                musica = self._clip_audio(musica_fundo)
                 
                 # Loop da música se necessário
                 if musica.duration < audio_principal.duration:
@@ -241,11 +431,72 @@ class VideoEditor:
             print(f"   ⚠️ Erro ao processar áudio: {e}")
             return None
     
+    def _mixar_pcm(
+        self,
+        cenas_audios: Dict[int, str],
+        duracao_total: float,
+        musica_fundo: Optional[str] = None,
+        inicios: Optional[Dict[int, float]] = None
+    ):
+        """
+        Mixa narração e música a partir do cache PCM (ver audio_processing.mixar).
+        
+        Cada cena é levada ao loudness alvo e a música é abaixada sob a
+        narração; o resultado vai direto para o encode final, sem arquivos
+        intermediários re-encodados.
+        """
+        from moviepy.audio.AudioClip import AudioArrayClip
+        
+        cache = obter_cache_pcm()
+        inicios = inicios or {}
+        narracoes = []
+        self.offsets_audio = {}
+        inicio = 0.0
+        
+        for num_cena in sorted(cenas_audios.keys()):
+            audio_path = cenas_audios[num_cena]
+            
+            if os.path.exists(audio_path):
+                inicio = inicios.get(num_cena, inicio)
+                amostras, meta = cache.carregar(audio_path)
+                narracoes.append((amostras, inicio))
+                self.offsets_audio[num_cena] = inicio
+                inicio += meta['duracao']
+        
+        if not narracoes:
+            return None
+        
+        musica = None
+        if musica_fundo and os.path.exists(musica_fundo):
+            print("   Adicionando música de fundo (com ducking)...")
+            musica = cache.carregar(musica_fundo)[0]
+        
+        mix = mixar(narracoes, duracao=max(duracao_total, inicio), taxa=cache.taxa, musica=musica)
+        return AudioArrayClip(mix, fps=cache.taxa)
+    
+    @staticmethod
+    def _clip_audio(caminho: str):
+        """
+        Clip de áudio lido do cache PCM (memory-map, sem nova decodificação).
+        
+        Se o cache falhar, decodifica com AudioFileClip.
+        """
+        from moviepy.editor import AudioFileClip
+        from moviepy.audio.AudioClip import AudioArrayClip
+        
+        try:
+            amostras, meta = obter_cache_pcm().carregar(caminho)
+            return AudioArrayClip(amostras, fps=meta['taxa'])
+        except Exception as e:
+            print(f"   ⚠️ Cache PCM indisponível ({e}), decodificando {os.path.basename(caminho)}")
+            return AudioFileClip(caminho)
+    
     def adicionar_legendas(
         self,
         video_path: str,
         legendas: List[Dict],
-        caminho_saida: Optional[str] = None
+        caminho_saida: Optional[str] = None,
+        modo: Optional[str] = None
     ) -> Optional[str]:
         """
         Adiciona legendas ao vídeo.
@@ -254,6 +505,8 @@ class VideoEditor:
             video_path: Caminho do vídeo
             legendas: Lista de dicts com 'texto', 'inicio', 'fim'
             caminho_saida: Caminho de saída (opcional)
+            modo: 'burn' (queima via libass), 'soft' (faixa de legenda sem
+                  re-encode) ou 'moviepy' (padrão: SUBTITLE_CONFIG['modo'])
         
         Returns:
             Caminho do vídeo com legendas
@@ -265,52 +518,28 @@ class VideoEditor:
             ... ]
             >>> video_com_legendas = editor.adicionar_legendas("video.mp4", legendas)
         """
-        print(f"📝 Adicionando legendas...")
+        modo = modo or SUBTITLE_CONFIG.get('modo', 'burn')
+        
+        print(f"📝 Adicionando legendas ({modo})...")
+        
+        if caminho_saida is None:
+            base, ext = os.path.splitext(video_path)
+            caminho_saida = f"{base}_legendas{ext}"
+        
+        if modo in ('burn', 'soft') and not ffmpeg_disponivel():
+            print("   ⚠️ ffmpeg não disponível, usando MoviePy")
+            modo = 'moviepy'
         
         try:
-            video = VideoFileClip(video_path)
-            
-            # Criar clips de texto
-            txt_clips = []
-            
-            for i, leg in enumerate(legendas):
-                print(f"   Legenda {i+1}/{len(legendas)}")
-                
-                txt_clip = TextClip(
-                    leg['texto'],
-                    fontsize=40,
-                    color='white',
-                    bg_color='black',
-                    size=(video.w * 0.9, None),
-                    method='caption'
-                ).set_position(('center', 'bottom')).set_start(
-                    leg['inicio']
-                ).set_duration(
-                    leg['fim'] - leg['inicio']
-                )
-                
-                txt_clips.append(txt_clip)
-            
-            # Compor vídeo com legendas
-            video_final = CompositeVideoClip([video] + txt_clips)
-            
-            # Caminho de saída
-            if caminho_saida is None:
-                base, ext = os.path.splitext(video_path)
-                caminho_saida = f"{base}_legendas{ext}"
-            
-            # Exportar
-            video_final.write_videofile(
-                caminho_saida,
-                fps=self.fps,
-                codec=self.codec,
-                bitrate=self.bitrate,
-                audio_codec=self.audio_codec,
-                logger=None
-            )
+            if modo == 'burn':
+                resultado = self._queimar_legendas_ass(video_path, legendas, caminho_saida)
+            elif modo == 'soft':
+                resultado = self._anexar_faixa_legendas(video_path, legendas, caminho_saida)
+            else:
+                resultado = self._legendas_moviepy(video_path, legendas, caminho_saida)
             
-            video.close()
-            video_final.close()
+            if not resultado:
+                return video_path
             
             print(f"✅ Legendas adicionadas: {caminho_saida}")
             return caminho_saida
@@ -319,6 +548,116 @@ class VideoEditor:
             print(f"❌ Erro ao adicionar legendas: {e}")
             return video_path
     
+    def _queimar_legendas_ass(
+        self,
+        video_path: str,
+        legendas: List[Dict],
+        caminho_saida: str
+    ) -> bool:
+        """
+        Gera a faixa ASS e a queima no vídeo com o filtro libass do ffmpeg.
+        """
+        caminho_ass = os.path.splitext(caminho_saida)[0] + '.ass'
+        
+        if not SubtitleGenerator(self.resolution).gerar_ass(legendas, caminho_ass):
+            return False
+        
+        return executar_ffmpeg([
+            '-i', video_path,
+            '-vf', f"ass={escapar_caminho_filtro(caminho_ass)}",
+        ] + self._argumentos_encoder() + [
+            '-c:a', 'copy',
+            caminho_saida
+        ], 'encode com legendas')
+    
+    def _anexar_faixa_legendas(
+        self,
+        video_path: str,
+        legendas: List[Dict],
+        caminho_saida: str
+    ) -> bool:
+        """
+        Anexa as legendas como faixa separada (mov_text), sem re-encode.
+        """
+        caminho_srt = os.path.splitext(caminho_saida)[0] + '.srt'
+        
+        if not SubtitleGenerator(self.resolution).gerar_srt(legendas, caminho_srt):
+            return False
+        
+        return executar_ffmpeg([
+            '-i', video_path,
+            '-i', caminho_srt,
+            '-map', '0:v', '-map', '0:a?', '-map', '1:0',
+            '-c:v', 'copy', '-c:a', 'copy', '-c:s', 'mov_text',
+            '-metadata:s:s:0', f"language={SUBTITLE_CONFIG.get('idioma_faixa', 'por')}",
+            caminho_saida
+        ], 'mux de legendas')
+    
+    def _legendas_moviepy(
+        self,
+        video_path: str,
+        legendas: List[Dict],
+        caminho_saida: str
+    ) -> bool:
+        """
+        Compõe as legendas com TextClip (fallback sem ffmpeg/libass).
+        
+        Cada combinação de texto e estilo é rasterizada uma única vez e
+        reaproveitada nas demais ocorrências.
+        """
+        from moviepy.editor import VideoFileClip, CompositeVideoClip, TextClip
+        
+        video = VideoFileClip(video_path)
+        
+        eventos = SubtitleGenerator(self.resolution).preparar_eventos(legendas)
+        
+        # Cache de clips rasterizados: (texto, estilo) -> TextClip
+        rasterizados = {}
+        txt_clips = []
+        
+        for i, evento in enumerate(eventos):
+            print(f"   Legenda {i+1}/{len(eventos)}")
+            
+            chave = (evento['texto'], evento['estilo'])
+            if chave not in rasterizados:
+                rasterizados[chave] = TextClip(
+                    evento['texto'],
+                    fontsize=SUBTITLE_CONFIG.get('tamanho_fonte', 40),
+                    color=SUBTITLE_CONFIG.get('cor_texto', 'white'),
+                    bg_color=SUBTITLE_CONFIG.get('cor_fundo', 'black'),
+                    size=(video.w * 0.9, None),
+                    method='caption'
+                ).set_position(('center', 'bottom'))
+            
+            txt_clip = rasterizados[chave].set_start(
+                evento['inicio']
+            ).set_duration(
+                evento['fim'] - evento['inicio']
+            )
+            
+            txt_clips.append(txt_clip)
+        
+        print(f"   {len(rasterizados)} legendas únicas rasterizadas")
+        
+        # Compor vídeo com legendas
+        video_final = CompositeVideoClip([video] + txt_clips)
+        
+        # Exportar
+        video_final.write_videofile(
+            caminho_saida,
+            fps=self.fps,
+            codec=self.codec,
+            bitrate=self.bitrate,
+            audio_codec=self.audio_codec,
+            preset=self.preset,
+            logger=None
+        )
+        
+        video.close()
+        video_final.close()
+        
+        return True
+    
     def adicionar_intro_outro(
         self,
         video_path: str,
@@ -338,6 +677,8 @@ class VideoEditor:
         Returns:
             Caminho do vídeo com intro/outro
         """
+        from moviepy.editor import VideoFileClip, concatenate_videoclips
+        
         print(f"🎬 Adicionando intro/outro...")
         
         try:
@@ -374,6 +715,7 @@ class VideoEditor:
                 codec=self.codec,
                 bitrate=self.bitrate,
                 audio_codec=self.audio_codec,
+                preset=self.preset,
                 logger=None
             )
             
@@ -393,7 +735,10 @@ class VideoEditor:
         self,
         video_path: str,
         duracao_preview: int = 30,
-        caminho_saida: Optional[str] = None
+        caminho_saida: Optional[str] = None,
+        inicio: float = 0.0,
+        janelas: Optional[List[Tuple[float, float]]] = None,
+        modo: str = "rapido"
     ) -> Optional[str]:
         """
         Cria um preview curto do vídeo.
@@ -402,35 +747,40 @@ class VideoEditor:
             video_path: Caminho do vídeo completo
             duracao_preview: Duração do preview em segundos
             caminho_saida: Caminho de saída
+            inicio: Ponto de início do preview (segundos)
+            janelas: Lista opcional de (inicio, duracao) para um "highlight
+                     reel"; quando informada, substitui inicio/duracao_preview
+            modo: 'rapido' (seek por keyframe + cópia de stream, sem
+                  re-encode), 'proxy' (baixa resolução, preset ultrafast)
+                  ou 'moviepy' (decodifica e re-encoda tudo)
         
         Returns:
             Caminho do preview
+        
+        Example:
+            >>> editor.criar_preview("video.mp4", janelas=[(60, 10), (300, 10)])
         """
-        print(f"👀 Criando preview ({duracao_preview}s)...")
+        janelas = janelas or [(inicio, duracao_preview)]
+        
+        print(f"👀 Criando preview ({modo}, {len(janelas)} janela(s))...")
+        
+        # Caminho de saída
+        if caminho_saida is None:
+            base, ext = os.path.splitext(video_path)
+            caminho_saida = f"{base}_preview{ext}"
+        
+        if modo != 'moviepy' and not ffmpeg_disponivel():
+            print("   ⚠️ ffmpeg não disponível, usando MoviePy")
+            modo = 'moviepy'
         
         try:
-            video = VideoFileClip(video_path)
-            
-            # Pegar início do vídeo
-            preview = video.subclip(0, min(duracao_preview, video.duration))
-            
-            # Caminho de saída
-            if caminho_saida is None:
-                base, ext = os.path.splitext(video_path)
-                caminho_saida = f"{base}_preview{ext}"
-            
-            # Exportar
-            preview.write_videofile(
-                caminho_saida,
-                fps=self.fps,
-                codec=self.codec,
-                bitrate='3000k',  # Menor bitrate para preview
-                audio_codec=self.audio_codec,
-                logger=None
-            )
+            if modo == 'moviepy':
+                ok = self._preview_moviepy(video_path, janelas, caminho_saida)
+            else:
+                ok = self._preview_ffmpeg(video_path, janelas, caminho_saida, proxy=(modo == 'proxy'))
             
-            video.close()
-            preview.close()
+            if not ok:
+                return None
             
             print(f"✅ Preview criado: {caminho_saida}")
             return caminho_saida
@@ -438,6 +788,112 @@ class VideoEditor:
         except Exception as e:
             print(f"❌ Erro ao criar preview: {e}")
             return None
+    
+    def _preview_ffmpeg(
+        self,
+        video_path: str,
+        janelas: List[Tuple[float, float]],
+        caminho_saida: str,
+        proxy: bool = False
+    ) -> bool:
+        """
+        Extrai as janelas com ffmpeg e concatena sem re-encode.
+        
+        O seek é feito antes do '-i' (rápido, pelo índice do container);
+        com cópia de stream o corte começa no keyframe anterior ao ponto
+        pedido. No modo proxy cada janela é re-encodada em baixa resolução
+        com preset ultrafast, com parâmetros idênticos para permitir o concat.
+        """
+        if proxy:
+            codificacao = [
+                '-vf', f"scale=-2:{VIDEO_CONFIG.get('preview_altura', 360)}",
+                '-c:v', 'libx264', '-preset', 'ultrafast',
+                '-crf', str(VIDEO_CONFIG.get('preview_crf', 30)),
+                '-c:a', 'aac', '-b:a', '96k'
+            ]
+        else:
+            codificacao = ['-c', 'copy', '-avoid_negative_ts', 'make_zero']
+        
+        # Janela única: direto para o arquivo final
+        if len(janelas) == 1:
+            inicio, duracao = janelas[0]
+            return executar_ffmpeg(
+                ['-ss', f"{inicio:.3f}", '-i', video_path, '-t', f"{duracao:.3f}"]
+                + codificacao + [caminho_saida],
+                'preview'
+            )
+        
+        # Highlight reel: extrair cada janela e juntar com o concat demuxer
+        base, ext = os.path.splitext(caminho_saida)
+        segmentos = []
+        
+        try:
+            for i, (inicio, duracao) in enumerate(janelas):
+                segmento = f"{base}_seg{i:03d}{ext}"
+                if not executar_ffmpeg(
+                    ['-ss', f"{inicio:.3f}", '-i', video_path, '-t', f"{duracao:.3f}"]
+                    + codificacao + [segmento],
+                    f'preview (janela {i+1})'
+                ):
+                    return False
+                segmentos.append(segmento)
+            
+            lista = f"{base}_segmentos.txt"
+            with open(lista, 'w', encoding='utf-8') as f:
+                for segmento in segmentos:
+                    f.write(f"file '{os.path.abspath(segmento)}'\n")
+            segmentos.append(lista)
+            
+            return executar_ffmpeg(
+                ['-f', 'concat', '-safe', '0', '-i', lista, '-c', 'copy', caminho_saida],
+                'concat do preview'
+            )
+            
+        finally:
+            for arquivo in segmentos:
+                if os.path.exists(arquivo):
+                    os.remove(arquivo)
+    
+    def _preview_moviepy(
+        self,
+        video_path: str,
+        janelas: List[Tuple[float, float]],
+        caminho_saida: str
+    ) -> bool:
+        """
+        Cria o preview decodificando e re-encodando com MoviePy (fallback).
+        """
+        from moviepy.editor import VideoFileClip, concatenate_videoclips
+        
+        video = VideoFileClip(video_path)
+        
+        trechos = [
+            video.subclip(inicio, min(inicio + duracao, video.duration))
+            for inicio, duracao in janelas
+            if inicio < video.duration
+        ]
+        
+        if not trechos:
+            video.close()
+            print("❌ Janelas fora da duração do vídeo")
+            return False
+        
+        preview = concatenate_videoclips(trechos) if len(trechos) > 1 else trechos[0]
+        
+        # Exportar
+        preview.write_videofile(
+            caminho_saida,
+            fps=self.fps,
+            codec=self.codec,
+            bitrate='3000k',  # Menor bitrate para preview
+            audio_codec=self.audio_codec,
+            logger=None
+        )
+        
+        video.close()
+        preview.close()
+        
+        return True
 
 
 def exemplo_uso():
@@ -0,0 +1,312 @@
+"""
+🔥 WARMUP - ProjetoX
+
+Aquecimento de modelos Replicate à frente das etapas do pipeline.
+
+Quando uma etapa começa, os modelos das etapas seguintes (no grafo de
+dependências) recebem uma predição mínima, cancelada assim que o modelo
+sai do boot. Enquanto a etapa atual durar, o aquecimento é renovado a cada
+janela; assim o Wav2Lip já está quente quando as animações terminam.
+
+Opcionalmente, etapas com deployment dedicado têm min_instances elevado
+durante uma janela de lote.
+"""
+
+import os
+import io
+import time
+import wave
+import threading
+from typing import Dict, List, Optional
+
+# Imports locais
+try:
+    import sys
+    _raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _raiz not in sys.path:
+        sys.path.append(_raiz)
+    from config.settings import AI_CONFIG, DIRS, WARMUP_CONFIG
+    from src.utils import criar_diretorios
+    from src.remote_calls import chamar_remoto
+    from src.remote_assets import obter_cache_remoto
+except ImportError:
+    print("⚠️ Imports locais não disponíveis. Configure o PYTHONPATH.")
+
+
+# Grafo de etapas do pipeline: etapa -> etapas das quais depende
+ETAPAS_PIPELINE = {
+    'roteiro': [],
+    'personagens': ['roteiro'],
+    'audios': ['roteiro'],
+    'animacoes': ['personagens'],
+    'lipsync': ['animacoes', 'audios'],
+    'edicao': ['lipsync'],
+}
+
+# Modelo de cada etapa (chave em AI_CONFIG)
+MODELOS_ETAPAS = {
+    'personagens': 'replicate_image_model',
+    'animacoes': 'replicate_animation_model',
+    'lipsync': 'replicate_lipsync_model',
+}
+
+DEPLOYMENTS_URL = 'https://api.replicate.com/v1/deployments'
+
+
+class WarmupScheduler:
+    """
+    Agenda aquecimentos de modelos conforme o pipeline avança.
+    
+    Example:
+        >>> warmup = WarmupScheduler(etapas_ativas=['roteiro', 'personagens', 'animacoes'])
+        >>> warmup.etapa_iniciada('roteiro')   # aquece SDXL
+        >>> warmup.etapa_iniciada('personagens')  # aquece SVD
+        >>> warmup.encerrar()
+    """
+    
+    def __init__(
+        self,
+        etapas_ativas: Optional[List[str]] = None,
+        grafo: Optional[Dict[str, List[str]]] = None
+    ):
+        """
+        Inicializa o agendador.
+        
+        Args:
+            etapas_ativas: Etapas que vão executar (padrão: todas do grafo)
+            grafo: Grafo de dependências (padrão: ETAPAS_PIPELINE)
+        """
+        self.grafo = grafo or ETAPAS_PIPELINE
+        self.etapas_ativas = set(etapas_ativas or self.grafo)
+        self.ativo = WARMUP_CONFIG.get('ativo', True)
+        self.janela = WARMUP_CONFIG.get('janela_quente_segundos', 300)
+        self.max_aquecimentos = WARMUP_CONFIG.get('max_aquecimentos_por_modelo', 6)
+        self.deployments = WARMUP_CONFIG.get('deployments', {})
+        
+        self.iniciadas: set = set()
+        self.aquecimentos: Dict[str, int] = {}
+        self.tempos_boot: Dict[str, List[float]] = {}
+        
+        self._parar: Dict[str, threading.Event] = {}
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._entradas: Dict[str, Dict] = {}
+    
+    def etapa_iniciada(self, etapa: str) -> None:
+        """
+        Registra o início de uma etapa e aquece as etapas seguintes.
+        
+        Uma etapa é aquecida quando todas as suas dependências já começaram;
+        o aquecimento dela é mantido até ela própria começar.
+        
+        Args:
+            etapa: Nome da etapa (chave do grafo)
+        """
+        with self._lock:
+            self.iniciadas.add(etapa)
+            
+            # A própria etapa agora mantém o modelo quente
+            if etapa in self._parar:
+                self._parar.pop(etapa).set()
+        
+        if not self.ativo:
+            return
+        
+        for seguinte, dependencias in self.grafo.items():
+            if (
+                seguinte in self.etapas_ativas
+                and seguinte not in self.iniciadas
+                and seguinte not in self._parar
+                and seguinte in MODELOS_ETAPAS
+                and seguinte not in self.deployments
+                and all(d in self.iniciadas or d not in self.etapas_ativas for d in dependencias)
+            ):
+                self._manter_quente(seguinte)
+    
+    def encerrar(self) -> Dict:
+        """
+        Interrompe os aquecimentos pendentes.
+        
+        Returns:
+            Resumo com aquecimentos e tempos de boot por etapa
+        """
+        with self._lock:
+            for evento in self._parar.values():
+                evento.set()
+            self._parar.clear()
+        
+        return {
+            etapa: {
+                'aquecimentos': self.aquecimentos.get(etapa, 0),
+                'boot_medio_s': round(sum(t) / len(t), 1) if t else None,
+            }
+            for etapa, t in self.tempos_boot.items()
+        }
+    
+    def iniciar_janela_lote(self, min_instancias: Optional[int] = None) -> None:
+        """
+        Mantém instâncias dos deployments dedicados ligadas durante um lote.
+        
+        Args:
+            min_instancias: Instâncias mínimas (padrão: min_instancias_lote)
+        """
+        n = WARMUP_CONFIG.get('min_instancias_lote', 1) if min_instancias is None else min_instancias
+        for etapa, deployment in self.deployments.items():
+            self._configurar_deployment(deployment, n)
+    
+    def encerrar_janela_lote(self) -> None:
+        """
+        Devolve os deployments dedicados a zero instâncias mínimas.
+        """
+        for etapa, deployment in self.deployments.items():
+            self._configurar_deployment(deployment, 0)
+    
+    def _manter_quente(self, etapa: str) -> None:
+        """
+        Dispara uma thread que aquece o modelo da etapa a cada janela.
+        """
+        parar = threading.Event()
+        with self._lock:
+            self._parar[etapa] = parar
+        
+        def loop():
+            while not parar.is_set() and self.aquecimentos.get(etapa, 0) < self.max_aquecimentos:
+                self._aquecer(etapa, parar)
+                # Renovar antes que o modelo volte a esfriar
+                parar.wait(self.janela * 0.8)
+        
+        thread = threading.Thread(target=loop, name=f"warmup-{etapa}", daemon=True)
+        self._threads.append(thread)
+        thread.start()
+    
+    def _aquecer(self, etapa: str, parar: threading.Event) -> None:
+        """
+        Cria uma predição mínima e a cancela quando o modelo sai do boot.
+        """
+        import replicate
+        
+        modelo = AI_CONFIG.get(MODELOS_ETAPAS[etapa], '')
+        versao = modelo.split(':')[-1]
+        
+        try:
+            inicio = time.time()
+            predicao = chamar_remoto(
+                'replicate',
+                lambda: replicate.predictions.create(version=versao, input=self._entrada_minima(etapa)),
+                descricao=f"warmup_{etapa}"
+            )
+            self.aquecimentos[etapa] = self.aquecimentos.get(etapa, 0) + 1
+            print(f"🔥 Aquecendo {modelo.split(':')[0]} (etapa {etapa})")
+            
+            while predicao.status == 'starting' and not parar.is_set():
+                parar.wait(2.0)
+                predicao.reload()
+            
+            if predicao.status not in ('succeeded', 'failed', 'canceled'):
+                predicao.cancel()
+            
+            self.tempos_boot.setdefault(etapa, []).append(time.time() - inicio)
+            
+        except Exception as e:
+            print(f"⚠️ Falha no aquecimento de {etapa}: {e}")
+    
+    def _entrada_minima(self, etapa: str) -> Dict:
+        """
+        Input mínimo válido para o modelo da etapa.
+        """
+        if etapa == 'personagens':
+            return {'prompt': 'warmup', 'width': 256, 'height': 256, 'num_inference_steps': 1}
+        
+        if etapa not in self._entradas:
+            cache = obter_cache_remoto()
+            imagem = cache.url_para(self._arquivo_aquecimento('warmup.png', _png_minimo()))
+            
+            if etapa == 'animacoes':
+                self._entradas[etapa] = {'image': imagem, 'video_length': '14_frames_with_svd'}
+            else:
+                audio = cache.url_para(self._arquivo_aquecimento('warmup.wav', _wav_silencio()))
+                self._entradas[etapa] = {'video': imagem, 'audio': audio}
+        
+        return self._entradas[etapa]
+    
+    @staticmethod
+    def _arquivo_aquecimento(nome: str, conteudo: bytes) -> str:
+        """
+        Grava (uma vez) um arquivo de aquecimento no diretório de cache.
+        """
+        diretorio = os.path.join(DIRS['cache'], 'warmup')
+        criar_diretorios([diretorio])
+        caminho = os.path.join(diretorio, nome)
+        if not os.path.exists(caminho):
+            with open(caminho, 'wb') as f:
+                f.write(conteudo)
+        return caminho
+    
+    @staticmethod
+    def _configurar_deployment(deployment: str, min_instancias: int) -> bool:
+        """
+        Ajusta min_instances de um deployment Replicate.
+        """
+        import requests
+        
+        try:
+            response = chamar_remoto(
+                'replicate',
+                requests.patch,
+                f"{DEPLOYMENTS_URL}/{deployment}",
+                headers={'Authorization': f"Bearer {os.environ.get('REPLICATE_API_TOKEN', '')}"},
+                json={'min_instances': min_instancias},
+                timeout=AI_CONFIG.get('timeout', 300),
+                descricao='deployment'
+            )
+            response.raise_for_status()
+            print(f"🔥 Deployment {deployment}: min_instances = {min_instancias}")
+            return True
+        except Exception as e:
+            print(f"⚠️ Falha ao configurar deployment {deployment}: {e}")
+            return False
+
+
+def _png_minimo(largura: int = 64, altura: int = 64) -> bytes:
+    """
+    PNG cinza mínimo (sem depender do Pillow).
+    """
+    import zlib
+    import struct
+    
+    def bloco(tipo: bytes, dados: bytes) -> bytes:
+        return struct.pack('>I', len(dados)) + tipo + dados + struct.pack('>I', zlib.crc32(tipo + dados))
+    
+    linhas = b''.join(b'\x00' + b'\x80\x80\x80' * largura for _ in range(altura))
+    return (
+        b'\x89PNG\r\n\x1a\n'
+        + bloco(b'IHDR', struct.pack('>IIBBBBB', largura, altura, 8, 2, 0, 0, 0))
+        + bloco(b'IDAT', zlib.compress(linhas))
+        + bloco(b'IEND', b'')
+    )
+
+
+def _wav_silencio(segundos: float = 0.5, taxa: int = 16000) -> bytes:
+    """
+    WAV mono de silêncio.
+    """
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(taxa)
+        w.writeframes(b'\x00\x00' * int(segundos * taxa))
+    return buffer.getvalue()
+
+
+def exemplo_uso():
+    """
+    Exemplo de uso: quais modelos cada etapa aquece.
+    """
+    for etapa, dependencias in ETAPAS_PIPELINE.items():
+        seguintes = [e for e, d in ETAPAS_PIPELINE.items() if etapa in d and e in MODELOS_ETAPAS]
+        print(f"   {etapa}: aquece {', '.join(seguintes) or '-'}")
+
+
+if __name__ == '__main__':
+    exemplo_uso()